@@ -9,8 +9,7 @@ import numpy
 import warnings
 import re
 import pandas
-import pint
-from pyvplm.core.definition import PositiveParameterSet
+from pyvplm.core.definition import PositiveParameterSet, get_unit_registry, unit_conversion, to_SI
 
 # -------[Define function to save doe Dataframe]--------------------------------
 def save_file(doeX, file_name, parameter_set, is_SI, **kwargs):
@@ -190,16 +189,13 @@ def import_file(file_name, parameter_set, units):
                                 labels[idx] = parameter
                             else:
                                 file_units = label[label.find("(") + 1 : len(label) - 1]
-                                ureg = pint.UnitRegistry()
-                                ureg.default_system = "mks"
-                                Q_ = ureg.Quantity
                                 try:
-                                    value = Q_(1, file_units).to_base_units()
-                                    if str(value.units) != parameter_set[parameter]._SI_units:
+                                    SI_units = unit_conversion(file_units)[2]
+                                    if SI_units != parameter_set[parameter]._SI_units:
                                         raise ValueError(
                                             "dimensions mismatch for parameter {}, {} found instead of {}.".format(
                                                 parameter,
-                                                str(value.units),
+                                                SI_units,
                                                 parameter_set[parameter]._SI_units,
                                             )
                                         )
@@ -214,13 +210,10 @@ def import_file(file_name, parameter_set, units):
                         if label.find("(") != -1:
                             parameter = label[0 : label.find("(")]
                             file_units = label[label.find("(") + 1 : len(label) - 1]
-                            ureg = pint.UnitRegistry()
-                            ureg.default_system = "mks"
-                            Q_ = ureg.Quantity
                             try:
-                                value = Q_(1, file_units).to_base_units()
+                                SI_units = unit_conversion(file_units)[2]
                                 if units == "SI":
-                                    labels[idx] = parameter + " [" + str(value.units) + "]"
+                                    labels[idx] = parameter + " [" + SI_units + "]"
                                 else:
                                     labels[idx] = parameter + " [" + file_units + "]"
                             except:
@@ -231,9 +224,7 @@ def import_file(file_name, parameter_set, units):
                                     )
                                 )
                 # Adapt values with units and errase in name if in parameter set
-                ureg = pint.UnitRegistry()
-                ureg.default_system = "mks"
-                Q_ = ureg.Quantity
+                Q_ = get_unit_registry().Quantity
                 for idx in range(len(labels)):
                     label = labels[idx]
                     if label.find(" [") != -1:
@@ -251,14 +242,10 @@ def import_file(file_name, parameter_set, units):
                             parameter in list(parameter_set.dictionary.keys())
                         ):
                             labels[idx] = parameter
-                            for nr in range(len(doeX[:, idx])):
-                                value = Q_(doeX[nr, idx], file_units).to_base_units()
-                                doeX[nr, idx] = value.magnitude
+                            doeX[:, idx] = to_SI(doeX[:, idx].tolist(), file_units)
                         elif value.magnitude != SI_value.magnitude:
                             labels[idx] = parameter + " [" + str(SI_value.units) + "]"
-                            for nr in range(len(doeX[:, idx])):
-                                value = Q_(doeX[nr, idx], file_units).to_base_units()
-                                doeX[nr, idx] = value.magnitude
+                            doeX[:, idx] = to_SI(doeX[:, idx].tolist(), file_units)
                         else:
                             labels[idx] = parameter + " [" + file_units + "]"
                 doeX = pandas.DataFrame(doeX, columns=labels)
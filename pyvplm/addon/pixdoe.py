@@ -16,9 +16,15 @@ import numpy
 import math
 from inspect import isfunction
 import functools
+import itertools
+import concurrent.futures
+from scipy.spatial import cKDTree
 import pandas
-import matplotlib.pyplot as plot
 import warnings
+import time
+import json
+import hashlib
+import tempfile
 from pyvplm.core.definition import PositiveParameter, PositiveParameterSet
 
 # -------[Define function creating fullfact using bounds and levels]------------
@@ -112,8 +118,347 @@ def create_doe(bounds, parameters_level, log_space=True):
         raise TypeError("log_space shoold be boolean.")
 
 
+# -------[Define generator yielding fullfact by blocks using bounds and levels]-
+def create_doe_blocks(bounds, parameters_level, log_space=True, block_size=65536):
+    """Generator that yields the fullfact DOE mesh of :func:`~sizinglab.addon.pixdoe.create_doe` by blocks of
+        block_size experiments (same mixed-radix order, first parameter changing fastest), so that the complete
+        DOE never has to be stored.
+
+     Parameters
+     ----------
+     Bounds: [n*2] numpy.array of floats
+             Defines the n parameters [lower, upper] bounds
+
+     parameters_level: [1*n] numpy.array of int
+                        Defines the parameters levels
+
+     log_space: bool
+                Defines if fullfact has to be in log space or when false, linear (default is True)
+
+     block_size: int
+                 Maximum number of experiments in each yielded block (default is 65536)
+
+     Yields
+     ------
+     doe_values: [b*n] numpy.array of float
+                 A block of b<=block_size consecutive rows of the fullfact DOE
+
+     Example
+     -------
+     define bounds and parameters' levels:
+         >>> In [1]: bounds = numpy.array([[10, 100], [100, 1000]], float)
+         >>> In [2]: parameters_level = numpy.array([2, 3], int)
+
+     generate doe in log space by blocks of 4 experiments:
+         >>> In [3]: [block.tolist() for block in create_doe_blocks(bounds, parameters_level, True, 4)]
+         >>> Out[3]: [[[10.0, 100.0], [100.0, 100.0], [10.0, 316.2277660168379], [100.0, 316.2277660168379]], [[10.0, 1000.0], [100.0, 1000.0]]]
+
+    """
+    if not (isinstance(block_size, int)) or block_size < 1:
+        raise ValueError("block_size should be an integer >= 1.")
+    # Check inputs on a minimal DOE (same verifications as create_doe)
+    _, _ = create_doe(bounds, numpy.minimum(parameters_level, 2), log_space)
+    if log_space:
+        bounds = numpy.log10(bounds)
+    # Levels (and max level index) on each axis, a constant parameter is set to its upper bound as in create_doe
+    parameters_level = parameters_level + 1 * (parameters_level == 0)
+    max_level = parameters_level - 1 + 1 * (parameters_level == 1)
+    radix = numpy.cumprod(numpy.concatenate(([1], parameters_level[:-1]))).astype(numpy.int64)
+    experiments_number = int(numpy.prod(parameters_level.astype(numpy.int64)))
+    for start in range(0, experiments_number, block_size):
+        rows = numpy.arange(start, min(start + block_size, experiments_number), dtype=numpy.int64)
+        doe_levels = (rows[:, numpy.newaxis] // radix) % parameters_level
+        doe_levels = doe_levels + 1 * (parameters_level == 1)
+        doe_values = bounds[:, 0] + doe_levels / max_level * (bounds[:, 1] - bounds[:, 0])
+        yield 10 ** doe_values if log_space else doe_values
+
+
+# -------[Define function creating quasi-random DOE using bounds and size]------
+def create_candidates(bounds, size, sampler="sobol", log_space=True, seed=0):
+    """Function that generates a quasi-random DOE of given size within bounds, to be used as a candidate pool
+        in place of a fullfact DOE.
+
+     Parameters
+     ----------
+     Bounds: [n*2] numpy.array of floats
+             Defines the n parameters [lower, upper] bounds (constant parameter if lower = upper)
+
+     size: int
+           Number of generated experiments (rounded to the upper power of 2 for 'sobol')
+
+     sampler: str
+              Defines the sequence: 'sobol' (scrambled Sobol, default), 'halton' (scrambled Halton) or 'lhs' (maximin
+              latin hypercube)
+
+     log_space: bool
+                Defines if points have to be drawn in log space or when false, linear (default is True)
+
+     seed: int
+           Seed of the scrambling/random generator to get repeatable DOE (default is 0)
+
+     Returns
+     -------
+     doe_values: [m*n] numpy.array of float
+                 A quasi-random DOE, with n the number of parameters and m>=size the number of experiments
+
+     Example
+     -------
+     define bounds and size:
+         >>> In [1]: bounds = numpy.array([[10, 100], [100, 1000]], float)
+
+     generate 6 points (8 with Sobol power of 2 rounding) in log space:
+         >>> In [2]: doe_values = create_candidates(bounds, 6, "sobol", True)
+         >>> In [3]: numpy.shape(doe_values)
+         >>> Out[3]: (8, 2)
+
+    """
+    if not (isinstance(bounds, numpy.ndarray)):
+        raise TypeError("bounds shoold be numpy array.")
+    if not (isinstance(size, int)) or size < 1:
+        raise ValueError("size should be an integer >= 1.")
+    if not (sampler in ["sobol", "halton", "lhs"]):
+        raise ValueError("sampler should be 'sobol', 'halton' or 'lhs'.")
+    if not (isinstance(log_space, bool)):
+        raise TypeError("log_space shoold be boolean.")
+    if log_space and numpy.amin(bounds) <= 0:
+        raise ValueError(
+            "to translate on log space all bounds shoold be >0, else choose log_space = False."
+        )
+    if log_space:
+        bounds = numpy.log10(bounds)
+    # Draw unit hypercube points only on non-constant parameters
+    active = bounds[:, 1] != bounds[:, 0]
+    dimension = int(numpy.sum(active))
+    if sampler == "sobol":
+        size = 2 ** int(math.ceil(math.log2(size)))
+    unit_values = numpy.zeros((size, numpy.shape(bounds)[0]))
+    if dimension != 0:
+        if sampler == "lhs":
+            unit_values[:, active] = pyDOE2.lhs(
+                dimension, samples=size, criterion="maximin", random_state=seed
+            )
+        else:
+            from scipy.stats import qmc
+
+            if sampler == "sobol":
+                engine = qmc.Sobol(dimension, scramble=True, seed=seed)
+            else:
+                engine = qmc.Halton(dimension, scramble=True, seed=seed)
+            unit_values[:, active] = engine.random(size)
+    doe_values = bounds[:, 0] + unit_values * (bounds[:, 1] - bounds[:, 0])
+    return 10 ** doe_values if log_space else doe_values
+
+
+# -------[Define spatial index answering box-window queries on a DOE]-----------
+class BoxIndex:
+    """Class indexing a feasible DOE to answer box-window queries (points at proper_spacing distance in each
+        dimension) for a whole nominal DOE in one call, instead of scanning the complete DOE for each nominal point.
+
+     Parameters
+     ----------
+     doe: [m*n] numpy.array of int or float
+          DOE representing m feasible experiments expressed with n parameters with non-optimal spacing
+
+     proper_spacing: [n*1] numpy.array of float
+                     Represents max distance criteria on each DOE axis (i.e. parameter scale)
+
+     log_space: bool
+                Defines if the index has to be built in log space or when false, linear (default is True)
+
+     method: str
+             Defines the index structure: 'kdtree' (default) for a KD-tree on the spacing-scaled points or 'grid'
+             for a uniform grid of proper_spacing sized buckets
+
+     Example
+     -------
+     to define DOEs, see :func:`~sizinglab.addon.pixdoe.surroundings`
+
+     then index the feasible DOE and extract the points in each nominal point window:
+         >>> In [6]: box_index = BoxIndex(doe, proper_spacing, True)
+         >>> In [7]: [len(window) for window in box_index.query_box(nominal_doe)]
+         >>> Out[7]: [12, 12, 24, 24, 12, 12]
+
+     Note
+     ----
+     Candidates are selected with a small tolerance and then filtered with the exact criteria used by
+     :func:`~sizinglab.addon.pixdoe.find_nearest`, so that returned windows are identical to the exhaustive scan.
+
+    """
+
+    def __init__(self, doe, proper_spacing, log_space=True, method="kdtree"):
+        """Method to build the index using syntax expressed in example.
+
+        """
+        if not (isinstance(doe, numpy.ndarray) and isinstance(proper_spacing, numpy.ndarray)):
+            raise TypeError("doe and proper_spacing should be numpy arrays.")
+        if not (
+            numpy.issubdtype(doe.dtype, numpy.float64) or numpy.issubdtype(doe.dtype, numpy.integer)
+        ):
+            raise TypeError("elements type in doe should be float or integer.")
+        if not (isinstance(log_space, bool)):
+            raise TypeError("log_space shoold be boolean.")
+        if not (method in ["kdtree", "grid"]):
+            raise ValueError("method should be 'kdtree' or 'grid'.")
+        if numpy.shape(doe)[1] != len(proper_spacing):
+            raise IndexError("column numbers mismatch between doe and proper_spacing.")
+        self.X = numpy.log10(doe) if log_space else doe
+        self.proper_spacing = proper_spacing
+        self.log_space = log_space
+        self.method = method
+        # Null spacing axes cannot be scaled: they are only checked by the exact filtering
+        self._active = proper_spacing > 0
+        scaled_X = self.X[:, self._active] / proper_spacing[self._active]
+        if method == "kdtree":
+            self._tree = cKDTree(scaled_X) if numpy.any(self._active) else None
+        else:
+            # Store for each occupied cell the (increasing) indices of the points it contains
+            cells = numpy.floor(scaled_X).astype(numpy.int64)
+            self._buckets = {}
+            if len(cells) != 0:
+                occupied_cells, inverse = numpy.unique(cells, axis=0, return_inverse=True)
+                inverse = numpy.reshape(inverse, -1)
+                order = numpy.argsort(inverse, kind="stable")
+                ends = numpy.cumsum(numpy.bincount(inverse))
+                for cell_idx in range(len(occupied_cells)):
+                    start = 0 if cell_idx == 0 else ends[cell_idx - 1]
+                    self._buckets[tuple(occupied_cells[cell_idx].tolist())] = order[
+                        start : ends[cell_idx]
+                    ]
+
+    def _tolerance(self, scaled_Y):
+        """Method (*internal*) returning the scaled distance margin covering rounding errors of the scaling.
+
+        """
+        magnitude = 0.0
+        if numpy.size(scaled_Y) != 0:
+            magnitude = max(magnitude, float(numpy.amax(abs(scaled_Y))))
+        if numpy.size(self.X) != 0:
+            magnitude = max(
+                magnitude,
+                float(numpy.amax(abs(self.X[:, self._active]) / self.proper_spacing[self._active])),
+            )
+        return 1e-9 * (1.0 + magnitude)
+
+    def _candidates(self, Y):
+        """Method (*internal*) returning for each point of Y (already in index space) a superset of its window.
+
+        """
+        all_index = numpy.arange(numpy.shape(self.X)[0])
+        if not (numpy.any(self._active)):
+            return [all_index for _ in range(numpy.shape(Y)[0])]
+        scaled_Y = Y[:, self._active] / self.proper_spacing[self._active]
+        tolerance = self._tolerance(scaled_Y)
+        if self.method == "kdtree":
+            candidates = self._tree.query_ball_point(scaled_Y, r=1.0 + tolerance, p=numpy.inf)
+            return [numpy.array(sorted(candidate), dtype=int) for candidate in candidates]
+        candidates = []
+        lower_cells = numpy.floor(scaled_Y - 1.0 - tolerance).astype(numpy.int64)
+        upper_cells = numpy.floor(scaled_Y + 1.0 + tolerance).astype(numpy.int64)
+        for y_idx in range(numpy.shape(Y)[0]):
+            ranges = [
+                range(lower_cells[y_idx, i], upper_cells[y_idx, i] + 1)
+                for i in range(numpy.shape(scaled_Y)[1])
+            ]
+            found = [
+                self._buckets[cell] for cell in itertools.product(*ranges) if cell in self._buckets
+            ]
+            if len(found) == 0:
+                candidates.append(numpy.array([], dtype=int))
+            else:
+                candidates.append(numpy.sort(numpy.concatenate(found)))
+        return candidates
+
+    def query_box(self, nominal_doe):
+        """Method returning for each point in nominal DOE the increasing indices of the feasible DOE points
+            within proper_spacing distance in each dimension (list of k numpy.array of int).
+
+        """
+        if not (isinstance(nominal_doe, numpy.ndarray)):
+            raise TypeError("nominal_doe shoold be numpy array.")
+        if numpy.shape(nominal_doe)[1] != numpy.shape(self.X)[1]:
+            raise IndexError("column numbers mismatch between doe and nominal_doe.")
+        Y = numpy.log10(nominal_doe) if self.log_space else nominal_doe
+        windows = []
+        candidates = self._candidates(Y)
+        for y_idx in range(numpy.shape(Y)[0]):
+            candidate = candidates[y_idx]
+            # Exact filtering, identical to exhaustive scan
+            valid = (
+                numpy.sum(
+                    (abs(self.X[candidate, :] - Y[y_idx, :]) <= self.proper_spacing).astype(int),
+                    axis=1,
+                )
+                == len(self.proper_spacing)
+            )
+            windows.append(candidate[valid])
+        return windows
+
+    def query_any(self, nominal_doe, chunk_size=1024):
+        """Method returning for each point in nominal DOE if at least one feasible DOE point is within
+            proper_spacing distance in each dimension (numpy.array of bool), nominal points being processed by
+            chunks of chunk_size rows.
+
+        """
+        if not (isinstance(nominal_doe, numpy.ndarray)):
+            raise TypeError("nominal_doe shoold be numpy array.")
+        if numpy.shape(nominal_doe)[1] != numpy.shape(self.X)[1]:
+            raise IndexError("column numbers mismatch between doe and nominal_doe.")
+        Y = numpy.log10(nominal_doe) if self.log_space else nominal_doe
+        found = numpy.zeros(numpy.shape(Y)[0], bool)
+        if numpy.shape(self.X)[0] == 0:
+            return found
+        for start in range(0, numpy.shape(Y)[0], chunk_size):
+            Y_chunk = Y[start : start + chunk_size, :]
+            undecided = numpy.ones(numpy.shape(Y_chunk)[0], bool)
+            # On fully indexed axes the nearest point (infinite norm) decides for all but boundary cases
+            if self.method == "kdtree" and numpy.all(self._active):
+                scaled_Y = Y_chunk / self.proper_spacing
+                tolerance = self._tolerance(scaled_Y)
+                distance, nearest = self._tree.query(
+                    scaled_Y, k=1, p=numpy.inf, distance_upper_bound=1.0 + tolerance
+                )
+                undecided = numpy.isfinite(distance)
+                nearest = nearest[undecided]
+                valid = numpy.sum(
+                    (abs(self.X[nearest, :] - Y_chunk[undecided, :]) <= self.proper_spacing).astype(
+                        int
+                    ),
+                    axis=1,
+                ) == len(self.proper_spacing)
+                found[start : start + chunk_size][numpy.flatnonzero(undecided)[valid]] = True
+                undecided[numpy.flatnonzero(undecided)[valid]] = False
+            if numpy.any(undecided):
+                undecided_index = numpy.flatnonzero(undecided)
+                candidates = self._candidates(Y_chunk[undecided_index, :])
+                for y_idx in range(len(undecided_index)):
+                    candidate = candidates[y_idx]
+                    found[start + undecided_index[y_idx]] = bool(
+                        numpy.any(
+                            numpy.sum(
+                                (
+                                    abs(self.X[candidate, :] - Y_chunk[undecided_index[y_idx], :])
+                                    <= self.proper_spacing
+                                ).astype(int),
+                                axis=1,
+                            )
+                            == len(self.proper_spacing)
+                        )
+                    )
+        return found
+
+    def matches(self, doe, proper_spacing, log_space):
+        """Method (*internal*) to check that the index has been built on given data and settings.
+
+        """
+        return (
+            self.log_space == log_space
+            and numpy.shape(self.X) == numpy.shape(doe)
+            and numpy.array_equal(self.proper_spacing, proper_spacing)
+        )
+
+
 # -------[Define function keeping nominal point if surrounded by feasible]------
-def surroundings(doe, nominal_doe, proper_spacing, LogLin=True):
+def surroundings(doe, nominal_doe, proper_spacing, LogLin=True, backend="scan", chunk_size=1024):
     """Function to reduce a given nominal DOE on a max distance criteria with points from feasible DOE ('reachable' points).
     
      Parameters
@@ -129,6 +474,15 @@ def surroundings(doe, nominal_doe, proper_spacing, LogLin=True):
                      
      log_space: bool
                 Defines if fullfact has to be in log space or when false, linear (default is True)
+
+     backend: str or BoxIndex
+              Defines how feasible points are searched: 'scan' (default) compares nominal and feasible DOE by blocks,
+              'kdtree' and 'grid' build a :class:`~sizinglab.addon.pixdoe.BoxIndex` on doe, an already built BoxIndex
+              (same doe, proper_spacing and log_space) is reused
+
+     chunk_size: int
+                 Maximum number of nominal (and feasible for 'scan') points compared at once, bounding temporary arrays
+                 size to chunk_size*chunk_size*n (default is 1024)
      
      Returns
      -------
@@ -180,23 +534,48 @@ def surroundings(doe, nominal_doe, proper_spacing, LogLin=True):
             and numpy.shape(doe)[1] == len(proper_spacing)
         ):
             raise IndexError("column numbers mismatch between doe, nominal_doe and dmax.")
+        if not (isinstance(chunk_size, int)) or chunk_size < 1:
+            raise ValueError("chunk_size should be an integer >= 1.")
+        if isinstance(backend, BoxIndex):
+            if not (backend.matches(doe, proper_spacing, LogLin)):
+                raise ValueError("backend index built on different doe, proper_spacing or log_space.")
+            box_index = backend
+        elif backend in ["kdtree", "grid"]:
+            box_index = BoxIndex(doe, proper_spacing, LogLin, backend)
+        elif backend == "scan":
+            box_index = None
+        else:
+            raise ValueError("backend should be 'scan', 'kdtree', 'grid' or a BoxIndex.")
+        if box_index is not None:
+            to_be_removed = box_index.query_any(nominal_doe, chunk_size) == False
+            return nominal_doe[to_be_removed == False], to_be_removed
         # Transform DOE into log space if needed
         X = numpy.log10(doe) if LogLin else doe
         Y = numpy.log10(nominal_doe) if LogLin else nominal_doe
         # For each point in nominal_doe find if a point in doe at dmax distance in each dimension and annulate removal
+        # (comparisons are done by [chunk_size*chunk_size] blocks, skipping nominal points already validated)
         to_be_removed = numpy.ones(len(nominal_doe), bool)
-        for y_idx in range(numpy.shape(Y)[0]):
-            valid_distance = bool(
-                numpy.sum(
-                    (
-                        numpy.sum((abs(X - Y[y_idx, :]) <= proper_spacing).astype(int), axis=1)
-                        == len(proper_spacing)
-                    ).astype(int)
+        for y_start in range(0, numpy.shape(Y)[0], chunk_size):
+            y_index = numpy.arange(y_start, min(y_start + chunk_size, numpy.shape(Y)[0]))
+            for x_start in range(0, numpy.shape(X)[0], chunk_size):
+                y_index = y_index[to_be_removed[y_index]]
+                if len(y_index) == 0:
+                    break
+                valid_distance = numpy.any(
+                    numpy.sum(
+                        (
+                            abs(
+                                X[numpy.newaxis, x_start : x_start + chunk_size, :]
+                                - Y[y_index, numpy.newaxis, :]
+                            )
+                            <= proper_spacing
+                        ).astype(int),
+                        axis=2,
+                    )
+                    == len(proper_spacing),
+                    axis=1,
                 )
-                >= 1
-            )
-            if valid_distance:
-                to_be_removed[y_idx] = False
+                to_be_removed[y_index[valid_distance]] = False
         return nominal_doe[to_be_removed == False], to_be_removed
     elif not (isinstance(doe, numpy.ndarray)):
         raise TypeError("doe shoold be numpy array.")
@@ -209,7 +588,16 @@ def surroundings(doe, nominal_doe, proper_spacing, LogLin=True):
 
 
 # -------[Define function finding choice_nb nearest points to nominal]----------
-def find_nearest(doe, nominal_doe, choice_nb, proper_spacing, log_space=True):
+def find_nearest(
+    doe,
+    nominal_doe,
+    choice_nb,
+    proper_spacing,
+    log_space=True,
+    backend="scan",
+    return_distance=False,
+    chunk_size=1024,
+):
     """Function that returns for each point in nominal DOE point, the indices and max relative error for choice_nb nearest points in feasible DOE.
         As a distance has to be computed to select nearest in further functions, it is the max value of the relative errors (compared to bounds) 
         that is returned (this avoid infinite relative error for [0, 0] origin point).
@@ -227,21 +615,36 @@ def find_nearest(doe, nominal_doe, choice_nb, proper_spacing, log_space=True):
      
      log_space: bool
                 Defines if fullfact has to be in log space or when false, linear (default is True)
+
+     backend: str or BoxIndex
+              Defines how the proper_spacing windows are searched: 'scan' (default) scans the whole doe for each
+              nominal point, 'kdtree' and 'grid' build a :class:`~sizinglab.addon.pixdoe.BoxIndex` on doe and query
+              all nominal points at once, an already built BoxIndex (same doe, proper_spacing and log_space) is reused
+
+     return_distance: bool
+                      Defines if relative distances of returned points have to be returned (default is False)
+
+     chunk_size: int
+                 Number of nominal points processed at once (default is 1024)
     
      Returns
      -------
      nearest_index_in_doe: [k*choice_nb] numpy.array of int
-                            Gathers the corresponding 'choice_nb' nearest DOE points indices
+                            Gathers the corresponding 'choice_nb' nearest DOE points indices (-1 if not available)
+
+     rel_distance: [k*choice_nb] numpy.array of float
+                   Relative distance sqrt(sum(((x-x_n)/(max(x_n)-min(x_n)))**2)) of these points (inf if not available),
+                   returned only if return_distance is True
     
      Example
      -------
      to define DOEs, see :func:`~sizinglab.addon.pixdoe.surroundings`
      
      then extract the 2 nearest feasible points for each nominal point:
-         >>> In [6]: index, max_rel_distance = find_nearest(doe, nominal_doe, 2, proper_spacing, True)
+         >>> In [6]: index, rel_distance = find_nearest(doe, nominal_doe, 2, proper_spacing, True, return_distance=True)
          >>> In [7]: index.tolist()
          >>> Out[7]: [[0, 4], [3, 7], [8, 12], [11, 15], [20, 16], [23, 19]]
-         >>> In [8]: max_rel_distance.tolist()
+         >>> In [8]: rel_distance.tolist()
          >>> Out[8]: [[0.0, 0.20000000000000018], [0.0, 0.20000000000000018], [0.10000000000000009, 0.10000000000000009], [0.10000000000000009, 0.10000000000000009], [0.0, 0.20000000000000018], [0.0, 0.20000000000000018]]
     
     """
@@ -266,33 +669,64 @@ def find_nearest(doe, nominal_doe, choice_nb, proper_spacing, log_space=True):
             raise IndexError("column numbers mismatch between doe and nominal_doe.")
         if choice_nb < 1:
             raise ValueError("choice_nb numbers should be >= 1")
+        if isinstance(backend, BoxIndex):
+            if not (backend.matches(doe, proper_spacing, log_space)):
+                raise ValueError("backend index built on different doe, proper_spacing or log_space.")
+            box_index = backend
+        elif backend in ["kdtree", "grid"]:
+            box_index = BoxIndex(doe, proper_spacing, log_space, backend)
+        elif backend == "scan":
+            box_index = None
+        else:
+            raise ValueError("backend should be 'scan', 'kdtree', 'grid' or a BoxIndex.")
+        if not (isinstance(chunk_size, int)) or chunk_size < 1:
+            raise ValueError("chunk_size should be an integer >= 1.")
         # Initialise distance and index matrices
-        i = 0
         nearest_index_in_doe = -1 * numpy.ones([numpy.shape(nominal_doe)[0], choice_nb], dtype=int)
-        # If necessary convert data
+        nearest_distance = numpy.inf * numpy.ones([numpy.shape(nominal_doe)[0], choice_nb])
+        # If necessary convert data and compute normalization once
         X = numpy.log10(doe) if log_space else doe
         Y = numpy.log10(nominal_doe) if log_space else nominal_doe
-        # Find for each nominal PI value in DOE n<=choice_nb nearest points
-        for x_value in Y:
+        Y_range = numpy.amax(Y, axis=0) - numpy.amin(Y, axis=0)
+        index = numpy.arange(numpy.shape(X)[0])
+        # Find for each chunk of nominal PI values in DOE n<=choice_nb nearest points
+        for start in range(0, numpy.shape(Y)[0], chunk_size):
+            stop = min(start + chunk_size, numpy.shape(Y)[0])
             # Filter data to limit to the ones in the proper_spacing space envelope
-            index = numpy.array(range(numpy.shape(X)[0]))
-            reduced_index = index[
-                numpy.sum((abs(X - x_value) <= proper_spacing).astype(int), axis=1)
-                == len(proper_spacing)
-            ]
-            if len(reduced_index) <= choice_nb:
-                nearest_index_in_doe[i, : len(reduced_index)] = reduced_index
+            if box_index is not None:
+                windows = box_index.query_box(nominal_doe[start:stop, :])
             else:
-                # If more than choice_nb point available, select the one with smaller relative distance
-                reduced_X = X[reduced_index, :]
-                rel_distance_matrix = (reduced_X - x_value) / (
-                    numpy.amax(Y, axis=0) - numpy.amin(Y, axis=0)
-                )
-                rel_distance_vector = numpy.sum(rel_distance_matrix ** 2, axis=1) ** 0.5
-                nearest_index_in_doe[i] = reduced_index[
-                    numpy.argpartition(rel_distance_vector, choice_nb)[:choice_nb]
+                windows = [
+                    index[
+                        numpy.sum((abs(X - x_value) <= proper_spacing).astype(int), axis=1)
+                        == len(proper_spacing)
+                    ]
+                    for x_value in Y[start:stop, :]
                 ]
-            i += 1
+            # Compute relative distances of all the chunk windows points at once
+            windows_size = numpy.array([len(window) for window in windows], dtype=int)
+            if numpy.sum(windows_size) == 0:
+                continue
+            owner = numpy.repeat(numpy.arange(start, stop), windows_size)
+            rel_distance_matrix = (X[numpy.concatenate(windows), :] - Y[owner, :]) / Y_range
+            rel_distance = numpy.sum(rel_distance_matrix ** 2, axis=1) ** 0.5
+            offsets = numpy.concatenate(([0], numpy.cumsum(windows_size)))
+            for i in range(start, stop):
+                reduced_index = windows[i - start]
+                rel_distance_vector = rel_distance[offsets[i - start] : offsets[i - start + 1]]
+                if len(reduced_index) <= choice_nb:
+                    nearest_index_in_doe[i, : len(reduced_index)] = reduced_index
+                    nearest_distance[i, : len(reduced_index)] = rel_distance_vector
+                    continue
+                # If more than choice_nb point available, select the one with smaller relative distance
+                if choice_nb == 1 and not (numpy.any(numpy.isnan(rel_distance_vector))):
+                    selected = numpy.argmin(rel_distance_vector)
+                else:
+                    selected = numpy.argpartition(rel_distance_vector, choice_nb)[:choice_nb]
+                nearest_index_in_doe[i] = reduced_index[selected]
+                nearest_distance[i] = rel_distance_vector[selected]
+        if return_distance:
+            return nearest_index_in_doe, nearest_distance
         return nearest_index_in_doe
     elif not (isinstance(doe, numpy.ndarray)):
         raise TypeError("doe shoold be numpy array.")
@@ -307,7 +741,7 @@ def find_nearest(doe, nominal_doe, choice_nb, proper_spacing, log_space=True):
 
 
 # -------[Define function electing point by increasing occurrence]---------------
-def elect_nearest(doe, nominal_doe, index):
+def elect_nearest(doe, nominal_doe, index, method="greedy", distance=None):
     """Function that tries to assign for each point in nominal DOE, one point in feasible DOE elected from its 'choice_nb' found indices.
         The assignments are done point-to-point electing each time the one maximizing minimum relative distance with current elected set.
         If from available indices they all are already in the set, point is deleted and thus: j<=k (not likely to happen).
@@ -322,6 +756,15 @@ def elect_nearest(doe, nominal_doe, index):
  
      index: [k*nb_choice] numpy.array of int 
              Gathers the corresponding 'choice_nb' nearest DOE points indices (computed with :~pixdoe.find_nearest)
+
+     method: str
+             Defines the assignment: 'greedy' (default) elects point-to-point maximizing minimum relative distance with
+             elected set, 'hungarian' solves globally the assignment electing as many points as possible and, if
+             distance is defined, minimizing the sum of the distances between nominal and elected points
+
+     distance: [k*nb_choice] numpy.array of float
+               Distance between each nominal point and its indices (same shape as index), only used by 'hungarian'
+               method (default is None)
     
      Returns
      -------
@@ -366,61 +809,88 @@ def elect_nearest(doe, nominal_doe, index):
             raise ValueError("maximum stored index is greater than doe size.")
         if numpy.shape(nominal_doe)[0] != numpy.shape(index)[0]:
             raise ValueError("nominal_doe and index should have same number of rows.")
+        if not (method in ["greedy", "hungarian"]):
+            raise ValueError("method should be 'greedy' or 'hungarian'.")
+        if distance is not None and numpy.shape(distance) != numpy.shape(index):
+            raise ValueError("distance and index should have same shape.")
         # Order matching by increasing number of available points
         available_index = numpy.sum(index != -1, axis=1)
         index = index[numpy.argsort(available_index), :]
         nominal_doe = nominal_doe[numpy.argsort(available_index), :]
-        # Match 1-by-1 points maximizing minimum relative distance with elected_set
-        index_elected = numpy.array([]).astype(int)
-        doe_elected = numpy.array([]).astype(float)
-        reduced_nominal_doe = numpy.array([]).astype(float)
-        for nr in range(numpy.shape(index)[0]):
-            # For 1st point elect first available index
-            if len(doe_elected) == 0:
-                index_elected = numpy.append(index_elected, index[nr, 0])
-                doe_elected = doe[index[nr, 0], :]
-                reduced_nominal_doe = nominal_doe[nr, :]
-            # For other points elect from available index the one with maximum distance
-            else:
-                # Extract available index
-                available_index = index[nr, :]
-                available_index = available_index[available_index != -1]
-                # Remove already elected index
-                to_be_kept = numpy.ones(len(available_index)).astype(bool)
-                for i in range(len(available_index)):
-                    if available_index[i] in index_elected:
-                        to_be_kept[i] = False
-                available_index = available_index[to_be_kept]
-                # If 1 point remaining take it, if more than one, elect it on max_min criteria
-                if len(available_index) >= 1:
-                    if len(available_index) > 1:
-                        rel_distance = numpy.zeros(len(available_index)).astype(float)
-                        doe_range = numpy.amax(doe, axis=0) - numpy.amin(doe, axis=0)
-                        doe_range = doe_range + 1 * (doe_range == 0)
-                        for i in range(len(available_index)):
-                            try:
-                                rel_distance[i] = numpy.amin(
-                                    (
-                                        numpy.sum(
-                                            ((doe_elected - doe[available_index[i], :]) / doe_range)
-                                            ** 2,
-                                            axis=1,
-                                        )
-                                    )
-                                    ** 0.5
-                                )
-                            except:  # If only one point elected
-                                rel_distance[i] = (
-                                    numpy.sum(
-                                        ((doe_elected - doe[available_index[i], :]) / doe_range)
-                                        ** 2
-                                    )
-                                    ** 0.5
-                                )
-                        available_index = available_index[numpy.argsort(-1 * rel_distance)]
-                    index_elected = numpy.append(index_elected, available_index[0])
-                    doe_elected = numpy.vstack([doe_elected, doe[available_index[0], :]])
-                    reduced_nominal_doe = numpy.vstack([reduced_nominal_doe, nominal_doe[nr, :]])
+        if distance is not None:
+            distance = distance[numpy.argsort(available_index), :]
+        doe_range = numpy.amax(doe, axis=0) - numpy.amin(doe, axis=0)
+        doe_range = doe_range + 1 * (doe_range == 0)
+        # Candidates are the distinct available indices, each point of index is expressed as a candidate position
+        candidates, position = numpy.unique(index, return_inverse=True)
+        position = numpy.reshape(position, numpy.shape(index))
+        position[index == -1] = -1
+        if len(candidates) > 0 and candidates[0] == -1:
+            position = position - 1 * (position != -1)
+            candidates = candidates[1:]
+        # Preallocate elected sets (row in nominal_doe and index in doe)
+        elected_row = numpy.zeros(numpy.shape(index)[0], dtype=int)
+        elected_index = numpy.zeros(numpy.shape(index)[0], dtype=int)
+        elected_nb = 0
+        if method == "hungarian" and len(candidates) != 0:
+            from scipy.optimize import linear_sum_assignment
+
+            # Cost is the distance to the nominal point (or 1), non-available candidates being prohibitive
+            cost = numpy.zeros((numpy.shape(index)[0], len(candidates)))
+            available = numpy.zeros(numpy.shape(cost), bool)
+            for nr in range(numpy.shape(index)[0]):
+                valid = position[nr] != -1
+                available[nr, position[nr][valid]] = True
+                cost[nr, position[nr][valid]] = 1.0 if distance is None else distance[nr][valid]
+            prohibitive_cost = (numpy.shape(index)[0] + 1) * (numpy.amax(cost) + 1)
+            cost[available == False] = prohibitive_cost
+            rows, columns = linear_sum_assignment(cost)
+            assigned = available[rows, columns]
+            elected_nb = int(numpy.sum(assigned))
+            elected_row[:elected_nb] = rows[assigned]
+            elected_index[:elected_nb] = candidates[columns[assigned]]
+        elif method == "greedy":
+            # Match 1-by-1 points maximizing minimum relative distance with elected set (running minimum)
+            taken = numpy.zeros(len(candidates), bool)
+            min_distance = numpy.full(len(candidates), numpy.inf)
+            for nr in range(numpy.shape(index)[0]):
+                # For 1st point elect first available index
+                if elected_nb == 0:
+                    new_index = index[nr, 0]
+                # For other points elect from available index the one with maximum distance
+                else:
+                    # Extract available index and remove already elected ones
+                    available_position = position[nr, :]
+                    available_position = available_position[available_position != -1]
+                    available_position = available_position[taken[available_position] == False]
+                    # If 1 point remaining take it, if more than one, elect it on max_min criteria
+                    if len(available_position) == 0:
+                        continue
+                    if len(available_position) > 1:
+                        available_position = available_position[
+                            numpy.argsort(-1 * min_distance[available_position])
+                        ]
+                    new_index = candidates[available_position[0]]
+                elected_row[elected_nb] = nr
+                elected_index[elected_nb] = new_index
+                elected_nb += 1
+                # Update taken mask and candidates minimum distance to elected set
+                taken[candidates == new_index] = True
+                min_distance = numpy.minimum(
+                    min_distance,
+                    numpy.sum(((doe[new_index, :] - doe[candidates, :]) / doe_range) ** 2, axis=1)
+                    ** 0.5,
+                )
+        # Single elected point is returned as a row (as for the 1st elected point)
+        if elected_nb == 0:
+            doe_elected = numpy.array([]).astype(float)
+            reduced_nominal_doe = numpy.array([]).astype(float)
+        elif elected_nb == 1:
+            doe_elected = doe[elected_index[0], :]
+            reduced_nominal_doe = nominal_doe[elected_row[0], :]
+        else:
+            doe_elected = doe[elected_index[:elected_nb], :]
+            reduced_nominal_doe = nominal_doe[elected_row[:elected_nb], :]
         return doe_elected, reduced_nominal_doe
     elif not (isinstance(doe, numpy.ndarray)):
         raise TypeError("doe shoold be numpy array.")
@@ -432,7 +902,17 @@ def elect_nearest(doe, nominal_doe, index):
 
 # -------[Define subfunction avoid script repetition, defines constrained DOEs]-
 def declare_does(
-    x_Bounds, x_levels, parameters_constraints, pi_constraints, func_x_to_pi, log_space=True
+    x_Bounds,
+    x_levels,
+    parameters_constraints,
+    pi_constraints,
+    func_x_to_pi,
+    log_space=True,
+    block_size=None,
+    candidate_sampler="fullfact",
+    workers=None,
+    executor="thread",
+    candidate_size=None,
 ):
     """Function to generate X and Pi DOE with constraints (called as sub-function script).
     
@@ -452,6 +932,26 @@ def declare_does(
      
      log_space: bool
                 Defines if fullfact has to be in log space or when false, linear (default is True)
+
+     block_size: int
+                 If defined, fullfact (see :func:`~sizinglab.addon.pixdoe.create_doe_blocks`) or candidate pool is
+                 filtered by blocks of block_size experiments to store only feasible points (default is None)
+
+     candidate_sampler: str
+                        Defines X-DOE generation: 'fullfact' (default) or a quasi-random sequence 'sobol', 'halton' or
+                        'lhs' of candidate_size points (see :func:`~sizinglab.addon.pixdoe.create_candidates`)
+
+     workers: int
+              If defined, X-DOE (or each block) is split into row shards on which constraints and func_x_to_pi are
+              evaluated by a pool of workers (default is None)
+
+     executor: str
+               Defines the pool type: 'thread' (default) or 'process' (functions should then be picklable, i.e.
+               defined at module level)
+
+     candidate_size: int
+                     Number of points drawn by candidate_sampler (rounded to the upper power of 2 for 'sobol'), default
+                     is None (same number of points as the x_levels fullfact)
      
      Returns
      -------
@@ -462,16 +962,160 @@ def declare_does(
               Represents the Pi DOE's points computed from doeX and applying both X and Pi constraints (k<=m)
     
     """
-    doeX, _ = create_doe(x_Bounds, x_levels, log_space)
+    if workers is not None and (not (isinstance(workers, int)) or workers < 1):
+        raise ValueError("workers should be an integer >= 1.")
+    if not (executor in ["thread", "process"]):
+        raise ValueError("executor should be 'thread' or 'process'.")
+    if candidate_size is not None and (not (isinstance(candidate_size, int)) or candidate_size < 1):
+        raise ValueError("candidate_size should be an integer >= 1.")
+    pool = None
+    if workers is not None and workers > 1:
+        pool = (
+            concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+            if executor == "thread"
+            else concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        )
+
+    # Define constraints and transformation application on a X-DOE (by shards if pool is defined)
+    def constrain_does(doeX):
+        if pool is None:
+            shards_results = [
+                _constrain_does(doeX, parameters_constraints, pi_constraints, func_x_to_pi)
+            ]
+        else:
+            shards = [shard for shard in numpy.array_split(doeX, workers) if len(shard) != 0]
+            shards_results = list(
+                pool.map(
+                    _constrain_does,
+                    shards,
+                    itertools.repeat(parameters_constraints),
+                    itertools.repeat(pi_constraints),
+                    itertools.repeat(func_x_to_pi),
+                )
+            )
+        shards_results = [result for result in shards_results if len(result[0]) != 0]
+        if len(shards_results) == 0:
+            return numpy.zeros((0, numpy.shape(x_Bounds)[0])), []
+        return (
+            numpy.concatenate([result[0] for result in shards_results]),
+            numpy.concatenate([result[1] for result in shards_results]),
+        )
+
+    try:
+        if candidate_sampler != "fullfact":
+            if candidate_size is None:
+                candidate_size = int(numpy.prod(x_levels + 1 * (x_levels == 0)))
+            candidates = create_candidates(x_Bounds, candidate_size, candidate_sampler, log_space)
+            if block_size is None:
+                return constrain_does(candidates)
+            doeX_blocks = (
+                candidates[start : start + block_size]
+                for start in range(0, len(candidates), block_size)
+            )
+        elif block_size is None:
+            doeX, _ = create_doe(x_Bounds, x_levels, log_space)
+            return constrain_does(doeX)
+        else:
+            doeX_blocks = create_doe_blocks(x_Bounds, x_levels, log_space, block_size)
+        # Filter X-DOE block by block and keep only feasible points
+        doeX_list = []
+        doePI_list = []
+        for doeX in doeX_blocks:
+            doeX, doePI = constrain_does(doeX)
+            if len(doeX) != 0:
+                doeX_list.append(doeX)
+                doePI_list.append(doePI)
+        if len(doeX_list) == 0:
+            return numpy.zeros((0, numpy.shape(x_Bounds)[0])), []
+        return numpy.concatenate(doeX_list), numpy.concatenate(doePI_list)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+# -------[Define subfunction applying X and Pi constraints on a X-DOE shard]----
+def _constrain_does(doeX, parameters_constraints, pi_constraints, func_x_to_pi):
+    """Function (*internal*) applying parameters constraints, func_x_to_pi and Pi constraints on a X-DOE (shard).
+
+    """
     doeX = doeX[apply_constraints(doeX, parameters_constraints) == True]
     if len(doeX) == 0:
-        doePI = []
-    else:
-        doePI = func_x_to_pi(doeX.tolist())
-        doePI = doePI[apply_constraints(doePI, pi_constraints) == True, :]
+        return doeX, []
+    doePI = func_x_to_pi(doeX)
+    doePI = doePI[apply_constraints(doePI, pi_constraints) == True, :]
     return doeX, doePI
 
 
+# -------[Define create_const_doe diagnostics]----------------------------------
+class ConstDoeDiagnostics:
+    """Class gathering :func:`~sizinglab.addon.pixdoe.create_const_doe` process information (returned with
+        render=False and used by :func:`~sizinglab.addon.pixdoe.plot_const_doe`).
+
+     Attributes
+     ----------
+     timings: dict
+              Cumulated computation time [s] of 'PHASE1' (X-DOE), 'PHASE2' (nominal Pi-DOE) and 'selection' steps
+
+     x_levels_tried, pi_levels_tried: list of list of int
+                                      Levels of the X-DOE and nominal Pi-DOE fullfacts evaluated (in evaluation order),
+                                      X-DOE levels being replaced by [pool size] for quasi-random candidate_sampler
+
+     x_sizes, pi_sizes: list of int
+                        Corresponding constrained X-DOE sizes and nominal Pi-DOE sizes (after surroundings)
+
+     reduction_factor: float
+                       Set reduction factor (from feasible to optimal)
+
+     save: dict
+           Intermediate DOEs: 'doePI' (feasible Pi-DOE), 'doePIn' (nominal Pi-DOE), 'doePIn_c' (constrained nominal),
+           'doePIn_a' (active nominal), 'doePI_n' (nearest feasible) and 'doePI_e' (elected)
+
+     doeX, doeXc, doePIc: numpy.array of float
+                          Constrained X-DOE, elected X-DOE and corresponding Pi-DOE
+
+     cache_hit: bool
+                True if results were loaded from cache (timings, levels tried and sizes are then those of the cached
+                computation)
+
+    """
+
+    def __init__(
+        self, parameter_names, pi_names, log_space, choice_nb, spacing_division_criteria, pi_levels
+    ):
+        """Method to create initial diagnostics (called by create_const_doe).
+
+        """
+        self.parameter_names = parameter_names
+        self.pi_names = pi_names
+        self.log_space = log_space
+        self.choice_nb = choice_nb
+        self.spacing_division_criteria = spacing_division_criteria
+        self.pi_levels = pi_levels
+        self.pi_steps = 0
+        self.timings = {"PHASE1": 0.0, "PHASE2": 0.0, "selection": 0.0}
+        self.x_levels_tried = []
+        self.x_sizes = []
+        self.pi_levels_tried = []
+        self.pi_sizes = []
+        self.reduction_factor = 0.0
+        self.save = {}
+        self.doeX = numpy.array([])
+        self.doeXc = numpy.array([])
+        self.doePIc = numpy.array([])
+        self.cache_hit = False
+
+    def __repr__(self):
+        """Method to represent diagnostics as a summary.
+
+        """
+        return "ConstDoeDiagnostics(X-DOE sizes={}, Pi-DOE sizes={}, reduction={}%, timings={})".format(
+            self.x_sizes,
+            self.pi_sizes,
+            round(self.reduction_factor * 10000) / 100,
+            {key: round(value, 3) for key, value in self.timings.items()},
+        )
+
+
 # -------[Main function: create physical points matching nominal Pi DOE]--------
 def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs):
     """Function to generate a constrained feasible set DOE with repartition on PI not far from nominal fullfact DOE.
@@ -500,6 +1144,16 @@ def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs
                   * **track** (*bool*): defines if the different process steps information have to be displayed (default is False)
                   * **test_mode** (*bool*): set to False to show plots (default is False)
                   * **relative_points** (*list*): specifies the realtive number of points needed for each pi number (same order as in pi_set)
+                  * **candidate_sampler** (*str*): 'fullfact' (default) builds X-DOE as a fullfact, 'sobol', 'halton' or 'lhs' draws a pool of candidate_size quasi-random points in log/linear space (see :func:`~sizinglab.addon.pixdoe.create_candidates`)
+                  * **candidate_size** (*int*): initial candidate pool size for quasi-random candidate_sampler, then grown from the observed feasible ratio until the constrained X-DOE is large enough, default is 10 * whished_size
+                  * **election** (*str*): 'greedy' (default) or 'hungarian' assignment of feasible points to nominal ones (see :func:`~sizinglab.addon.pixdoe.elect_nearest`)
+                  * **cache_dir** (*str*): directory where results are stored as compressed .npz files and reused for the same problem signature (bounds, pi expressions, func_x_to_pi exponents, constraints expressions and DOE settings), default is None (no cache)
+                  * **cache_size** (*int*): maximum cache directory size in bytes, least recently used results being deleted first and results larger than cache_size not stored (default is 100e6)
+                  * **render** (*bool*): set to False to skip prints and plots (without importing matplotlib) and return a :class:`~sizinglab.addon.pixdoe.ConstDoeDiagnostics` instead of intermediate DOEs (default is True)
+                  * **workers** (*int*): number of threads evaluating constraints and func_x_to_pi on X-DOE row shards, default is None (no pool)
+                  * **block_size** (*int*): if defined, X fullfact (or candidate pool) is generated and constrained by blocks of block_size experiments to bound memory, default is None
+                  * **level_search** (*str*): 'step' (default) increases X and Pi levels one step at a time, 'rate' jumps to the levels expected from the constraints acceptance rate observed on previous steps (and bisects back on Pi levels)
+                  * **spatial_index** (*str*): feasible points search backend 'kdtree', 'grid' or 'scan' (see :func:`~sizinglab.addon.pixdoe.surroundings`), default is 'kdtree'
      
      Returns
      -------    
@@ -548,6 +1202,16 @@ def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs
         track = False
         test_mode = False
         relative_points = []
+        spatial_index = "kdtree"
+        level_search = "step"
+        block_size = None
+        candidate_sampler = "fullfact"
+        candidate_size = None
+        election = "greedy"
+        workers = None
+        render = True
+        cache_dir = None
+        cache_size = int(100e6)
         for key, value in kwargs.items():
             if not (
                 key
@@ -560,7 +1224,17 @@ def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs
                     "log_space",
                     "track",
                     "test_mode",
-                    "relative_points"
+                    "relative_points",
+                    "spatial_index",
+                    "level_search",
+                    "block_size",
+                    "candidate_sampler",
+                    "candidate_size",
+                    "election",
+                    "workers",
+                    "render",
+                    "cache_dir",
+                    "cache_size",
                 ]
             ):
                 raise KeyError("unknown argument " + key)
@@ -628,6 +1302,70 @@ def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs
                     relative_points = value
                 else:
                     raise ValueError("relative_points should be a list.")
+            elif key == "spatial_index":
+                if value in ["kdtree", "grid", "scan"]:
+                    spatial_index = value
+                else:
+                    raise ValueError("spatial_index should be 'kdtree', 'grid' or 'scan'.")
+            elif key == "level_search":
+                if value in ["step", "rate"]:
+                    level_search = value
+                else:
+                    raise ValueError("level_search should be 'step' or 'rate'.")
+            elif key == "block_size":
+                if isinstance(value, int):
+                    if value < 1:
+                        raise ValueError("block_size should be >=1.")
+                    else:
+                        block_size = value
+                else:
+                    raise TypeError("block_size should be an integer.")
+            elif key == "candidate_sampler":
+                if value in ["fullfact", "sobol", "halton", "lhs"]:
+                    candidate_sampler = value
+                else:
+                    raise ValueError(
+                        "candidate_sampler should be 'fullfact', 'sobol', 'halton' or 'lhs'."
+                    )
+            elif key == "candidate_size":
+                if isinstance(value, int):
+                    if value < 1:
+                        raise ValueError("candidate_size should be >=1.")
+                    else:
+                        candidate_size = value
+                else:
+                    raise TypeError("candidate_size should be an integer.")
+            elif key == "election":
+                if value in ["greedy", "hungarian"]:
+                    election = value
+                else:
+                    raise ValueError("election should be 'greedy' or 'hungarian'.")
+            elif key == "workers":
+                if isinstance(value, int):
+                    if value < 1:
+                        raise ValueError("workers should be >=1.")
+                    else:
+                        workers = value
+                else:
+                    raise TypeError("workers should be an integer.")
+            elif key == "render":
+                if isinstance(value, bool):
+                    render = value
+                else:
+                    raise ValueError("render should be a boolean.")
+            elif key == "cache_dir":
+                if isinstance(value, str):
+                    cache_dir = value
+                else:
+                    raise TypeError("cache_dir should be a string.")
+            elif key == "cache_size":
+                if isinstance(value, int):
+                    if value < 0:
+                        raise ValueError("cache_size should be >=0.")
+                    else:
+                        cache_size = value
+                else:
+                    raise TypeError("cache_size should be an integer.")
         # Extract bounds on parameters set and parameters number
         x_Bounds = []
         for index in parameter_set.dictionary.keys():
@@ -693,6 +1431,8 @@ def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs
                     whished_size
                 )
             )
+        if candidate_size is None:
+            candidate_size = 10 * whished_size
         # Create level repartition on pi and adapt it for constant parameter
         pi_levels = numpy.ones(pi_number, dtype=int)
         i = 0
@@ -700,6 +1440,73 @@ def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs
             if pi_set[index]._SI_bounds[0] == pi_set[index]._SI_bounds[1]:
                 pi_levels[i] = 0
             i += 1
+        diagnostics = ConstDoeDiagnostics(
+            [parameter_set[key].name for key in parameter_set.dictionary.keys()],
+            list(pi_set.dictionary.keys()),
+            log_space,
+            choice_nb,
+            spacing_division_criteria,
+            pi_levels,
+        )
+
+        # Define returned values (and renderings) from diagnostics
+        def const_doe_outputs(diagnostics):
+            if not render:
+                return diagnostics.doeXc, diagnostics.doePIc, diagnostics
+            if not (test_mode):
+                print("\n")
+                print(
+                    "Set reduction factor (from feasible to optimal) is {}%\n".format(
+                        round(diagnostics.reduction_factor * 10000) / 100
+                    )
+                )
+                # Plot Pi vs Pi fullfact graphs and x elected vs x constrained full-fact graphs
+                plot_const_doe(diagnostics)
+            save = diagnostics.save
+            return (
+                diagnostics.doeXc,
+                diagnostics.doePIc,
+                save["doePI"],
+                save["doePI_n"],
+                save["doePIn_c"],
+                save["doePIn_a"],
+            )
+
+        # Search for already computed results
+        cache_path = None
+        if cache_dir is not None:
+            signature = _const_doe_signature(
+                parameter_set,
+                pi_set,
+                func_x_to_pi,
+                parameters_constraints,
+                pi_constraints,
+                [
+                    whished_size,
+                    level_repartition.tolist(),
+                    choice_nb,
+                    spacing_division_criteria,
+                    log_space,
+                    relative_points,
+                    level_search,
+                    candidate_sampler,
+                    candidate_size if candidate_sampler != "fullfact" else None,
+                    election,
+                ],
+            )
+            if signature is None:
+                warnings.warn(
+                    "func_x_to_pi without declared exponents or constraints without declared expressions: "
+                    "cache not used."
+                )
+            else:
+                cache_path = os.path.join(cache_dir, signature + ".npz")
+                if os.path.isfile(cache_path):
+                    try:
+                        _load_const_doe_cache(cache_path, diagnostics)
+                        return const_doe_outputs(diagnostics)
+                    except Exception:
+                        warnings.warn("corrupted cache file {} ignored.".format(cache_path))
         # Set an initial set point on X 3 times greater than the wished constrained set (size will be automatically ajusted)
         init_coverage_factor = 3
         x_steps = 2
@@ -710,12 +1517,41 @@ def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs
         obtained_size_on_pi = 0
         pi_steps = 0
         save = {}
+        # Store X-DOE size, acceptance rate and constrained nominal Pi-DOEs (for a given level) between steps
+        x_pool_size = 0
+        x_acceptance_rate = 0.0
+        nominal_cache = {}
+        diagnostics.save = save
+
+        # Define nominal Pi-DOE reduction to points surrounded by feasible ones for given levels
+        def nominal_pi_doe(doePI, levels):
+            key = tuple(levels.tolist())
+            if key in nominal_cache:
+                doePIn_f, doePIn_c, spacing = nominal_cache[key]
+            else:
+                doePIn_f, spacing = create_doe(pi_Bounds, levels, log_space)
+                doePIn_c = doePIn_f[apply_constraints(doePIn_f, pi_constraints) == True]
+                nominal_cache[key] = (doePIn_f, doePIn_c, spacing)
+            # Index feasible Pi set once for surroundings and nearest points search
+            box_index = (
+                BoxIndex(doePI, spacing / spacing_division_criteria, log_space, spatial_index)
+                if spatial_index != "scan"
+                else spatial_index
+            )
+            doePIn_a, _ = surroundings(
+                doePI, doePIn_c, spacing / spacing_division_criteria, log_space, box_index
+            )
+            diagnostics.pi_levels_tried.append(levels.tolist())
+            diagnostics.pi_sizes.append(numpy.shape(doePIn_a)[0])
+            return doePIn_f, doePIn_c, doePIn_a, spacing, box_index
+
         # Starts automatic definition of initial X non-constrained set and nominal Pi set to have sufficient constrained nominal Pi set
         while obtained_size_on_pi < whished_size:
             # Init variables before entering X-DOE automatic loop
             step = 1
             previous_size = 0
             obtained_size_on_x = 0
+            phase_start = time.perf_counter()
             # [PHASE1] Loop increasing x parameters'level until obtaining a contrained set size >= whished_size * init_coverage_factor [CAN BE SLOW]
             if track:
                 print(
@@ -724,7 +1560,35 @@ def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs
                     )
                 )
             while obtained_size_on_x < (whished_size * init_coverage_factor):
-                x_steps += 1
+                if candidate_sampler == "fullfact":
+                    x_steps += 1
+                    # Jump to the levels expected to reach size criteria with the acceptance rate already observed
+                    if level_search == "rate" and x_acceptance_rate > 0:
+                        while fact_level(x_steps * x_levels) * x_acceptance_rate < (
+                            whished_size * init_coverage_factor
+                        ):
+                            x_steps += 1
+                    x_pool_size = int(fact_level(x_steps * x_levels))
+                else:
+                    # Grow candidate pool to the size expected from the feasible ratio observed (20% margin),
+                    # or double it when PHASE2 restarts PHASE1 (feasible set too small for nominal Pi-DOE)
+                    if x_pool_size == 0:
+                        x_pool_size = candidate_size
+                    elif step == 1:
+                        x_pool_size = 2 * x_pool_size
+                    elif x_acceptance_rate > 0:
+                        x_pool_size = max(
+                            int(
+                                math.ceil(
+                                    1.2 * whished_size * init_coverage_factor / x_acceptance_rate
+                                )
+                            ),
+                            x_pool_size + 1,
+                        )
+                    else:
+                        x_pool_size = 4 * x_pool_size
+                    if candidate_sampler == "sobol":
+                        x_pool_size = 2 ** int(math.ceil(math.log2(x_pool_size)))
                 doeX, doePI = declare_does(
                     x_Bounds,
                     x_steps * x_levels,
@@ -732,14 +1596,28 @@ def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs
                     pi_constraints,
                     func_x_to_pi,
                     log_space,
+                    block_size,
+                    candidate_sampler,
+                    workers,
+                    candidate_size=None if candidate_sampler == "fullfact" else x_pool_size,
                 )
                 save["doePI"] = doePI
                 obtained_size_on_x = numpy.shape(doeX)[0]
+                diagnostics.x_levels_tried.append(
+                    (x_steps * x_levels).tolist() if candidate_sampler == "fullfact" else [x_pool_size]
+                )
+                diagnostics.x_sizes.append(obtained_size_on_x)
+                x_acceptance_rate = obtained_size_on_x / x_pool_size
                 if track:
                     print(
-                        "Step{}: non constrained {} X-DOE factorial experiment leads to constrained [{}*{}] X-DOE matrix".format(
+                        "Step{}: non constrained {} X-DOE {} leads to constrained [{}*{}] X-DOE matrix".format(
                             step,
-                            level_name(x_steps * x_levels),
+                            level_name(x_steps * x_levels)
+                            if candidate_sampler == "fullfact"
+                            else x_pool_size,
+                            "factorial experiment"
+                            if candidate_sampler == "fullfact"
+                            else candidate_sampler + " candidates",
                             obtained_size_on_x,
                             parameters_number,
                         )
@@ -747,8 +1625,13 @@ def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs
                     if not (obtained_size_on_x < (whished_size * init_coverage_factor)):
                         print("Skipping to PHASE2...\n")
                 step += 1
+            diagnostics.timings["PHASE1"] += time.perf_counter() - phase_start
+            phase_start = time.perf_counter()
             # Calculate the equivalent init_coverage_factor for obtained parameters_level such as constrained doe size >= whished_size * init_coverage_factor
-            init_coverage_factor = math.trunc(fact_level(x_steps * x_levels) / whished_size)
+            if candidate_sampler == "fullfact":
+                init_coverage_factor = math.trunc(x_pool_size / whished_size)
+            else:
+                init_coverage_factor = math.trunc(obtained_size_on_x / whished_size)
             # Init variables before entering nominal PI-DOE automatic loop
             step = 1
             previous_size = 0
@@ -757,6 +1640,8 @@ def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs
             while fact_level(pi_steps * pi_levels) < whished_size:
                 pi_steps += 1
             pi_steps += -1
+            pi_acceptance_rate = 0.0
+            failed_pi_steps = pi_steps
             # Loop increasing nominal pi parameters'level till obtaining a contrained set size >= whished_size [CAN BE SLOW]
             if track:
                 print(
@@ -766,6 +1651,13 @@ def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs
                 )
             while obtained_size_on_pi < whished_size:
                 pi_steps += 1
+                # Jump to the levels expected to reach whished_size (limited to feasible set size)
+                if level_search == "rate" and pi_acceptance_rate > 0:
+                    while (
+                        fact_level(pi_steps * pi_levels) * pi_acceptance_rate < whished_size
+                        and fact_level((pi_steps + 1) * pi_levels) <= obtained_size_on_x
+                    ):
+                        pi_steps += 1
                 # If nominal pi set becomes greater than feasible pi set increase parameter level (i.e. generated contrained X-DOE)
                 if obtained_size_on_x < fact_level(pi_steps * pi_levels):
                     if track:
@@ -776,13 +1668,13 @@ def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs
                         )
                     break
                 else:
-                    doePIn, spacing = create_doe(pi_Bounds, pi_steps * pi_levels, log_space)
-                    save["doePIn"] = doePIn
-                    doePIn = doePIn[apply_constraints(doePIn, pi_constraints) == True]
-                    save["doePIn_c"] = doePIn
-                    doePIn, _ = surroundings(
-                        doePI, doePIn, spacing / spacing_division_criteria, log_space
-                    )
+                    (
+                        save["doePIn"],
+                        save["doePIn_c"],
+                        doePIn,
+                        spacing,
+                        box_index,
+                    ) = nominal_pi_doe(doePI, pi_steps * pi_levels)
                     save["doePIn_a"] = doePIn
                     obtained_size_on_pi = numpy.shape(doePIn)[0]
                     if previous_size > obtained_size_on_pi:
@@ -803,193 +1695,72 @@ def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs
                                     pi_number,
                                 )
                             )
+                    # Bisect back on levels skipped by the jump to keep the smallest sufficient nominal set
+                    if obtained_size_on_pi >= whished_size and level_search == "rate":
+                        lower_steps = failed_pi_steps
+                        while pi_steps - lower_steps > 1:
+                            middle_steps = (lower_steps + pi_steps) // 2
+                            middle_doe = nominal_pi_doe(doePI, middle_steps * pi_levels)
+                            if numpy.shape(middle_doe[2])[0] >= whished_size:
+                                pi_steps = middle_steps
+                                save["doePIn"], save["doePIn_c"], doePIn, spacing, box_index = middle_doe
+                                save["doePIn_a"] = doePIn
+                                obtained_size_on_pi = numpy.shape(doePIn)[0]
+                            else:
+                                lower_steps = middle_steps
+                            if track:
+                                print(
+                                    "Step{}: bisection on [{}] Pi-DOE factorial experiment leads to constrained [{}*{}] Pi-DOE matrix".format(
+                                        step,
+                                        level_name(middle_steps * pi_levels),
+                                        numpy.shape(middle_doe[2])[0],
+                                        pi_number,
+                                    )
+                                )
+                    failed_pi_steps = pi_steps
+                    pi_acceptance_rate = obtained_size_on_pi / fact_level(pi_steps * pi_levels)
                 previous_size = obtained_size_on_pi
                 step += 1
+            diagnostics.timings["PHASE2"] += time.perf_counter() - phase_start
+        phase_start = time.perf_counter()
         # From initial nominal Pi set and constrained X set extract nearest points
-        index = find_nearest(
-            doePI, doePIn, choice_nb, spacing / spacing_division_criteria, log_space
+        index, distance = find_nearest(
+            doePI,
+            doePIn,
+            choice_nb,
+            spacing / spacing_division_criteria,
+            log_space,
+            box_index,
+            return_distance=True,
         )
         index_vector = (
             numpy.reshape(index, numpy.shape(index)[0] * choice_nb) if choice_nb != 1 else index
         )
         save["doePI_n"] = doePI[index_vector, :]
-        doeXn, doePIn = elect_nearest(doeX, doePIn, index)
+        doeXn, doePIn = elect_nearest(doeX, doePIn, index, election, distance)
         # Delete points that do not match spacing criteria
         doePI, to_be_removed = surroundings(
-            doePIn, func_x_to_pi(doeXn), spacing / spacing_division_criteria, log_space
+            doePIn,
+            func_x_to_pi(doeXn),
+            spacing / spacing_division_criteria,
+            log_space,
+            spatial_index,
         )
         doeXn = doeXn[to_be_removed == False]
-        reduction_factor = 1 - len(doeXn) / fact_level(x_steps * x_levels)
-        if not (test_mode):
-            print("\n")
-            print(
-                "Set reduction factor (from feasible to optimal) is {}%\n".format(
-                    round(reduction_factor * 10000) / 100
-                )
-            )
+        reduction_factor = 1 - len(doeXn) / x_pool_size
         # Calculate pi-DOE from elected X-DOE set
         doeXc = doeXn
-        doePIc = func_x_to_pi(doeXc.tolist())
+        doePIc = func_x_to_pi(doeXc)
         save["doePI_e"] = doePIc
-        # Plot Pi vs Pi fullfact graphs
-        if not test_mode:
-            X = numpy.log10(save["doePI"]) if log_space else save["doePI"]
-            X1 = numpy.log10(save["doePI_n"]) if log_space else save["doePI_n"]
-            X2 = numpy.log10(save["doePI_e"]) if log_space else save["doePI_e"]
-            Y = numpy.log10(save["doePIn_c"]) if log_space else save["doePIn_c"]
-            Y1 = numpy.log10(save["doePIn_a"]) if log_space else save["doePIn_a"]
-            x_labels = list(pi_set.dictionary.keys())
-            graph_nb = 0
-            for i in range(numpy.shape(Y)[1] - 1):
-                for k in range(i + 1, numpy.shape(Y)[1]):
-                    graph_nb += 1
-            n = math.ceil(graph_nb ** 0.5)
-            fig, axes = plot.subplots(n, n, figsize=(6 * n, 6 * n))
-            graph_idx = 0
-            for i in range(numpy.shape(Y)[1] - 1):
-                for k in range(i + 1, numpy.shape(Y)[1]):
-                    if graph_nb == 1:
-                        axes_handle = axes
-                    else:
-                        nr = math.floor(graph_idx / n)
-                        nc = graph_idx - nr * n
-                        axes_handle = axes[nr, nc]
-                    axes_handle.plot(X[:, i], X[:, k], "g.", label="All (Feas.)")
-                    axes_handle.plot(
-                        X1[:, i], X1[:, k], "c.", label="{}-nearest (Feas.)".format(choice_nb)
-                    )
-                    axes_handle.plot(X2[:, i], X2[:, k], "b.", label="Elected (Feas.)")
-                    axes_handle.plot(Y[:, i], Y[:, k], "k.", label="All (Obj.)")
-                    axes_handle.plot(Y1[:, i], Y1[:, k], "r.", label="Active (Obj.)")
-                    expression = (
-                        ("$log(" + x_labels[i].replace("pi", "\pi_{") + "})$")
-                        if log_space
-                        else (x_labels[i].replace("pi", "$\pi_{") + "}$")
-                    )
-                    axes_handle.set_xlabel(expression)
-                    expression = (
-                        ("$log(" + x_labels[k].replace("pi", "\pi_{") + "})$")
-                        if log_space
-                        else (x_labels[k].replace("pi", "$\pi_{") + "}$")
-                    )
-                    axes_handle.set_ylabel(expression)
-                    axes_handle.legend()
-                    ymax = max(numpy.amax(X[:, k]), numpy.amax(Y[:, k]))
-                    ymin = min(numpy.amin(X[:, k]), numpy.amin(Y[:, k]))
-                    xmax = max(numpy.amax(X[:, i]), numpy.amax(Y[:, i]))
-                    xmin = min(numpy.amin(X[:, i]), numpy.amin(Y[:, i]))
-                    try:
-                        x_lines = (pi_steps - 1) * pi_levels[k] * spacing_division_criteria + 1
-                        axes_handle.set_xticks(numpy.linspace(xmin, xmax, x_lines))
-                    except:
-                        pass
-                    axes_handle.xaxis.set_ticklabels([])
-                    try:
-                        y_lines = (pi_steps - 1) * pi_levels[i] * spacing_division_criteria + 1
-                        axes_handle.set_yticks(numpy.linspace(ymin, ymax, y_lines))
-                    except:
-                        pass
-                    axes_handle.yaxis.set_ticklabels([])
-                    axes_handle.grid()
-                    axes_handle.set_ylim((ymin, ymax))
-                    axes_handle.set_xlim((xmin, xmax))
-                    graph_idx += 1
-            while graph_idx < n ** 2:
-                nr = math.floor(graph_idx / n)
-                nc = graph_idx - nr * n
-                axes[nr, nc].axis("off")
-                graph_idx += 1
-            try:
-                plot.savefig(temp_path + "create_const_doe_fig1.pdf", dpi=1200, format="pdf")
-            except:
-                pass
-            plot.show()
-            # Plot x elected vs x constrained full-fact graphs (only for variables)
-            X = numpy.log10(doeXc) if log_space else doeXc
-            Y = numpy.log10(doeX) if log_space else doeX
-            Y_range = numpy.amax(Y, axis=0) - numpy.amin(Y, axis=0)
-            Y_range = Y_range + 1 * (Y_range == 0)
-            X = (X - numpy.amin(Y, axis=0)) / Y_range
-            for i in range(numpy.shape(X)[1]):
-                if numpy.amax(X[:, i]) == 0 and numpy.amin(X[:, i]) == 0:
-                    X[:, i] = 0.5 * (X[:, i] == 0)
-                    continue
-            x_labels = []
-            greek_list = [
-                "alpha",
-                "beta",
-                "gamma",
-                "delta",
-                "epsilon",
-                "varepsilon",
-                "zeta",
-                "eta",
-                "theta",
-                "vartheta",
-                "gamma",
-                "kappa",
-                "lambda",
-                "mu",
-                "nu",
-                "xi",
-                "pi",
-                "varpi",
-                "rho",
-                "varrho",
-                "sigma",
-                "varsigma",
-                "tau",
-                "upsilon",
-                "phi",
-                "varphi",
-                "chi",
-                "psi",
-                "omega",
-            ]
-            for key in parameter_set.dictionary.keys():
-                parameter_name = parameter_set[key].name
-                if len(parameter_name.split("_")) == 2:
-                    parameter_name1 = parameter_name.split("_")[0]
-                    parameter_name2 = parameter_name.split("_")[1]
-                    if parameter_name1.lower() in greek_list:
-                        parameter_name = "\\" + parameter_name1.lower() + "_{"
-                    else:
-                        parameter_name = parameter_name1 + "_{"
-                    if parameter_name2.lower() in greek_list:
-                        parameter_name += "\\" + parameter_name2.lower() + "}"
-                    else:
-                        parameter_name += parameter_name2 + "}"
-                if log_space:
-                    x_labels.append(
-                        "$\\frac{log("
-                        + parameter_name
-                        + ")-min(log("
-                        + parameter_name
-                        + "))}{Delta log("
-                        + parameter_name
-                        + ")}$"
-                    )
-                else:
-                    x_labels.append(
-                        "$\\frac{"
-                        + parameter_name
-                        + "-min("
-                        + parameter_name
-                        + ")}{Delta {"
-                        + parameter_name
-                        + "}}$"
-                    )
-            X_data = pandas.DataFrame(X, columns=x_labels)
-            X_data["Name"] = "Feasible point"
-            plot.figure(figsize=(2 * (len(x_labels) - 1), 5))
-            pandas.plotting.parallel_coordinates(X_data, "Name")
-            plot.xticks(fontsize=16, rotation=90)
-            try:
-                plot.savefig(temp_path + "create_const_doe_fig2.pdf", dpi=1200, format="pdf")
-            except:
-                pass
-            plot.show()
-        return doeXc, doePIc, save["doePI"], save["doePI_n"], save["doePIn_c"], save["doePIn_a"]
+        diagnostics.timings["selection"] = time.perf_counter() - phase_start
+        diagnostics.reduction_factor = reduction_factor
+        diagnostics.doeX = doeX
+        diagnostics.doeXc = doeXc
+        diagnostics.doePIc = doePIc
+        diagnostics.pi_steps = pi_steps
+        if cache_path is not None:
+            _save_const_doe_cache(cache_path, diagnostics, cache_size)
+        return const_doe_outputs(diagnostics)
     elif not (isinstance(parameter_set, PositiveParameterSet)):
         raise TypeError("level_repartition type should be PositiveParameterSet.")
     elif not (isinstance(pi_set, PositiveParameterSet)):
@@ -1000,6 +1771,546 @@ def create_const_doe(parameter_set, pi_set, func_x_to_pi, whished_size, **kwargs
         raise TypeError("whished_size should be an integer.")
 
 
+# -------[Define function adding points to an existing constrained DOE]--------
+def augment_const_doe(existing_doeX, n_new, parameter_set, pi_set, func_x_to_pi, **kwargs):
+    """Function to add n_new feasible points to an existing constrained DOE (i.e. already simulated points), filling
+        first the nominal Pi-DOE points not covered by the existing DOE under the same spacing criteria as
+        :func:`~sizinglab.addon.pixdoe.create_const_doe`, then the areas the most distant from the existing points.
+
+     Parameters
+     ----------
+     existing_doeX: [j*n] numpy.array of float
+                    Represents the existing sets of physical parameters
+
+     n_new: int
+            Number of points to add
+
+     parameter_set: PositiveParameterSet
+                    Defines the n physical parameters for the studied problem
+
+     pi_set: PositiveParameterSet
+             Defines the k (k<n) dimensionless parameters of the problem (WARNING: no cross-validation with parameter_set,
+             uses func_x_to_pi for translation)
+
+     func_x_to_pi: function
+                   Translates X physical values into Pi dimensionless values (space transformation matrix)
+
+     **kwargs: additional argumens
+                  * **feasible_doeX** (*numpy.array* of *float*): feasible X-DOE used as candidates pool (for instance diagnostics.doeX returned by create_const_doe with render=False), default is a Sobol pool of pool_size points
+                  * **pool_size** (*int*): candidates pool size if feasible_doeX is not defined, default is 20 times the final DOE size
+                  * **parameters_constraints** (*function*): returns numpy.array of bool to validate each point in X-DOE, default is []
+                  * **pi_constraints** (*function*): returns numpy.array of bool to validate each point in Pi-DOE, default is []
+                  * **choice_nb** (*int*): number of nearest feasible points considered for each uncovered nominal point, default is 3
+                  * **spacing_division_criteria** (*int*): (>=2) defines the subdivision admitted error in Pi nominal space for feasible point, default is 5
+                  * **log_space** (*bool*): defines if spaces have to be considered in log space or when false, linear (default is log - True)
+
+     Returns
+     -------
+     doeX_new: [l*n] numpy.array of float
+               Represents the added feasible sets of physical parameters (l<=n_new, only if pool is too small)
+
+     doePI_new: [l*k] numpy.array of float
+                Represents the corresponding sets of dimensionless parameters
+
+     Example
+     -------
+     to define the parameter, pi set and transformation function, see :func:`~sizinglab.addon.pixdoe.create_const_doe`
+
+     then create a DOE keeping the feasible pool and add 10 points:
+         >>> In [13]: doeXc, doePIc, diagnostics = create_const_doe(reduced_parameter_set, reduced_pi_set, func_x_to_pi, 30, render=False)
+         >>> In [14]: doeX_new, doePI_new = augment_const_doe(doeXc, 10, reduced_parameter_set, reduced_pi_set, func_x_to_pi, feasible_doeX=diagnostics.doeX)
+
+    """
+    if not (
+        isinstance(existing_doeX, numpy.ndarray)
+        and isinstance(parameter_set, PositiveParameterSet)
+        and isinstance(pi_set, PositiveParameterSet)
+        and isfunction(func_x_to_pi)
+        and isinstance(n_new, int)
+    ):
+        if not (isinstance(existing_doeX, numpy.ndarray)):
+            raise TypeError("existing_doeX shoold be numpy array.")
+        elif not (isinstance(parameter_set, PositiveParameterSet)):
+            raise TypeError("parameter_set type should be PositiveParameterSet.")
+        elif not (isinstance(pi_set, PositiveParameterSet)):
+            raise TypeError("pi_set type should be PositiveParameterSet.")
+        elif not (isfunction(func_x_to_pi)):
+            raise TypeError("func_x_to_pi should be a function.")
+        else:
+            raise TypeError("n_new should be an integer.")
+    if n_new < 1:
+        raise ValueError("n_new should be >= 1.")
+    if numpy.ndim(existing_doeX) != 2 or numpy.shape(existing_doeX)[1] != len(
+        list(parameter_set.dictionary.keys())
+    ):
+        raise IndexError("existing_doeX columns mismatch parameters in parameter_set.")
+    # Set additional arguments values
+    feasible_doeX = None
+    pool_size = 20 * (numpy.shape(existing_doeX)[0] + n_new)
+    parameters_constraints = []
+    pi_constraints = []
+    choice_nb = 3
+    spacing_division_criteria = 5
+    log_space = True
+    for key, value in kwargs.items():
+        if not (
+            key
+            in [
+                "feasible_doeX",
+                "pool_size",
+                "parameters_constraints",
+                "pi_constraints",
+                "choice_nb",
+                "spacing_division_criteria",
+                "log_space",
+            ]
+        ):
+            raise KeyError("unknown argument " + key)
+        elif key == "feasible_doeX":
+            if isinstance(value, numpy.ndarray):
+                feasible_doeX = value
+            else:
+                raise TypeError("feasible_doeX should be a numpy array.")
+        elif key == "pool_size":
+            if isinstance(value, int) and value >= 1:
+                pool_size = value
+            else:
+                raise ValueError("pool_size should be an integer >= 1.")
+        elif key == "parameters_constraints":
+            if isfunction(value):
+                parameters_constraints = value
+            else:
+                raise TypeError("parameters_constraints should be a function.")
+        elif key == "pi_constraints":
+            if isfunction(value):
+                pi_constraints = value
+            else:
+                raise TypeError("pi_constraints should be a function.")
+        elif key == "choice_nb":
+            if isinstance(value, int) and value >= 1:
+                choice_nb = value
+            else:
+                raise ValueError("choice_nb should be an integer >= 1.")
+        elif key == "spacing_division_criteria":
+            if isinstance(value, int) and value >= 2:
+                spacing_division_criteria = value
+            else:
+                raise ValueError("spacing_division_criteria should be an integer >= 2.")
+        elif key == "log_space":
+            if isinstance(value, bool):
+                log_space = value
+            else:
+                raise ValueError("log_space should be a boolean.")
+    # Extract bounds on parameters and pi sets
+    x_Bounds = numpy.array(
+        [parameter_set[key]._SI_bounds for key in parameter_set.dictionary.keys()], float
+    )
+    pi_Bounds = numpy.array([pi_set[key]._SI_bounds for key in pi_set.dictionary.keys()], float)
+    pi_levels = 1 * (pi_Bounds[:, 0] != pi_Bounds[:, 1])
+    # Build candidates pool (X and Pi aligned) without already existing points
+    if feasible_doeX is None:
+        feasible_doeX = create_candidates(x_Bounds, pool_size, "sobol", log_space)
+        feasible_doeX = feasible_doeX[
+            apply_constraints(feasible_doeX, parameters_constraints) == True
+        ]
+    existing_points = set(map(tuple, existing_doeX.tolist()))
+    feasible_doeX = feasible_doeX[
+        numpy.array([tuple(x) not in existing_points for x in feasible_doeX.tolist()], bool)
+    ]
+    if len(feasible_doeX) == 0:
+        return numpy.zeros((0, numpy.shape(x_Bounds)[0])), numpy.zeros((0, len(pi_Bounds)))
+    feasible_doePI = func_x_to_pi(feasible_doeX)
+    to_be_kept = apply_constraints(feasible_doePI, pi_constraints) == True
+    feasible_doeX = feasible_doeX[to_be_kept]
+    feasible_doePI = feasible_doePI[to_be_kept]
+    if len(feasible_doeX) == 0:
+        return numpy.zeros((0, numpy.shape(x_Bounds)[0])), numpy.zeros((0, len(pi_Bounds)))
+    existing_doePI = (
+        func_x_to_pi(existing_doeX)
+        if len(existing_doeX) != 0
+        else numpy.zeros((0, len(pi_Bounds)))
+    )
+    # Normalized Pi space used for gaps distances
+    Z_bounds = numpy.log10(pi_Bounds) if log_space else pi_Bounds
+    Z_range = Z_bounds[:, 1] - Z_bounds[:, 0]
+    Z_range = Z_range + 1 * (Z_range == 0)
+
+    def normalize(doePI):
+        return ((numpy.log10(doePI) if log_space else doePI) - Z_bounds[:, 0]) / Z_range
+
+    def min_distance(Z, Z_set):
+        distance = numpy.inf * numpy.ones(len(Z))
+        for z in Z_set:
+            distance = numpy.minimum(distance, numpy.sum((Z - z) ** 2, axis=1) ** 0.5)
+        return distance
+
+    # Nominal Pi-DOE sized for the final DOE, keep points not covered by existing DOE but reachable by pool
+    wished_size = numpy.shape(existing_doeX)[0] + n_new
+    pi_steps = 2
+    while functools.reduce(lambda x, y: x * y, pi_steps * pi_levels + 1 * (pi_levels == 0)) < (
+        wished_size
+    ):
+        pi_steps += 1
+    doePIn, spacing = create_doe(pi_Bounds, pi_steps * pi_levels, log_space)
+    doePIn = doePIn[apply_constraints(doePIn, pi_constraints) == True]
+    if len(existing_doePI) != 0:
+        _, uncovered = surroundings(
+            existing_doePI, doePIn, spacing / spacing_division_criteria, log_space
+        )
+        doePIn = doePIn[uncovered]
+    box_index = BoxIndex(feasible_doePI, spacing / spacing_division_criteria, log_space)
+    doePIn, _ = surroundings(
+        feasible_doePI, doePIn, spacing / spacing_division_criteria, log_space, box_index
+    )
+    # Fill first the gaps the most distant from existing points
+    Z_feasible = normalize(feasible_doePI)
+    Z_existing = normalize(existing_doePI) if len(existing_doePI) != 0 else Z_bounds[:0]
+    feasible_distance = min_distance(Z_feasible, Z_existing)
+    selected = []
+    if len(doePIn) != 0:
+        gap_distance = min_distance(normalize(doePIn), Z_existing)
+        doePIn = doePIn[numpy.argsort(-1 * gap_distance, kind="stable")]
+        index = find_nearest(
+            feasible_doePI,
+            doePIn,
+            choice_nb,
+            spacing / spacing_division_criteria,
+            log_space,
+            box_index,
+        )
+        for nr in range(numpy.shape(index)[0]):
+            if len(selected) == n_new:
+                break
+            available_index = index[nr][index[nr] != -1]
+            available_index = available_index[
+                numpy.isin(available_index, selected, invert=True)
+            ]
+            if len(available_index) == 0:
+                continue
+            # Elect the candidate maximizing minimum distance with existing and selected points
+            new_index = available_index[numpy.argmax(feasible_distance[available_index])]
+            selected.append(new_index)
+            feasible_distance = numpy.minimum(
+                feasible_distance,
+                numpy.sum((Z_feasible - Z_feasible[new_index]) ** 2, axis=1) ** 0.5,
+            )
+    # Complete with the pool points the most distant from existing and selected points
+    while len(selected) < min(n_new, len(feasible_doeX)):
+        feasible_distance[selected] = -1
+        new_index = int(numpy.argmax(feasible_distance))
+        selected.append(new_index)
+        feasible_distance = numpy.minimum(
+            feasible_distance, numpy.sum((Z_feasible - Z_feasible[new_index]) ** 2, axis=1) ** 0.5
+        )
+    selected = numpy.array(selected, dtype=int)
+    return feasible_doeX[selected], feasible_doePI[selected]
+
+
+# -------[Define create_const_doe results cache functions]----------------------
+def _const_doe_signature(
+    parameter_set, pi_set, func_x_to_pi, parameters_constraints, pi_constraints, settings
+):
+    """Function (*internal*) returning the create_const_doe problem signature (sha256 hex digest) or None if
+        func_x_to_pi has no declared exponents (see :func:`~sizinglab.addon.variablepowerlaw.declare_func_x_to_pi`)
+        or a constraint function has no declared expressions (see :func:`~sizinglab.addon.variablepowerlaw.declare_constraints`).
+
+    """
+    if not (hasattr(func_x_to_pi, "exponents")):
+        return None
+    constraints_expressions = []
+    for constraints in [parameters_constraints, pi_constraints]:
+        if isfunction(constraints):
+            if not (hasattr(constraints, "expressions")):
+                return None
+            constraints_expressions.append(list(constraints.expressions))
+        else:
+            constraints_expressions.append([])
+    problem = {
+        "version": 3,
+        "parameters": [
+            [key, [float(bound) for bound in parameter_set[key]._SI_bounds]]
+            for key in parameter_set.dictionary.keys()
+        ],
+        "pi": [
+            [key, pi_set[key].description, [float(bound) for bound in pi_set[key]._SI_bounds]]
+            for key in pi_set.dictionary.keys()
+        ],
+        "exponents": numpy.asarray(func_x_to_pi.exponents, dtype=float).tolist(),
+        "constraints": constraints_expressions,
+        "settings": settings,
+    }
+    return hashlib.sha256(json.dumps(problem, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _load_const_doe_cache(cache_path, diagnostics):
+    """Function (*internal*) filling diagnostics with cached create_const_doe results (and marking file as used).
+
+    """
+    with numpy.load(cache_path, allow_pickle=False) as data:
+        for key in ["doePI", "doePI_n", "doePIn", "doePIn_c", "doePIn_a", "doePI_e"]:
+            diagnostics.save[key] = data[key]
+        diagnostics.doeX = data["doeX"]
+        diagnostics.doeXc = data["doeXc"]
+        diagnostics.doePIc = data["doePIc"]
+        diagnostics.pi_steps = int(data["pi_steps"])
+        diagnostics.reduction_factor = float(data["reduction_factor"])
+        diagnostics.timings = dict(zip(["PHASE1", "PHASE2", "selection"], data["timings"].tolist()))
+        for key in ["x_levels_tried", "x_sizes", "pi_levels_tried", "pi_sizes"]:
+            setattr(diagnostics, key, data[key].tolist())
+        diagnostics.cache_hit = True
+    os.utime(cache_path)
+
+
+def _save_const_doe_cache(cache_path, diagnostics, cache_size):
+    """Function (*internal*) storing create_const_doe results and deleting least recently used files of the
+        cache directory until its size is lower than cache_size (stored results are never deleted, but not
+        stored if their size exceeds cache_size).
+
+    """
+    cache_dir = os.path.dirname(cache_path)
+    temp_file = None
+    try:
+        if not (os.path.isdir(cache_dir)):
+            os.makedirs(cache_dir)
+        # Unique temporary file: concurrent runs on the same problem do not write the same file
+        descriptor, temp_file = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as file:
+            numpy.savez_compressed(
+                file,
+                doeX=diagnostics.doeX,
+                doeXc=diagnostics.doeXc,
+                doePIc=diagnostics.doePIc,
+                pi_steps=diagnostics.pi_steps,
+                reduction_factor=diagnostics.reduction_factor,
+                timings=numpy.array(
+                    [diagnostics.timings[key] for key in ["PHASE1", "PHASE2", "selection"]]
+                ),
+                x_levels_tried=numpy.array(diagnostics.x_levels_tried, dtype=int),
+                x_sizes=numpy.array(diagnostics.x_sizes, dtype=int),
+                pi_levels_tried=numpy.array(diagnostics.pi_levels_tried, dtype=int),
+                pi_sizes=numpy.array(diagnostics.pi_sizes, dtype=int),
+                **{
+                    key: numpy.asarray(diagnostics.save[key])
+                    for key in ["doePI", "doePI_n", "doePIn", "doePIn_c", "doePIn_a", "doePI_e"]
+                }
+            )
+        entry_size = os.path.getsize(temp_file)
+        if entry_size > cache_size:
+            os.remove(temp_file)
+            warnings.warn(
+                "results size ({} bytes) exceeds cache_size ({} bytes): not cached.".format(
+                    entry_size, cache_size
+                )
+            )
+            return
+        os.replace(temp_file, cache_path)
+        temp_file = None
+        # Evict least recently used results (except the stored one)
+        files = [
+            os.path.join(cache_dir, file)
+            for file in os.listdir(cache_dir)
+            if file.endswith(".npz") and os.path.join(cache_dir, file) != cache_path
+        ]
+        files.sort(key=os.path.getmtime)
+        total_size = entry_size + sum(os.path.getsize(file) for file in files)
+        while total_size > cache_size and len(files) != 0:
+            total_size -= os.path.getsize(files[0])
+            os.remove(files[0])
+            files = files[1:]
+    except OSError:
+        warnings.warn("results could not be saved in cache directory {}.".format(cache_dir))
+        if temp_file is not None and os.path.isfile(temp_file):
+            os.remove(temp_file)
+
+
+# -------[Define function plotting create_const_doe diagnostics]----------------
+def plot_const_doe(diagnostics):
+    """Function to plot Pi vs Pi and normalized X graphs of a DOE generated with
+        :func:`~sizinglab.addon.pixdoe.create_const_doe` (figures are also saved in pdf format in _temp directory).
+
+     Parameters
+     ----------
+     diagnostics: ConstDoeDiagnostics
+                  Diagnostics returned by create_const_doe with render=False
+
+     Example
+     -------
+     to define the parameter, pi set and transformation function, see :func:`~sizinglab.addon.pixdoe.create_const_doe`
+
+     then create a complete DOE without rendering and plot it afterward:
+         >>> In [13]: doeXc, doePIc, diagnostics = create_const_doe(reduced_parameter_set, reduced_pi_set, func_x_to_pi, 30, render=False)
+         >>> In [14]: plot_const_doe(diagnostics)
+
+    """
+    if not (isinstance(diagnostics, ConstDoeDiagnostics)):
+        raise TypeError("diagnostics should be a ConstDoeDiagnostics.")
+    import matplotlib.pyplot as plot
+
+    save = diagnostics.save
+    log_space = diagnostics.log_space
+    choice_nb = diagnostics.choice_nb
+    pi_steps = diagnostics.pi_steps
+    pi_levels = diagnostics.pi_levels
+    spacing_division_criteria = diagnostics.spacing_division_criteria
+    doeX = diagnostics.doeX
+    doeXc = diagnostics.doeXc
+    X = numpy.log10(save["doePI"]) if log_space else save["doePI"]
+    X1 = numpy.log10(save["doePI_n"]) if log_space else save["doePI_n"]
+    X2 = numpy.log10(save["doePI_e"]) if log_space else save["doePI_e"]
+    Y = numpy.log10(save["doePIn_c"]) if log_space else save["doePIn_c"]
+    Y1 = numpy.log10(save["doePIn_a"]) if log_space else save["doePIn_a"]
+    x_labels = diagnostics.pi_names
+    graph_nb = 0
+    for i in range(numpy.shape(Y)[1] - 1):
+        for k in range(i + 1, numpy.shape(Y)[1]):
+            graph_nb += 1
+    n = math.ceil(graph_nb ** 0.5)
+    fig, axes = plot.subplots(n, n, figsize=(6 * n, 6 * n))
+    graph_idx = 0
+    for i in range(numpy.shape(Y)[1] - 1):
+        for k in range(i + 1, numpy.shape(Y)[1]):
+            if graph_nb == 1:
+                axes_handle = axes
+            else:
+                nr = math.floor(graph_idx / n)
+                nc = graph_idx - nr * n
+                axes_handle = axes[nr, nc]
+            axes_handle.plot(X[:, i], X[:, k], "g.", label="All (Feas.)")
+            axes_handle.plot(
+                X1[:, i], X1[:, k], "c.", label="{}-nearest (Feas.)".format(choice_nb)
+            )
+            axes_handle.plot(X2[:, i], X2[:, k], "b.", label="Elected (Feas.)")
+            axes_handle.plot(Y[:, i], Y[:, k], "k.", label="All (Obj.)")
+            axes_handle.plot(Y1[:, i], Y1[:, k], "r.", label="Active (Obj.)")
+            expression = (
+                ("$log(" + x_labels[i].replace("pi", "\pi_{") + "})$")
+                if log_space
+                else (x_labels[i].replace("pi", "$\pi_{") + "}$")
+            )
+            axes_handle.set_xlabel(expression)
+            expression = (
+                ("$log(" + x_labels[k].replace("pi", "\pi_{") + "})$")
+                if log_space
+                else (x_labels[k].replace("pi", "$\pi_{") + "}$")
+            )
+            axes_handle.set_ylabel(expression)
+            axes_handle.legend()
+            ymax = max(numpy.amax(X[:, k]), numpy.amax(Y[:, k]))
+            ymin = min(numpy.amin(X[:, k]), numpy.amin(Y[:, k]))
+            xmax = max(numpy.amax(X[:, i]), numpy.amax(Y[:, i]))
+            xmin = min(numpy.amin(X[:, i]), numpy.amin(Y[:, i]))
+            try:
+                x_lines = (pi_steps - 1) * pi_levels[k] * spacing_division_criteria + 1
+                axes_handle.set_xticks(numpy.linspace(xmin, xmax, x_lines))
+            except:
+                pass
+            axes_handle.xaxis.set_ticklabels([])
+            try:
+                y_lines = (pi_steps - 1) * pi_levels[i] * spacing_division_criteria + 1
+                axes_handle.set_yticks(numpy.linspace(ymin, ymax, y_lines))
+            except:
+                pass
+            axes_handle.yaxis.set_ticklabels([])
+            axes_handle.grid()
+            axes_handle.set_ylim((ymin, ymax))
+            axes_handle.set_xlim((xmin, xmax))
+            graph_idx += 1
+    while graph_idx < n ** 2:
+        nr = math.floor(graph_idx / n)
+        nc = graph_idx - nr * n
+        axes[nr, nc].axis("off")
+        graph_idx += 1
+    try:
+        plot.savefig(temp_path + "create_const_doe_fig1.pdf", dpi=1200, format="pdf")
+    except:
+        pass
+    plot.show()
+    # Plot x elected vs x constrained full-fact graphs (only for variables)
+    X = numpy.log10(doeXc) if log_space else doeXc
+    Y = numpy.log10(doeX) if log_space else doeX
+    Y_range = numpy.amax(Y, axis=0) - numpy.amin(Y, axis=0)
+    Y_range = Y_range + 1 * (Y_range == 0)
+    X = (X - numpy.amin(Y, axis=0)) / Y_range
+    for i in range(numpy.shape(X)[1]):
+        if numpy.amax(X[:, i]) == 0 and numpy.amin(X[:, i]) == 0:
+            X[:, i] = 0.5 * (X[:, i] == 0)
+            continue
+    x_labels = []
+    greek_list = [
+        "alpha",
+        "beta",
+        "gamma",
+        "delta",
+        "epsilon",
+        "varepsilon",
+        "zeta",
+        "eta",
+        "theta",
+        "vartheta",
+        "gamma",
+        "kappa",
+        "lambda",
+        "mu",
+        "nu",
+        "xi",
+        "pi",
+        "varpi",
+        "rho",
+        "varrho",
+        "sigma",
+        "varsigma",
+        "tau",
+        "upsilon",
+        "phi",
+        "varphi",
+        "chi",
+        "psi",
+        "omega",
+    ]
+    for parameter_name in diagnostics.parameter_names:
+        if len(parameter_name.split("_")) == 2:
+            parameter_name1 = parameter_name.split("_")[0]
+            parameter_name2 = parameter_name.split("_")[1]
+            if parameter_name1.lower() in greek_list:
+                parameter_name = "\\" + parameter_name1.lower() + "_{"
+            else:
+                parameter_name = parameter_name1 + "_{"
+            if parameter_name2.lower() in greek_list:
+                parameter_name += "\\" + parameter_name2.lower() + "}"
+            else:
+                parameter_name += parameter_name2 + "}"
+        if log_space:
+            x_labels.append(
+                "$\\frac{log("
+                + parameter_name
+                + ")-min(log("
+                + parameter_name
+                + "))}{Delta log("
+                + parameter_name
+                + ")}$"
+            )
+        else:
+            x_labels.append(
+                "$\\frac{"
+                + parameter_name
+                + "-min("
+                + parameter_name
+                + ")}{Delta {"
+                + parameter_name
+                + "}}$"
+            )
+    X_data = pandas.DataFrame(X, columns=x_labels)
+    X_data["Name"] = "Feasible point"
+    plot.figure(figsize=(2 * (len(x_labels) - 1), 5))
+    pandas.plotting.parallel_coordinates(X_data, "Name")
+    plot.xticks(fontsize=16, rotation=90)
+    try:
+        plot.savefig(temp_path + "create_const_doe_fig2.pdf", dpi=1200, format="pdf")
+    except:
+        pass
+    plot.show()
+
+
 # -------[Wrap constraint function to avoid definition error: unconstrained]----
 def apply_constraints(X, Constraints=[]):
     """Function to test declared constraint and return true vector if an error occurs.
@@ -10,36 +10,32 @@ import pyvplm
 
 path = os.path.abspath(pyvplm.__file__)
 temp_path = path.replace("__init__.py", "") + "_temp\\"
-import pint
-import ast
+import io
+import tokenize
 import numpy
 import logging
 import pandas
 import copy
+import math
+import concurrent.futures
 import scipy
 from scipy.optimize import minimize
 import warnings
 from sklearn.preprocessing import PolynomialFeatures
 from fractions import Fraction
-from itertools import permutations, combinations
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication,
-    function_exponentiation,
-)
-import matplotlib.pyplot as plot
-from matplotlib import colors
-from matplotlib.ticker import PercentFormatter
-import matplotlib.ticker as ticker
-from IPython.display import Latex, display, clear_output
-from sympy.interactive import printing
-from ipywidgets import widgets, VBox
+import itertools
+from itertools import combinations
 from pyDOE2 import lhs
-from pyvplm.core.definition import PositiveParameter, PositiveParameterSet, ConstraintSet
+from pyvplm.core.definition import (
+    PositiveParameter,
+    PositiveParameterSet,
+    ConstraintSet,
+    get_unit_registry,
+    unit_conversion,
+    to_SI,
+)
 import warnings
 
-printing.init_printing(use_latex="png")
 pandas.options.mode.chained_assignment = None
 # from threading import Thread, Lock
 # lock = Lock()
@@ -74,46 +70,13 @@ def write_dimensional_matrix(parameter_set):
             >>> Out[8]: [[1, 0, 0], [1, 1, -2], [1, 0, 0], [-1, 1, -2], [1, 0, 0]]
     
     """
-    dimensional_matrix = []
-    dimensional_set = []
-    logging.captureWarnings(True)
     if isinstance(parameter_set, PositiveParameterSet):
-        isnotempty = (parameter_set.dictionary and True) or False
-        if isnotempty:
-            # First extract all dimensions from saved parameters
-            for key1 in parameter_set.dictionary.keys():
-                parameter = parameter_set.dictionary[key1]
-                dimensions = str(pint.util.ParserHelper.from_string(parameter._dimensionality))
-                # ParserHelper return expression of the form: "1.0 {'[length]': -1.0, '[mass]': 1.0, '[time]': -2.0}"
-                # Eval part between {} to create dictionary
-                dimensions = ast.literal_eval(dimensions[dimensions.find("{") : len(dimensions)])
-                for key2 in dimensions.keys():  # Go across keys to find new units and register them
-                    if not (key2 in dimensional_set):
-                        dimensional_set.append(key2)
-            # Then construct parameters exponent in matrix
-            for key1 in parameter_set.dictionary.keys():
-                parameter = parameter_set.dictionary[key1]
-                dimensions = str(pint.util.ParserHelper.from_string(parameter._dimensionality))
-                dimensions = ast.literal_eval(dimensions[dimensions.find("{") : len(dimensions)])
-                dimensional_vector = []
-                for i in range(len(dimensional_set)):
-                    if dimensional_set[i] in dimensions.keys():
-                        if isinstance(dimensions[dimensional_set[i]], float):
-                            dimensional_vector.append(
-                                Fraction.from_float(dimensions[dimensional_set[i]])
-                            )
-                        else:
-                            dimensional_vector.append(Fraction(dimensions[dimensional_set[i]]))
-                    else:
-                        dimensional_vector.append(Fraction(0))
-                dimensional_matrix.append(dimensional_vector)
+        # Use the parameter set cached matrix (only re-built if dimensions changed)
+        dimensional_matrix, dimensional_set = parameter_set.dimensional_matrix()
     else:
         raise TypeError("parameter_set should be PositiveParameterSet")
-    logging.captureWarnings(False)
     return pandas.DataFrame(
-        numpy.array(dimensional_matrix, int),
-        columns=dimensional_set,
-        index=parameter_set.dictionary.keys(),
+        dimensional_matrix.copy(), columns=dimensional_set, index=parameter_set.dictionary.keys(),
     )
 
 
@@ -215,6 +178,112 @@ def compute_echelon_form(in_matrix):
     return out_matrix, pivot, pivot_points
 
 
+# -------[Compute rank, pivots and null space of a given integer matrix]---------
+def compute_null_space(in_matrix):
+    """Function that computes the rank, pivot points and left null space of an integer matrix using fraction-free
+        (Bareiss) elimination: all computations are performed on integers (numpy.int64 switching to python int
+        if an overflow may occur). Pivot points are searched as in :func:`~pyvplm.addon.variablepowerlaw.compute_echelon_form`.
+
+        Parameters
+        ----------
+        in_matrix: [m*n] numpy.array of int (or float with integer values)
+
+        Returns
+        -------
+        rank: int
+              Rank of in_matrix
+
+        pivot_points: [1*rank] list of int
+                      Index of pivot points (rows of in_matrix)
+
+        null_space: [(m-rank)*m] numpy.array of int
+                    Integer vectors v such that v.in_matrix = 0, row i being defined by the row non_pivot[i] of in_matrix
+                    combined with the pivot rows (its exponent on non_pivot[i] being >0, no common divider)
+
+        non_pivot: [1*(m-rank)] list of int
+                   Index of the row of in_matrix defining each null_space vector
+
+        Example
+        -------
+        define dimensional matrix:
+            >>> In [1]: in_matrix = numpy.array([[0, 1, 0], [1, 1, -2], [0, 1, 0], [1, -1, -2], [0, 1, 0]], int)
+
+        perform function:
+            >>> In [2]: rank, pivot_points, null_space, non_pivot = compute_null_space(in_matrix)
+            >>> In [3]: print(rank, pivot_points, non_pivot)
+                2 [1, 0] [2, 3, 4]
+            >>> In [4]: print(null_space)
+                [[-1  0  1  0  0]
+                 [ 2 -1  0  1  0]
+                 [-1  0  0  0  1]]
+
+    """
+    if isinstance(in_matrix, numpy.ndarray):
+        # Check values
+        if not (
+            numpy.issubdtype(in_matrix.dtype, numpy.integer)
+            or numpy.issubdtype(in_matrix.dtype, numpy.float64)
+        ):
+            raise TypeError("in_matrix type in index should be integer or float.")
+        if numpy.any(in_matrix != numpy.round(in_matrix)):
+            raise ValueError("in_matrix should contain integer values.")
+        nr, nc = numpy.shape(in_matrix)
+        # Augment matrix with identity to track rows combinations
+        matrix = numpy.c_[numpy.round(in_matrix).astype(numpy.int64), numpy.eye(nr, dtype=numpy.int64)]
+        row_index = list(range(nr))
+        pivot_points = []
+        previous_pivot = 1
+        lead = 0
+        for r in range(nr):
+            if lead >= nc:
+                break
+            # Search non-zero lead in rows i>=r otherwise switch to new lead (dimension)
+            i = r
+            while matrix[i, lead] == 0:
+                i += 1
+                if i != nr:
+                    continue
+                i = r
+                lead += 1
+                if nc == lead:
+                    break
+            if nc == lead:
+                break
+            # Swap the rows when matrix(r,lead)=0 and matrix(i,lead)!=0 with i>r
+            if i != r:
+                matrix[[i, r]] = matrix[[r, i]]
+                row_index[i], row_index[r] = row_index[r], row_index[i]
+            pivot_points.append(row_index[r])
+            # Fraction-free elimination of lead on the rows below (exact division by previous pivot)
+            pivot = matrix[r, lead]
+            if matrix.dtype != object:
+                bound = int(numpy.max(numpy.absolute(matrix[r:])))
+                if 2 * bound * bound >= 2 ** 62:
+                    matrix = matrix.astype(object)
+            below = matrix[r + 1:]
+            matrix[r + 1:] = (pivot * below - below[:, lead: lead + 1] * matrix[r]) // previous_pivot
+            previous_pivot = pivot
+            lead += 1
+        # Rows after pivots are null on in_matrix columns: their combination is a null space vector
+        rank = len(pivot_points)
+        null_space = []
+        for r in range(rank, nr):
+            vector = [int(value) for value in matrix[r, nc:]]
+            divider = 0
+            for value in vector:
+                divider = math.gcd(divider, value)
+            sign = 1 if vector[row_index[r]] > 0 else -1
+            null_space.append([sign * value // divider for value in vector])
+        null_space = numpy.array(null_space, dtype=object).reshape((nr - rank, nr))
+        try:
+            null_space = null_space.astype(numpy.int64)
+        except OverflowError:
+            pass
+    else:
+        raise TypeError("in_matrix should be numpy array")
+    return rank, pivot_points, null_space, row_index[rank:nr]
+
+
 # -------[Extract PI set from a given ordered parameter set]--------------------
 def buckingham_theorem(parameter_set, track=False):
     """Function that returns pi_set dimensionless parameters from a set of physical parameters.
@@ -261,19 +330,19 @@ def buckingham_theorem(parameter_set, track=False):
     pi_list = []
     if isinstance(parameter_set, PositiveParameterSet) and isinstance(track, bool):
         # Calculate the dimension matrix
-        dimensional_matrix = write_dimensional_matrix(parameter_set)
-        problem_rank = numpy.linalg.matrix_rank(dimensional_matrix.values)
-        # Calculate the echelon matrix
-        dimensional_matrix, pivot_matrix, pivot_points = compute_echelon_form(
-            dimensional_matrix.values
-        )
+        dimensional_matrix = parameter_set.dimensional_matrix()[0]
+        # Calculate the rank, pivot points and null space (fraction-free elimination)
+        problem_rank, pivot_points, null_space, non_pivot = compute_null_space(dimensional_matrix)
+        # Express null space vectors with unit exponent on their non-pivot parameter
+        pivot_matrix = [
+            [Fraction(int(value), int(null_space[r][non_pivot[r]])) for value in null_space[r]]
+            for r in range(len(non_pivot))
+        ]
         # Check that dimensional matrix rank is lower than dimensions number
         if len(dimensional_matrix) > problem_rank:
             # For each PI, make all parameters exponent integer and minimize the number
             # of negative exponents (since PI**i is dimensionless).
-            for r in range(len(dimensional_matrix)):
-                if any(el != 0 for el in dimensional_matrix[r]):
-                    continue
+            for r in range(len(pivot_matrix)):
                 max_den = max(f.denominator for f in pivot_matrix[r])
                 if sum(f < 0 for f in pivot_matrix[r]) > sum(f > 0 for f in pivot_matrix[r]):
                     for i in range(len(pivot_matrix[r])):
@@ -341,10 +410,20 @@ def buckingham_theorem(parameter_set, track=False):
     return pi_set, pi_list
 
 
+# -------[Extract PI set for a given repetitive set combination]----------------
+def _combination_buckingham(parameter_set, order):
+    """Function that orders parameter_set (in place) following order tuple and applies
+        :func:`~pyvplm.addon.variablepowerlaw.buckingham_theorem` (module level for process pools).
+    """
+    parameter_set.first(order)
+    return buckingham_theorem(parameter_set, False)
+
+
 # -------[Extract all possible PI sets from permuted parameter sets]------------
-def automatic_buckingham(parameter_set, track=False):
+def automatic_buckingham(parameter_set, track=False, workers=None):
     """Function that returns all possible pi_set (with lower exponent) from a set of physical parameters.
-        Based on buckingham_theorem function call.
+        Based on buckingham_theorem function call for each repetitive set combination with a full-rank dimensional
+        sub-matrix (other combinations lead to the pi set of the combination formed by their pivot points).
         
         Parameters
         ----------
@@ -353,6 +432,9 @@ def automatic_buckingham(parameter_set, track=False):
         
         track: bool
                Activates information display (default is False)
+
+        workers: int
+                 If defined (>1), combinations are computed by a pool of processes (default is None)
         
         Returns
         -------
@@ -379,6 +461,8 @@ def automatic_buckingham(parameter_set, track=False):
     
     """
     if isinstance(parameter_set, PositiveParameterSet) and isinstance(track, bool):
+        if workers is not None and (not (isinstance(workers, int)) or workers < 1):
+            raise ValueError("workers should be an integer >= 1.")
         # Extract parameters_list
         parameters_list = []
         for key in parameter_set.dictionary.keys():
@@ -386,37 +470,53 @@ def automatic_buckingham(parameter_set, track=False):
         # Calculate first pi_list to determine the number of repetitive variables
         _, pi_list = buckingham_theorem(parameter_set, False)
         nb_repetitive = len(parameters_list) - len(pi_list)
-        # Generate combination_list
+        # Generate combination_list, skipping (except first one) combinations with singular dimensional sub-matrix
         combination_list = list(combinations(parameters_list, nb_repetitive))
-        # Save first combination
-        new_parameter_set = copy.deepcopy(parameter_set)
-        new_parameter_set.first(combination_list[0])
-        pi_set, pi_list = buckingham_theorem(new_parameter_set, False)
-        saved_set = (pi_set, pi_list)
+        dimensional_matrix = parameter_set.dimensional_matrix()[0]
+        parameter_index = dict(zip(parameters_list, range(len(parameters_list))))
+        combination_list = combination_list[0:1] + [
+            combination
+            for combination in combination_list[1:]
+            if compute_null_space(
+                dimensional_matrix[[parameter_index[name] for name in combination], :]
+            )[0] == nb_repetitive
+        ]
+        # For each combination order parameter_set (combination first, then others in parameter_set order) and
+        # apply buckingham (by a pool of processes if defined)
+        orders = [
+            combination + tuple(name for name in parameters_list if not (name in combination))
+            for combination in combination_list
+        ]
+        pool = None
+        if workers is not None and workers > 1:
+            pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+            results = pool.map(
+                _combination_buckingham,
+                itertools.repeat(parameter_set),
+                orders,
+                chunksize=max(1, len(orders) // (4 * workers)),
+            )
+        else:
+            new_parameter_set = copy.deepcopy(parameter_set)
+            results = (_combination_buckingham(new_parameter_set, order) for order in orders)
+        # Save obtained PI set if different from saved (sorted expressions being the same for permuted sets)
         combinatory_pi_set = {}
-        combinatory_pi_set[1] = saved_set
-        # For each combination order parameter_set, apply buckingham and save obtained PI set if different from saved
-        for idx in range(len(combination_list)):
-            combination = combination_list[idx]
-            new_parameter_set.first(combination)
-            new_pi_set, new_pi_list = buckingham_theorem(new_parameter_set, False)
-            new_pi_list = numpy.array(new_pi_list)
-            already_saved = False
-            for key in combinatory_pi_set.keys():
-                saved_pi_list = combinatory_pi_set[key][1]
-                saved_pi_list = numpy.array(list(permutations(saved_pi_list)))
-                if numpy.ndarray.sum(numpy.all(saved_pi_list == new_pi_list, axis=1)) >= 1:
-                    already_saved = True
-                    break
-            if not (already_saved):
-                saved_set = (new_pi_set, new_pi_list)
-                combinatory_pi_set[max(combinatory_pi_set.keys()) + 1] = saved_set
-            if track:
-                print(
-                    "[AUTO. BUCKINGHAM] Testing repetitive set {}/{}: total alternative pi set size is {}".format(
-                        idx + 1, len(combination_list), len(combinatory_pi_set.keys())
+        saved_pi_lists = set()
+        try:
+            for idx, (new_pi_set, new_pi_list) in enumerate(results):
+                if not (tuple(sorted(new_pi_list)) in saved_pi_lists):
+                    saved_pi_lists.add(tuple(sorted(new_pi_list)))
+                    saved_set = (new_pi_set, new_pi_list if idx == 0 else numpy.array(new_pi_list))
+                    combinatory_pi_set[len(combinatory_pi_set.keys()) + 1] = saved_set
+                if track:
+                    print(
+                        "[AUTO. BUCKINGHAM] Testing repetitive set {}/{}: total alternative pi set size is {}".format(
+                            idx + 1, len(combination_list), len(combinatory_pi_set.keys())
+                        )
                     )
-                )
+        finally:
+            if pool is not None:
+                pool.shutdown()
         alternative_set_dict = {}
         for key in combinatory_pi_set.keys():
             expression = ""
@@ -516,6 +616,124 @@ def automatic_buckingham(parameter_set, track=False):
 #        else:
 #            raise TypeError('threads_number should be integer.')
 
+# -------[Parse monomial pi expression into parameters exponents]--------------
+def parse_pi_expression(expression, parameters_list):
+    """Function that parses a monomial expression (product and division of parameters with numeric exponents)
+        into parameters exponents in a single pass on its tokens. Numeric factors are ignored.
+
+        Parameters
+        ----------
+        expression: str
+                    Monomial expression such as 'a*b**2/(c*d)', '^' is read as '**'
+
+        parameters_list: list of str
+                         Parameters names defining the exponents vector order
+
+        Returns
+        -------
+        exponents: [n] numpy.array of float
+                   Exponent of each parameter of parameters_list in the expression
+
+        Example
+        -------
+        parse an expression:
+            >>> In [1]: parse_pi_expression('e/f*u^2/(l*d**0.5)', ['u', 'f', 'l', 'e', 'd'])
+            >>> Out[1]: array([ 2. , -1. , -1. ,  1. , -0.5])
+
+    """
+    if not (isinstance(expression, str)):
+        raise TypeError("expression should be a string.")
+    parameter_index = dict(zip(parameters_list, range(len(parameters_list))))
+    try:
+        tokens = [
+            token
+            for token in tokenize.generate_tokens(io.StringIO(expression.replace("^", "**")).readline)
+            if token.type in [tokenize.NAME, tokenize.NUMBER, tokenize.OP]
+        ]
+    except tokenize.TokenError:
+        raise SyntaxError("unbalanced parenthesis in expression '{}'.".format(expression))
+    position = [0]
+
+    def current():
+        return tokens[position[0]].string if position[0] < len(tokens) else ""
+
+    def read_number():
+        sign = 1
+        while current() in ["-", "+"]:
+            sign = -sign if current() == "-" else sign
+            position[0] += 1
+        if position[0] == len(tokens) or tokens[position[0]].type != tokenize.NUMBER:
+            raise SyntaxError("exponent should be a number in expression '{}'.".format(expression))
+        position[0] += 1
+        return sign * Fraction(tokens[position[0] - 1].string)
+
+    def read_exponent():
+        if current() == "(":
+            position[0] += 1
+            exponent = read_number()
+            if current() == "/":
+                position[0] += 1
+                exponent = exponent / read_number()
+            if current() != ")":
+                raise SyntaxError("exponent should be a number in expression '{}'.".format(expression))
+            position[0] += 1
+            return exponent
+        return read_number()
+
+    def read_factor():
+        token = tokens[position[0]] if position[0] < len(tokens) else None
+        if token is None:
+            raise SyntaxError("unexpected end of expression '{}'.".format(expression))
+        position[0] += 1
+        if token.type == tokenize.NAME:
+            if not (token.string in parameter_index):
+                raise SyntaxError("{} not in parameter_set.".format(token.string))
+            powers = {parameter_index[token.string]: Fraction(1)}
+        elif token.type == tokenize.NUMBER:
+            powers = {}
+        elif token.string == "(":
+            powers = read_product()
+            if current() != ")":
+                raise SyntaxError("unbalanced parenthesis in expression '{}'.".format(expression))
+            position[0] += 1
+        else:
+            raise SyntaxError(
+                "unexpected '{}' in expression '{}'.".format(token.string, expression)
+            )
+        if current() == "**":
+            position[0] += 1
+            exponent = read_exponent()
+            powers = {index: exponent * power for index, power in powers.items()}
+            if current() == "**":
+                raise SyntaxError("chained exponents in expression '{}'.".format(expression))
+        return powers
+
+    def read_product():
+        powers = {}
+        sign = 1
+        while True:
+            for index, power in read_factor().items():
+                powers[index] = powers.get(index, 0) + sign * power
+            # Continue on '*', '/' or implicit multiplication
+            if current() in ["*", "/"]:
+                sign = -1 if current() == "/" else 1
+                position[0] += 1
+            elif position[0] < len(tokens) and (
+                tokens[position[0]].type in [tokenize.NAME, tokenize.NUMBER] or current() == "("
+            ):
+                sign = 1
+            else:
+                return powers
+
+    powers = read_product()
+    if position[0] != len(tokens):
+        raise SyntaxError("unexpected '{}' in expression '{}'.".format(current(), expression))
+    exponents = numpy.zeros(len(parameters_list), dtype=float)
+    for index, power in powers.items():
+        exponents[index] = float(power)
+    return exponents
+
+
 # -------[Define manually the PI sets: global checks performed]-----------------
 def force_buckingham(parameter_set, *pi_list):
     """Function used to define manually a dimensionless set of parameters.
@@ -550,6 +768,7 @@ def force_buckingham(parameter_set, *pi_list):
         The analysis is conducted on Pi dimension, rank of Pi-parameter exponents,
         global expression and number of Pi compared to dimensional matrix rank and
         parameters number. 
+        Pi expressions should be monomials (see :func:`~pyvplm.addon.variablepowerlaw.parse_pi_expression`).
         The 'understood expression' is visible by printing pi_set.
     
     """
@@ -560,9 +779,9 @@ def force_buckingham(parameter_set, *pi_list):
         for idx in range(len(pi_list)):
             if not (isinstance(pi_list[idx], str)):
                 raise SyntaxError("pi(s) should be defined using tuple of string expressions.")
-        transformations = (
-            standard_transformations + (function_exponentiation,) + (implicit_multiplication,)
-        )
+        parameters = list(parameter_set.dictionary.keys())
+        # Parse each pi expression into parameters exponents vector
+        pi_parameters = numpy.zeros([len(pi_list), len(parameters)]).astype(float)
         for pi_number in range(len(pi_list)):
             expression = pi_list[pi_number]
             # Raise error if inappropriate operand used in pi definition
@@ -575,248 +794,51 @@ def force_buckingham(parameter_set, *pi_list):
                 raise SyntaxError(
                     "pi(s) expression contains inapropriate operand: '=', '<', '>', or '+'."
                 )
-            # Replace exponent expression
-            # Replaced \cdot because it was unrecognized
-            expression = expression.replace("^", "**")
-            parameter_list = []
-            list_change = True
-            # Parse expression until no decomposition found
-            while list_change:
-                list_change = False
-                if len(parameter_list) == 0:
-                    sympy_expr = parse_expr(
-                        expression, evaluate=False, transformations=transformations
-                    )
-                    for argument in list(sympy_expr.args):
-                        if not (str(argument) in parameter_list):
-                            list_change = True
-                            parameter_list.append(str(argument))
-                else:
-                    indices = range(len(parameter_list))
-                    for idx in indices:
-                        sympy_expr = parse_expr(
-                            parameter_list[idx], evaluate=False, transformations=transformations
-                        )
-                        try:
-                            list(sympy_expr.args)
-                        except Exception:  # Most probable, parameter name is sympy function name: hypothesis of no simplification
-                            sympy_expr.args = ()
-                        if not (len(list(sympy_expr.args)) == 0):
-                            list_change = True
-                            del parameter_list[idx]
-                            for argument in list(sympy_expr.args):
-                                # Check that argument is not a value
-                                try:
-                                    float(str(argument))
-                                except:
-                                    parameter_list.append(str(argument))
-                # When parsing is stuck because 1/expression is found, replace 1/expression by expression with all terms power changed
-                for idx in range(len(parameter_list)):
-                    parameter = parameter_list[idx]
-                    if parameter[0:2] == "1/":
-                        old_parameter = "/" + parameter[2 : len(parameter)]
-                        parameter = parameter[2 : len(parameter)]
-                        if parameter[0] == "(" and parameter[len(parameter) - 1] == ")":
-                            parameter = parameter[1 : len(parameter) - 1]
-                        # Get the parameter sublist
-                        sympy_expr = parse_expr(
-                            parameter, evaluate=False, transformations=transformations
-                        )
-                        try:
-                            if len(list(sympy_expr.args)) == 0:
-                                raise ValueError
-                            subparameter_list = numpy.array([])
-                            for subparameter in list(sympy_expr.args):
-                                subparameter_list = numpy.append(
-                                    subparameter_list, str(subparameter)
-                                )
-                            # Write the multiple expressions for old_parameter because parser can modify terms oder
-                            parenthesis = True if old_parameter[1] == "(" else False
-                            combination_list = list(permutations(subparameter_list.tolist()))
-                            for combination in combination_list:
-                                old_parameter = "/(" if parenthesis else "/"
-                                for subparameter in combination:
-                                    if subparameter[0:2] == "1/":
-                                        old_parameter = (
-                                            old_parameter[0: len(old_parameter) - 1]
-                                            + subparameter[3: len(subparameter)]
-                                            + "*"
-                                        )
-                                    else:
-                                        old_parameter += subparameter + "*"
-                                old_parameter = old_parameter[0: len(old_parameter) - 1]
-                                old_parameter = (
-                                    old_parameter + ")" if parenthesis else old_parameter
-                                )
-                                if old_parameter in expression:
-                                    break
-                            subparameter_length = numpy.array([]).astype(int)
-                            for subparameter in subparameter_list:
-                                subparameter_length = numpy.append(
-                                    subparameter_length, len(str(subparameter))
-                                )
-                            subparameter_list = subparameter_list[
-                                numpy.argsort(-1 * subparameter_length)
-                            ].tolist()
-                            for sub_idx in range(len(subparameter_list)):
-                                subparameter = subparameter_list[sub_idx]
-                                if subparameter[0:2] == "1/":
-                                    subparameter = subparameter[2: len(subparameter)]
-                                    subparameter_list[sub_idx] = subparameter
-                                    reverse_exponent = False
-                                else:
-                                    reverse_exponent = True
-                                if (
-                                    subparameter[0] == "("
-                                    and subparameter[len(subparameter) - 1] == ")"
-                                ):
-                                    parameter = (
-                                        parameter.replace(
-                                            subparameter, "{" + str(sub_idx) + "}" + "**-1"
-                                        )
-                                        if reverse_exponent
-                                        else parameter.replace(
-                                            "/" + subparameter, "{" + str(sub_idx) + "}"
-                                        )
-                                    )
-                                else:
-                                    exp_idx = subparameter.rfind("**")
-                                    if exp_idx == -1:
-                                        parameter = (
-                                            parameter.replace(
-                                                subparameter, "{" + str(sub_idx) + "}" + "**-1"
-                                            )
-                                            if reverse_exponent
-                                            else parameter.replace(
-                                                "/" + subparameter, "{" + str(sub_idx) + "}"
-                                            )
-                                        )
-                                    else:
-                                        exponent = subparameter[exp_idx + 2 : len(subparameter)]
-                                        subparameter_list[sub_idx] = subparameter[0:exp_idx]
-                                        parameter = (
-                                            parameter.replace(
-                                                subparameter,
-                                                "{"
-                                                + str(sub_idx)
-                                                + "}**"
-                                                + str(-1 * float(exponent)),
-                                            )
-                                            if reverse_exponent
-                                            else parameter.replace(
-                                                "/" + subparameter,
-                                                "{" + str(sub_idx) + "}**" + exponent,
-                                            )
-                                        )
-                            parameter_expression = "'" + parameter + "'.format("
-                            for subparameter in subparameter_list:
-                                parameter_expression += "'" + subparameter + "',"
-                            parameter_expression = (
-                                parameter_expression[0: len(parameter_expression) - 1] + ")"
-                            )
-                            new_parameter = eval(parameter_expression)
-                            parameter = new_parameter
-                            new_parameter = "*" + new_parameter
-                        except:
-                            # Only one parameter found with no exponent, case .../u-> 1/u -> parameter u
-                            new_parameter = "*" + parameter + "**-1"
-                        expression = expression.replace(old_parameter, new_parameter)
-                        parameter_list[idx] = parameter
-            # Overwrite pi expression
-            pi_list[pi_number] = expression
-            # Check that parsed values are saved parameters
-            for parameter in parameter_list:
-                if not (parameter in parameter_set.dictionary.keys()):
-                    raise SyntaxError(
-                        "from pi{} expression, {} not in parameter_set.".format(
-                            pi_number, parameter
-                        )
-                    )
-        # Calculate the dimension matrix of the variables
-        dimensional_matrix = write_dimensional_matrix(parameter_set)
-        # Extract parameters' coefficient from the PI expression (extracting first bigger parameters'names) and write dimension
-        parameter_list = numpy.array(list(parameter_set.dictionary.keys()))
+            try:
+                pi_parameters[pi_number, :] = parse_pi_expression(expression, parameters)
+            except SyntaxError as error:
+                raise SyntaxError("from pi{} expression, {}".format(pi_number, error.msg))
+        # Check pi are dimensionless with a single product with the dimension matrix of the variables
+        dimensional_matrix, dimensions = parameter_set.dimensional_matrix()
+        pi_dimensions = numpy.dot(pi_parameters, dimensional_matrix)
+        pi_dimensions[:, [dimension == "dimensionless" for dimension in dimensions]] = 0
+        for pi_number in range(len(pi_list)):
+            if numpy.sum(numpy.abs(pi_dimensions[pi_number, :])) != 0:
+                raise ValueError("at least pi{} is not dimensionless.".format(pi_number))
+        # Write expressions and bounds (parameters sorted with bigger names first)
+        parameter_list = numpy.array(parameters)
         parameter_length = numpy.array([])
         for parameter in parameter_list:
             parameter_length = numpy.append(parameter_length, len(parameter))
         parameter_list = parameter_list[numpy.argsort(-1 * parameter_length)].tolist()
         bounds_list = numpy.zeros([2, len(pi_list)]).astype(float)
-        pi_parameters = numpy.zeros([len(pi_list), numpy.shape(dimensional_matrix)[0]]).astype(int)
         for pi_number in range(len(pi_list)):
-            expression = pi_list[pi_number]
-            pi_exponents = numpy.zeros(numpy.shape(dimensional_matrix)[1]).astype(float)
-            bounds = numpy.array([]).astype(float)
+            bounds = numpy.array([1.0, 1.0])
             new_expression = ""
             for parameter in parameter_list:
-                if parameter in expression:
-                    index_start = expression.index(parameter) + len(parameter)
-                    # Switch between 3 possibilities *parameter, *parameter*other_parameter, *parameter**exponent[*other_parameter...]
-                    if index_start == len(expression):
-                        exponent = 1.0
-                        expression = expression.replace(parameter, "#")
-                    else:
-                        if expression[index_start + 1] != "*":
-                            exponent = 1.0
-                            expression = expression.replace(parameter, "#")
-                        else:
-                            index_start += 2
-                            index_stop = (
-                                len(expression)
-                                if expression.find("*", index_start) == -1
-                                else expression.find("*", index_start)
-                            )
-                            exponent = float(expression[index_start:index_stop])
-                            expression = expression.replace(
-                                parameter + "**" + expression[index_start:index_stop], "#"
-                            )
-                    pi_exponents += exponent * dimensional_matrix.loc[parameter, :].values
-                    if len(new_expression) == 0:
-                        new_expression = parameter + "**" + str(exponent)
-                    else:
-                        new_expression += "*" + parameter + "**" + str(exponent)
-                    pi_parameters[pi_number, parameter_list.index(parameter)] = exponent
-                    if len(bounds) == 0:
-                        if exponent < 0:
-                            bounds = (
-                                numpy.array(
-                                    [
-                                        parameter_set[parameter]._SI_bounds[1],
-                                        parameter_set[parameter]._SI_bounds[0],
-                                    ]
-                                )
-                                ** exponent
-                            )
-                        else:
-                            bounds = numpy.array(parameter_set[parameter]._SI_bounds) ** exponent
-                    else:
-                        if exponent < 0:
-                            bounds = bounds * (
-                                numpy.array(
-                                    [
-                                        parameter_set[parameter]._SI_bounds[1],
-                                        parameter_set[parameter]._SI_bounds[0],
-                                    ]
-                                )
-                                ** exponent
-                            )
-                        else:
-                            bounds = bounds * (
-                                numpy.array(parameter_set[parameter]._SI_bounds) ** exponent
-                            )
+                exponent = pi_parameters[pi_number, parameters.index(parameter)]
+                if exponent == 0:
+                    continue
+                if len(new_expression) == 0:
+                    new_expression = parameter + "**" + str(exponent)
+                else:
+                    new_expression += "*" + parameter + "**" + str(exponent)
+                if exponent < 0:
+                    bounds = bounds * (
+                        numpy.array(
+                            [
+                                parameter_set[parameter]._SI_bounds[1],
+                                parameter_set[parameter]._SI_bounds[0],
+                            ]
+                        )
+                        ** exponent
+                    )
+                else:
+                    bounds = bounds * (numpy.array(parameter_set[parameter]._SI_bounds) ** exponent)
+            if len(new_expression) == 0:
+                raise SyntaxError("from pi{} expression, no parameter found.".format(pi_number))
             bounds_list[:, pi_number] = bounds
             pi_list[pi_number] = new_expression
-            # Check pi is dimensionless
-            pi_exponents = pandas.DataFrame(
-                numpy.array([pi_exponents, pi_exponents]).astype(float),  # FIX 10/12/2021 Allow non integer exponents
-                columns=dimensional_matrix.columns.values.tolist(),
-            )
-            try:
-                pi_exponents = pi_exponents.drop(columns=["dimensionless"])
-            except:
-                pass
-            pi_exponents = pi_exponents.values.tolist()[0]
-            if numpy.sum(numpy.abs(pi_exponents)) != 0:
-                raise ValueError("at least pi{} is not dimensionless.".format(pi_number))
         # Check pi are independent on parameter space
         if numpy.linalg.matrix_rank(pi_parameters) < len(pi_list):
             raise ValueError("pi set does not cover the dimension set.")
@@ -863,8 +885,9 @@ def force_buckingham(parameter_set, *pi_list):
 
 
 # -------[Define function translating x into pi]--------------------------------
-def declare_func_x_to_pi(parameters_set, pi_set):
+def declare_func_x_to_pi(parameters_set, pi_set, method="product", dtype=numpy.float64):
     """Functions that declare pi=f(x) to transform parameters set values into pi set values.
+        The pi expressions are parsed once into a [k*n] exponents matrix used at each call.
         
         Parameters
         ----------
@@ -873,12 +896,20 @@ def declare_func_x_to_pi(parameters_set, pi_set):
         
         pi_set: PositiveParameterSet
                 Defines the k (k<n) dimensionless parameters of the problem
+
+        method: str
+                Defines the computation: 'product' (default) multiplies parameters powers, 'log' computes
+                10**(log10(X)@E.T) (points with null or negative values are computed with 'product')
+
+        dtype: numpy.dtype
+               Defines the computation and returned values type: numpy.float64 (default) or numpy.float32
         
         Returns
         -------
         f: function
-            a function of X, **X** being a [m*n] numpy.array of float representing physical parameters values 
-            which returns a [m*k] numpy.array of float corresponding to the dimensionless parameters values
+            a function of X (and optional out [m*k] numpy.array buffer), **X** being a [m*n] numpy.array of float
+            representing physical parameters values which returns a [m*k] numpy.array of float corresponding to the
+            dimensionless parameters values (the exponents matrix is stored in f.exponents)
         
         Example
         -------
@@ -901,65 +932,132 @@ def declare_func_x_to_pi(parameters_set, pi_set):
     if isinstance(parameters_set, PositiveParameterSet) and isinstance(
         pi_set, PositiveParameterSet
     ):
-
-        def f(X):
-            Y = []
-            X_T = numpy.transpose(X)
-            # Get pi equations
-            for pi_parameter in pi_set.dictionary.keys():
-                equation = pi_set[pi_parameter].description
-                V = []
-                # Create parameters list and index in parameter_set (for column handling on doe)
-                parameter_list = numpy.array(list(parameters_set.dictionary.keys()))
-                parameter_index = numpy.array(list(range(len(parameters_set.dictionary.keys()))))
-                # Sort parameter by length in order to extract first bigger parameter names (that cannot be included in others...)
-                parameter_length = numpy.array([]).astype(int)
-                for parameter in parameter_list.tolist():
-                    parameter_length = numpy.append(parameter_length, len(parameter))
-                parameter_list = parameter_list[numpy.argsort(-1 * parameter_length)].tolist()
-                parameter_index = parameter_index[numpy.argsort(-1 * parameter_length)].tolist()
-                # Search for parameters included in the equations and remove it
-                for index in range(len(parameter_list)):
-                    x_parameter = parameters_set[parameter_list[index]].name
-                    if equation.find(x_parameter) != -1:
-                        # Find parameter index in equation
-                        idx_start = equation.find(x_parameter)
-                        # Then find end of exponent expression
-                        if equation.find("*", idx_start + len(x_parameter) + 2) == -1:
-                            idx_end = len(equation)
-                        else:
-                            idx_end = equation.find("*", idx_start + len(x_parameter) + 2)
-                        # Extract exponent value
-                        exponent = float(equation[idx_start + len(x_parameter) + 2 : idx_end])
-                        # Remove from expression
-                        if idx_start == 0:
-                            if idx_end == len(equation):
-                                equation = ""
-                            else:
-                                equation = equation[idx_end + 1 : len(equation)]
-                        elif idx_end == len(equation):
-                            equation = equation[0 : idx_start - 1]
+        if not (method in ["product", "log"]):
+            raise ValueError("method should be 'product' or 'log'.")
+        if not (dtype in [numpy.float64, numpy.float32]):
+            raise TypeError("dtype should be numpy.float64 or numpy.float32.")
+        # Create parameters list and index in parameter_set (for column handling on doe)
+        parameter_list = numpy.array(list(parameters_set.dictionary.keys()))
+        parameter_index = numpy.array(list(range(len(parameters_set.dictionary.keys()))))
+        # Sort parameter by length in order to extract first bigger parameter names (that cannot be included in others...)
+        parameter_length = numpy.array([]).astype(int)
+        for parameter in parameter_list.tolist():
+            parameter_length = numpy.append(parameter_length, len(parameter))
+        parameter_list = parameter_list[numpy.argsort(-1 * parameter_length)].tolist()
+        parameter_index = parameter_index[numpy.argsort(-1 * parameter_length)].tolist()
+        # Parse pi equations once: exponents matrix and (column, exponent) factors in extraction order
+        exponents = numpy.zeros((len(pi_set.dictionary.keys()), len(parameter_list)))
+        factors = []
+        for pi_idx, pi_parameter in enumerate(pi_set.dictionary.keys()):
+            equation = pi_set[pi_parameter].description
+            factors.append([])
+            # Search for parameters included in the equations and remove it
+            for index in range(len(parameter_list)):
+                x_parameter = parameters_set[parameter_list[index]].name
+                if equation.find(x_parameter) != -1:
+                    # Find parameter index in equation
+                    idx_start = equation.find(x_parameter)
+                    # Then find end of exponent expression
+                    if equation.find("*", idx_start + len(x_parameter) + 2) == -1:
+                        idx_end = len(equation)
+                    else:
+                        idx_end = equation.find("*", idx_start + len(x_parameter) + 2)
+                    # Extract exponent value
+                    exponent = float(equation[idx_start + len(x_parameter) + 2 : idx_end])
+                    # Remove from expression
+                    if idx_start == 0:
+                        if idx_end == len(equation):
+                            equation = ""
                         else:
-                            equation = (
-                                equation[0 : idx_start - 1] + equation[idx_end : len(equation)]
-                            )
-                        # Copy parameters'values not to overwrite X_T
-                        X_values = numpy.copy(X_T[parameter_index[index]])
-                        # Overwrite 0 values if parameter exponent is negative (does not happen when used in VPLM with xi>0)
-                        if exponent < 0:
-                            X_values[X_values == 0] = float("nan")
-                        value = numpy.transpose(
-                            numpy.power(numpy.transpose(X_values), abs(exponent))
-                        )
-                        value = 1 / value if exponent < 0 else value
-                        V = value if len(V) == 0 else numpy.multiply(V, value)
-                Y.append(V.tolist())
-            Y = numpy.transpose(Y)
+                            equation = equation[idx_end + 1 : len(equation)]
+                    elif idx_end == len(equation):
+                        equation = equation[0 : idx_start - 1]
+                    else:
+                        equation = equation[0 : idx_start - 1] + equation[idx_end : len(equation)]
+                    exponents[pi_idx, parameter_index[index]] = exponent
+                    factors[pi_idx].append((parameter_index[index], exponent))
+
+        def product(X, Y):
+            for pi_idx in range(len(factors)):
+                V = None
+                for column, exponent in factors[pi_idx]:
+                    X_values = X[:, column]
+                    # Overwrite 0 values if parameter exponent is negative (does not happen when used in VPLM with xi>0)
+                    if exponent < 0 and numpy.any(X_values == 0):
+                        X_values = numpy.where(X_values == 0, numpy.nan, X_values)
+                    value = numpy.power(X_values, abs(exponent))
+                    value = 1 / value if exponent < 0 else value
+                    V = value if V is None else numpy.multiply(V, value)
+                Y[:, pi_idx] = 1 if V is None else V
             return Y
 
+        def f(X, out=None):
+            X = numpy.asarray(X, dtype=dtype)
+            if out is None:
+                out = numpy.empty((numpy.shape(X)[0], len(factors)), dtype=dtype)
+            elif numpy.shape(out) != (numpy.shape(X)[0], len(factors)):
+                raise ValueError(
+                    "out buffer shape should be [{}*{}].".format(numpy.shape(X)[0], len(factors))
+                )
+            if method == "product":
+                return product(X, out)
+            # Compute in log space rows with strictly positive values, others with product
+            positive = numpy.all(X > 0, axis=1)
+            out[positive] = numpy.power(
+                dtype(10), numpy.log10(X[positive]) @ exponents.T.astype(dtype)
+            )
+            if not (numpy.all(positive)):
+                others = numpy.logical_not(positive)
+                out[others] = product(
+                    X[others], numpy.empty((numpy.sum(others), len(factors)), dtype=dtype)
+                )
+            return out
+
+        f.exponents = exponents
         return f
 
 
+# -------[Define function replacing names in an expression]--------------------
+def replace_names(expression, replacements):
+    """Function that replaces variable names in a python expression using tokens (names included in other names,
+        numbers such as 5e-2 or attributes such as numpy.e are left unchanged).
+
+        Parameters
+        ----------
+        expression: str
+                    Python expression
+
+        replacements: dict
+                      Replacement string for each name
+
+        Returns
+        -------
+        expression: str
+                    Expression with replaced names
+
+        Example
+        -------
+        replace parameter e in an expression:
+            >>> In [1]: replace_names("5e-2-e*x", {"e": "X[:,0]"})
+            >>> Out[1]: '5e-2 -X[:,0] *x'
+
+    """
+    tokens = []
+    previous = None
+    for token in tokenize.generate_tokens(io.StringIO(expression).readline):
+        token_type, token_string = token[0], token[1]
+        if (
+            token_type == tokenize.NAME
+            and token_string in replacements
+            and not (previous is not None and previous[1] == ".")
+        ):
+            tokens.append((tokenize.NAME, replacements[token_string]))
+        else:
+            tokens.append((token_type, token_string))
+        previous = (token_type, token_string)
+    return tokenize.untokenize(tokens).strip()
+
+
 # -------[Define function calculating constraints]------------------------------
 def declare_constraints(parameters_set, constraint_set):
     """Functions that declare constraint=f(X_doe)/f(PI_doe) to return validity of a DoE set .
@@ -990,33 +1088,289 @@ def declare_constraints(parameters_set, constraint_set):
                         parameter
                     )
                 )
+        # Compile once each constraint expression with parameters replaced by X columns
+        global_list = list(parameters_set.dictionary.keys())
+        compiled_constraints = []
+        for constraint in constraint_set.constraints_list:
+            expression = replace_names(
+                constraint.function_expr,
+                {
+                    parameter: "X[:," + str(global_list.index(parameter)) + "]"
+                    for parameter in constraint.parameters
+                },
+            )
+            compiled_constraints.append(compile(expression, "<constraint>", "eval"))
+
         # Define function
         def f(X):
-            Y = numpy.zeros(len(X), dtype=int)
-            for constraint in constraint_set.constraints_list:
-                # Get constraint expression
-                expression = constraint.function_expr
-                # Get constraint parameters list ordered
-                parameter_list = numpy.array(constraint.parameters)
-                parameter_length = numpy.array([]).astype(int)
-                for parameter in parameter_list.tolist():
-                    parameter_length = numpy.append(parameter_length, len(parameter))
-                parameter_list = parameter_list[numpy.argsort(-1 * parameter_length)].tolist()
-                # Find corresponding idx in "parameters_set"
-                global_list = list(parameters_set.dictionary.keys())
-                for parameter in parameter_list:
-                    parameter_idx = global_list.index(parameter)
-                    expression = expression.replace(parameter, "X[:," + str(parameter_idx) + "]")
-                # Calculate constraint over DoE
-                y = eval(expression)
-                Y += y.astype("int32")
+            # Evaluate each constraint only on the points validating the previous ones
+            feasible_index = numpy.arange(len(X))
+            X_feasible = X
+            for code in compiled_constraints:
+                if len(feasible_index) == 0:
+                    break
+                y = numpy.broadcast_to(eval(code, globals(), {"X": X_feasible}), len(X_feasible))
+                # Expression without inequality (strict '>' constraint) is valid if >=0
+                y = y if y.dtype == bool else y >= 0
+                feasible_index = feasible_index[y]
+                X_feasible = X_feasible[y]
             # Return boolean
-            Y = Y == len(constraint_set.constraints_list)
+            Y = numpy.zeros(len(X), dtype=bool)
+            Y[feasible_index] = True
             return Y
 
+        # Keep constraints expressions (used as signature by pixdoe.create_const_doe cache)
+        f.expressions = [
+            constraint.function_expr for constraint in constraint_set.constraints_list
+        ]
         return f
 
 
+# -------[Define function computing leave-one-out predictions of least squares]-
+def leave_one_out_predictions(values, Y):
+    """Function that computes the leave-one-out cross-validation predictions of a linear least squares
+        model using a single QR factorization (PRESS residuals): the prediction on the i-th point of the
+        model trained without it is Y[i] - r[i]/(1-h[i]), with r the residuals and h the hat matrix diagonal
+        of the model trained on all points.
+        Points with a leverage h[i] close to 1 (and all points if values is rank deficient) are computed
+        solving the reduced problem with :func:`~scipy.linalg.lstsq`.
+
+        Parameters
+        ----------
+        values: [m*p] numpy.array of float
+                Regression matrix (one column per model term)
+
+        Y: [m] numpy.array of float
+           Regression target values
+
+        Returns
+        -------
+        y_pred: [m] numpy.array of float
+                Prediction on each point of the model trained on the m-1 other points
+
+        Example
+        -------
+        compute leave-one-out predictions of a linear model:
+            >>> In [1]: values = numpy.c_[numpy.ones(4), numpy.array([1.0, 2.0, 3.0, 4.0])]
+            >>> In [2]: leave_one_out_predictions(values, numpy.array([1.0, 2.0, 3.0, 5.0]))
+                array([0.33333333, 2.14285714, 3.57142857, 4.        ])
+
+    """
+    values = numpy.asarray(values, dtype=float)
+    Y = numpy.asarray(Y, dtype=float)
+    m, p = numpy.shape(values)
+    y_pred = numpy.zeros(m)
+    fallback = numpy.ones(m, dtype=bool)
+    if m > p:
+        Q, R, _ = scipy.linalg.qr(values, mode="economic", pivoting=True)
+        diagonal = numpy.absolute(numpy.diag(R))
+        rank = int(numpy.sum(diagonal > max(m, p) * numpy.finfo(float).eps * diagonal[0]))
+        if rank == p:
+            leverage = numpy.sum(Q ** 2, axis=1)
+            residuals = Y - numpy.dot(Q, numpy.dot(Q.T, Y))
+            fallback = leverage > 1.0 - 1e-8
+            y_pred[~fallback] = Y[~fallback] - residuals[~fallback] / (1.0 - leverage[~fallback])
+    for test_idx in numpy.where(fallback)[0]:
+        coeff, _, _, _ = scipy.linalg.lstsq(
+            numpy.delete(values, test_idx, 0), numpy.delete(Y, test_idx, 0)
+        )
+        y_pred[test_idx] = numpy.dot(values[test_idx, :], coeff)
+    return y_pred
+
+
+# -------[Define function computing ridge or LASSO regularization path]---------
+def regularization_path(values, Y, method="ridge", alphas=None, return_loo=False):
+    """Function that computes the regularization path of a ridge or LASSO least squares regression.
+        First column of values is the (not penalized) constant term, the other columns are standardized
+        before penalization and returned coefficients are expressed on the original columns.
+        Ridge path is computed for all alphas from a single SVD, LASSO path uses coordinate descent
+        warm-started from previous alpha solution (see :func:`~sklearn.linear_model.lasso_path`).
+
+        Parameters
+        ----------
+        values: [m*p] numpy.array of float
+                Regression matrix, first column being the constant term (ones)
+
+        Y: [m] numpy.array of float
+           Regression target values
+
+        method: str
+                Defines the regularization: 'ridge' (default) or 'lasso'
+
+        alphas: [A] numpy.array of float
+                Regularization weights (sorted in decreasing order), default is 20 values (ridge) or 100 values
+                (lasso) spread in logarithmic space from the weight cancelling (almost) all coefficients
+
+        return_loo: bool
+                    Returns also the ridge leave-one-out predictions if True (default is False)
+
+        Returns
+        -------
+        alphas: [A] numpy.array of float
+                Regularization weights in decreasing order
+
+        coefficients: [A*p] numpy.array of float
+                      Regression coefficients for each regularization weight
+
+        y_loo: [A*m] numpy.array of float
+               Prediction on each point of the ridge model trained on the m-1 other points (only if return_loo)
+
+        Example
+        -------
+        compute the ridge path of a linear model:
+            >>> In [1]: values = numpy.c_[numpy.ones(4), numpy.array([1.0, 2.0, 3.0, 4.0])]
+            >>> In [2]: regularization_path(values, numpy.array([1.0, 2.0, 3.0, 5.0]), alphas=[1.0, 0.0])
+                (array([1., 0.]), array([[ 0.15,  1.04],
+                       [-0.5 ,  1.3 ]]))
+
+    """
+    if not (method in ["ridge", "lasso"]):
+        raise ValueError("method should be 'ridge' or 'lasso'.")
+    if return_loo and method != "ridge":
+        raise ValueError("leave-one-out predictions are only available for method='ridge'.")
+    values = numpy.asarray(values, dtype=float)
+    Y = numpy.asarray(Y, dtype=float)
+    m = numpy.shape(values)[0]
+    # Standardize non-constant columns and center target
+    mean = numpy.mean(values[:, 1:], axis=0)
+    scale = numpy.std(values[:, 1:], axis=0)
+    scale[scale == 0] = 1.0
+    Z = (values[:, 1:] - mean) / scale
+    y_mean = numpy.mean(Y)
+    if method == "ridge":
+        U, singular, Vt = scipy.linalg.svd(Z, full_matrices=False)
+        Uty = numpy.dot(U.T, Y - y_mean)
+        if alphas is None:
+            alphas = singular[0] ** 2 * numpy.logspace(2, -8, 20)
+        alphas = numpy.sort(numpy.asarray(alphas, dtype=float))[::-1]
+        shrink = singular ** 2 / (singular ** 2 + alphas[:, None])
+        beta = numpy.dot(shrink / numpy.where(singular == 0, 1.0, singular) * Uty, Vt) / scale
+    else:
+        from sklearn.linear_model import lasso_path
+
+        if alphas is not None:
+            alphas = numpy.sort(numpy.asarray(alphas, dtype=float))[::-1]
+        alphas, beta, _ = lasso_path(Z, Y - y_mean, alphas=alphas)
+        beta = beta.T / scale
+    coefficients = numpy.c_[y_mean - numpy.dot(beta, mean), beta]
+    if not return_loo:
+        return alphas, coefficients
+    # Ridge (with not penalized constant) is a linear smoother: y_loo = y - r/(1-h)
+    leverage = 1.0 / m + numpy.dot(shrink, (U ** 2).T)
+    residuals = Y - numpy.dot(coefficients, values.T)
+    return alphas, coefficients, Y - residuals / (1.0 - leverage)
+
+
+# -------[Define class storing regression models]-------------------------------
+class RegressionModels:
+    """Class storing the regression models computed by :func:`~pyvplm.addon.variablepowerlaw.regression_models`
+        into arrays, with a dict-like access compatible with former dict results (models[i] with i>=1 and
+        models['max |e|'], models['ave. |e|'], models['ave. e'], models['sigma e']).
+
+        Attributes
+        ----------
+        expressions: list of str
+                     The M models expressions
+
+        labels: list of str
+                The M terms labels in order of addition to the models ('' is the constant term)
+
+        coefficients: [M*p] numpy.array of float
+                      Regression coefficients, model 'i' uses the terms_nb[i-1] first terms (row i-1 is padded with 0)
+
+        terms_nb: [M] numpy.array of int
+                  Number of terms used by each model (default is i for model 'i')
+
+        errors: [M*4*2] numpy.array of float
+                Criteria (**max |e|**, **ave. |e|**, **ave. e** and **sigma e**) on trained [:,:,0] and tested [:,:,1] sets
+
+        log_space: bool
+                   Defines if regression has been performed within logarithmic space
+
+        exponents: [p*K] numpy.array of int
+                   Exponent of pi number j+1 (column j) in each of the p terms (see
+                   :func:`~pyvplm.addon.variablepowerlaw.expression_to_model`)
+
+        Example
+        -------
+        get models 3 coefficients and train errors:
+            >>> In [1]: models = regression_models(doePI, 'pi1', 3, test_mode=True)
+            >>> In [2]: models[3][1], models[3][2]
+            >>> In [3]: models.errors[2, :, 0]
+
+        evaluate model 3 on pi DOE:
+            >>> In [4]: Y_reg = predict(models.model(3), doePI)
+
+    """
+
+    criteria = ["max |e|", "ave. |e|", "ave. e", "sigma e"]
+
+    def __init__(self, expressions, labels, coefficients, errors, log_space=True, terms_nb=None):
+        self.expressions = expressions
+        self.labels = labels
+        self.coefficients = coefficients
+        self.errors = errors
+        self.log_space = log_space
+        if terms_nb is None:
+            terms_nb = numpy.arange(1, len(expressions) + 1)
+        self.terms_nb = numpy.asarray(terms_nb).astype(int)
+        # Terms exponents (on pi numbers) read from the model using the most terms
+        self.exponents = expression_to_model(expressions[int(numpy.argmax(self.terms_nb))])[2]
+
+    def model(self, model):
+        """Method returning model 'model' as (terms exponents, coefficients) to be evaluated with
+            :func:`~pyvplm.addon.variablepowerlaw.predict`.
+        """
+        return (
+            self.exponents[0: self.terms_nb[model - 1], :],
+            numpy.copy(self.coefficients[model - 1, 0: self.terms_nb[model - 1]]),
+        )
+
+    def error_frame(self, model, tested=False):
+        """Method returning model 'model' trained (or tested) set criteria as a pandas.DataFrame.
+        """
+        return pandas.DataFrame(self.errors[model - 1, :, 1 if tested else 0], index=self.criteria)
+
+    def keys(self):
+        return list(range(1, len(self.expressions) + 1)) + self.criteria
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self):
+        """Method returning the models as a dict (former regression_models results).
+        """
+        return dict(self.items())
+
+    def __getitem__(self, key):
+        if isinstance(key, str) and key in self.criteria:
+            index = self.criteria.index(key)
+            return [self.errors[:, index, 0].tolist(), self.errors[:, index, 1].tolist()]
+        if isinstance(key, (int, numpy.integer)) and (1 <= key <= len(self.expressions)):
+            return (
+                self.expressions[key - 1],
+                numpy.copy(self.coefficients[key - 1, 0: self.terms_nb[key - 1]]),
+                self.error_frame(key),
+                self.error_frame(key, tested=True),
+            )
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.expressions) + len(self.criteria)
+
+    def __repr__(self):
+        return "RegressionModels({} models, criteria {})".format(len(self.expressions), self.criteria)
+
+
 # -------[Define function extracting regression model with increased complexity]
 def regression_models(doe, elected_pi0, order, **kwargs):
     """Functions that calculate the regression model coefficient with increasing model complexity.
@@ -1050,10 +1404,18 @@ def regression_models(doe, elected_pi0, order, **kwargs):
                   * **eff_pi0** (*int*): effective pi0 index in the modfied DOE (used only with removed_pi)
                   * **return_axes** (*bool*): returns the axes objects for the plots if True (default is False)
                   * **fig_size** (*tuple*): tuple of 2 numbers specifying the width and height of the plot in inches
+                  * **n_jobs** (*int*): number of threads used to score the terms candidates and to fit the models
+                  (default is 1), results are identical to the serial computation
+                  * **engine** (*str*): defines how models are built: 'greedy' (default) adds terms one by one minimizing
+                  the chosen criteria, 'lasso' adds terms in their order of entry into the LASSO regularization path, 'ridge'
+                  returns the ridge models of the regularization path with all terms (by decreasing regularization)
+                  * **alphas** (*list*): regularization weights for 'ridge' and 'lasso' engines (see
+                  :func:`~pyvplm.addon.variablepowerlaw.regularization_path`)
         Returns
         -------
-        models: dict of [1*4] tuple
-                Stores the different models regression information as for model 'i':
+        models: RegressionModels
+                Stores the different models regression information (see :class:`~pyvplm.addon.variablepowerlaw.RegressionModels`)
+                with a dict-like access, as for model 'i':
                     * dict[i][0]: str of the model expression
                     * dict[i][1]: numpy.array of the regression coefficients
                     * dict[i][2]: pandas.DataFrame of the trained set (**max abs(e)**, **average abs(e)**, **average e** and **sigma e**)
@@ -1112,9 +1474,13 @@ def regression_models(doe, elected_pi0, order, **kwargs):
         eff_elected_pi0 = elected_pi0
         return_axes = False
         fig_size = ()
+        n_jobs = 1
+        engine = "greedy"
+        alphas = None
         for key, value in kwargs.items():
             if not (key in ["log_space", "ymax_axis", "test_mode", "plots", "latex", "skip_cross_validation",
-                            "force_choice", "removed_pi", "eff_pi0", "return_axes", "fig_size"]):
+                            "force_choice", "removed_pi", "eff_pi0", "return_axes", "fig_size", "n_jobs",
+                            "engine", "alphas"]):
                 raise KeyError("unknown argument " + key)
             elif key == "ymax_axis":
                 if isinstance(value, int) or isinstance(value, float):
@@ -1174,6 +1540,27 @@ def regression_models(doe, elected_pi0, order, **kwargs):
                     fig_size = value
                 else:
                     raise ValueError("fig_size should be a tuple")
+            elif key == "n_jobs":
+                if isinstance(value, int):
+                    if value < 1:
+                        raise ValueError("n_jobs should be >=1")
+                    else:
+                        n_jobs = value
+                else:
+                    raise TypeError("n_jobs should be an int")
+            elif key == "engine":
+                if value in ["greedy", "ridge", "lasso"]:
+                    engine = value
+                else:
+                    raise ValueError("engine should be 'greedy', 'ridge' or 'lasso'")
+            elif key == "alphas":
+                if isinstance(value, list) or isinstance(value, numpy.ndarray):
+                    if numpy.any(numpy.array(value) < 0):
+                        raise ValueError("alphas should be >=0")
+                    else:
+                        alphas = numpy.array(value, dtype=float)
+                else:
+                    raise TypeError("alphas should be a list or numpy array")
         # Adapt X if necessary
         if numpy.any(numpy.isnan(doe)):
             raise ValueError("DOE should not contain nan values")
@@ -1221,8 +1608,8 @@ def regression_models(doe, elected_pi0, order, **kwargs):
             term = term.replace(" ", "*")
             labels.append(term)
         X = pandas.DataFrame(numpy.c_[numpy.ones(numpy.shape(X)[0]), X], columns=labels)
-        # Ask user the ranking criteria
-        if not test_mode:
+        # Ask user the ranking criteria (used by greedy engine only)
+        if not test_mode and engine == "greedy":
             print("\nBased on following criteria definitions:")
             print("1 - C = max(abs(error))")
             print("2 - C = mean(abs(error))")
@@ -1249,160 +1636,197 @@ def regression_models(doe, elected_pi0, order, **kwargs):
                 choice = 2
             else:
                 choice = force_choice
-        # Perform a first "quick" regression adding terms one by one to evaluate slope of criteria curves
-        ordered_labels = [""]
-        while len(ordered_labels) < len(labels):
-            X_remaining = copy.deepcopy(X)
-            X_remaining = X_remaining.drop(columns=ordered_labels)
-            available_labels = X_remaining.columns.values.tolist()
-            best_criteria = float("Inf")
-            best_label = available_labels[0]
-            for idx in range(len(available_labels)):
-                # select new column
-                values = X[ordered_labels]
-                values[available_labels[idx]] = X_remaining[available_labels[idx]]
-                values = values.values
-                # calculate regression coefficients
-                coeff, _, _, _ = scipy.linalg.lstsq(values, Y)
-                # calculate error on trained set
-                y_pred = numpy.dot(values, coeff)
+        # Perform a first "quick" regression adding terms one by one to evaluate slope of criteria curves:
+        # remaining columns are orthogonalized against the selected ones (Gram-Schmidt) so that the fit of
+        # each candidate is an update of the current fit instead of a new least squares resolution
+        X_values = X.values
+        if log_space:
+            y_data = 10.0 ** Y
+        else:
+            y_data = Y
+        y_data += (y_data == 0.0) * sys.float_info.min  # FIXES 06/05/21: to avoid 0.0 division
+        ordered_index = [0]
+        Q = X_values[:, 0:1] / numpy.linalg.norm(X_values[:, 0])
+        y_fit = numpy.dot(Q, numpy.dot(Q.T, Y))
+
+        # Define candidates scoring (on fixed-size chunks so that results do not depend on n_jobs)
+        def score_candidates(available_index):
+            # orthogonalize candidates twice for numerical stability
+            C = X_values[:, available_index]
+            for _ in range(2):
+                C = C - numpy.dot(Q, numpy.dot(Q.T, C))
+            norms = numpy.linalg.norm(C, axis=0)
+            independent = norms > 1e-10 * numpy.linalg.norm(X_values[:, available_index], axis=0)
+            C[:, independent] = C[:, independent] / norms[independent]
+            C[:, ~independent] = 0.0
+            # calculate error on trained set for each candidate
+            y_pred = y_fit[:, None] + C * numpy.dot(C.T, Y)
+            if log_space:
+                y_pred = 10.0 ** y_pred
+            error_train = (y_pred - y_data[:, None]) * (1 / y_data[:, None]) * 100
+            # calculate local criteria
+            if choice == 1:
+                local_criteria = numpy.amax(numpy.absolute(error_train), axis=0)  # C1
+            elif choice == 2:
+                local_criteria = numpy.mean(numpy.absolute(error_train), axis=0)  # C2
+            elif choice == 3:
+                local_criteria = numpy.mean(error_train, axis=0)  # C3
+            else:
+                local_criteria = numpy.std(error_train, axis=0)  # C4
+            return C, independent, local_criteria
+
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=n_jobs) if n_jobs > 1 else None
+        try:
+            if engine == "ridge":
+                # Regularized models use all the terms
+                ordered_index = list(range(len(labels)))
+            elif engine == "lasso":
+                # Order terms by entry into the LASSO path (then by decreasing final coefficient)
+                _, path_coefficients = regularization_path(X_values, Y, "lasso", alphas)
+                active = path_coefficients[:, 1:] != 0
+                entry = numpy.where(numpy.any(active, axis=0), numpy.argmax(active, axis=0), len(active))
+                order = numpy.lexsort((-numpy.absolute(path_coefficients[-1, 1:]), entry))
+                ordered_index = [0] + (order + 1).tolist()
+            while len(ordered_index) < len(labels):
+                available_index = [i for i in range(len(labels)) if not (i in ordered_index)]
+                chunks = [
+                    available_index[i: i + 32] for i in range(0, len(available_index), 32)
+                ]
+                if pool is None:
+                    scores = [score_candidates(chunk) for chunk in chunks]
+                else:
+                    scores = list(pool.map(score_candidates, chunks))
+                C = numpy.concatenate([score[0] for score in scores], axis=1)
+                independent = numpy.concatenate([score[1] for score in scores])
+                local_criteria = numpy.concatenate([score[2] for score in scores])
+                # save best candidate (first one in case of equality)
+                local_criteria[numpy.isnan(local_criteria)] = float("Inf")
+                best_idx = int(numpy.argmin(local_criteria))
+                ordered_index.append(available_index[best_idx])
+                if independent[best_idx]:
+                    Q = numpy.c_[Q, C[:, best_idx]]
+                    y_fit = y_fit + C[:, best_idx] * numpy.dot(C[:, best_idx], Y)
+            ordered_labels = [labels[i] for i in ordered_index]
+            # Re-order labels/DoE
+            labels = ordered_labels
+            X = X[labels]
+
+            # Define relative error (in %) and criteria calculation
+            def relative_error(y_pred, y):
                 if log_space:
                     y_pred = 10.0 ** y_pred
-                    y_data = 10.0 ** Y
+                    y_data = 10.0 ** y
                 else:
-                    y_data = Y
+                    y_data = numpy.copy(y)
                 y_data += (y_data == 0.0) * sys.float_info.min  # FIXES 06/05/21: to avoid 0.0 division
-                error_train = (y_pred - y_data) * (1 / y_data) * 100
-                # calculate local criteria
-                if choice == 1:
-                    local_criteria = numpy.amax(numpy.absolute(error_train))  # C1
-                elif choice == 2:
-                    local_criteria = numpy.mean(numpy.absolute(error_train))  # C2
-                elif choice == 3:
-                    local_criteria = numpy.mean(error_train)  # C3
-                else:
-                    local_criteria = numpy.std(error_train)  # C4
-                # save label if best candidate
-                if local_criteria < best_criteria:
-                    best_criteria = local_criteria
-                    best_label = available_labels[idx]
-            ordered_labels.append(best_label)
-        # Re-order labels/DoE
-        labels = ordered_labels
-        X = X[labels]
-        # Calculate the regression models considering parameters by order of decreasing correlation
-        models = {}
-        for idx in range(numpy.shape(X.values)[1]):
-            error_test = numpy.array([])
-            values = X.values[:, 0: idx + 1]
-            # FIXES 06/05/21: permit to skip cross-validation for big data matrices
-            if (numpy.shape(values)[0] > 10 * numpy.shape(X.values)[1]) and skip_cross_validation:
-                coeff, _, _, _ = scipy.linalg.lstsq(values, Y)
-                y_pred = numpy.dot(values, coeff)
+                return (y_pred - y_data) * (1 / y_data) * 100
+
+            def error_criteria(error):
+                # Calculate max and average absolute error and average and sigma error
+                error_average = numpy.mean(error)
+                error_sigma = numpy.std(error)
+                abs_error_average = numpy.mean(numpy.absolute(error))
+                abs_error_max = numpy.amax(numpy.absolute(error))
+                return numpy.array([abs_error_max, abs_error_average, error_average, error_sigma])
+
+            # Define model expression writing (coeff[i] applies to the i-th label)
+            def write_expression(coeff):
+                labels = numpy.array(X.columns.tolist())
                 if log_space:
-                    y_pred = 10.0 ** y_pred
-                    y_data = 10.0 ** Y
+                    expression = "log(pi" + str(elected_pi0) + ") = "
                 else:
-                    y_data = Y
-                y_data += (y_data == 0.0) * sys.float_info.min  # FIXES 06/05/21: to avoid 0.0 division
-                error_train = (y_pred - y_data) * (1 / y_data) * 100
-                error_test = numpy.zeros(shape=numpy.shape(error_train))
-            else:
-                for test_idx in range(numpy.shape(values)[0]):
-                    coeff, _, _, _ = scipy.linalg.lstsq(
-                        numpy.delete(values, test_idx, 0), numpy.delete(Y, test_idx, 0)
-                    )
-                    # Calculate error on trained set when selecting last point for cross validation (saved model expr.)
-                    if test_idx == (numpy.shape(values)[0] - 1):
-                        y_pred = numpy.dot(numpy.delete(values, test_idx, 0), coeff)
-                        if log_space:
-                            y_pred = 10.0 ** y_pred
-                            y_data = 10.0 ** numpy.delete(Y, test_idx, 0)
+                    expression = "pi" + str(elected_pi0) + " = "
+                for i in range(0, len(coeff)):
+                    if coeff[i] < 0:
+                        if labels[i] == "":
+                            expression = (
+                                expression[0: len(expression) - 1] + "{:.5f}".format(coeff[i]) + "+"
+                            )
                         else:
-                            y_data = numpy.delete(Y, test_idx, 0)
-                        y_data += (y_data == 0.0) * sys.float_info.min  # FIXES 06/05/21: to avoid 0.0 division
-                        error_train = (y_pred - y_data) * (1 / y_data) * 100
-                    # Calculate and save the error on the tested point (cross-validation)
-                    y_pred = numpy.dot(values[test_idx, :], coeff)
-                    if log_space:
-                        y_pred = 10.0 ** y_pred
-                        y_data = 10.0 ** Y[test_idx]
-                    else:
-                        y_data = Y[test_idx]
-                    y_data += (y_data == 0.0) * sys.float_info.min  # FIXES 06/05/21: to avoid 0.0 division
-                    error_test = numpy.append(error_test, (y_pred - y_data) * (1 / y_data) * 100)
-            # Write model expression
-            labels = numpy.array(X.columns.tolist())
-            if log_space:
-                expression = "log(pi" + str(elected_pi0) + ") = "
-            else:
-                expression = "pi" + str(elected_pi0) + " = "
-            for i in range(0, idx + 1):
-                if coeff[i] < 0:
-                    if labels[i] == "":
-                        expression = (
-                            expression[0: len(expression) - 1] + "{:.5f}".format(coeff[i]) + "+"
-                        )
+                            expression = (
+                                expression[0: len(expression) - 1]
+                                + "{:.5f}*".format(coeff[i])
+                                + labels[i]
+                                + "+"
+                            )
                     else:
-                        expression = (
-                            expression[0: len(expression) - 1]
-                            + "{:.5f}*".format(coeff[i])
-                            + labels[i]
-                            + "+"
-                        )
+                        if labels[i] == "":
+                            expression += "{:.5f}".format(coeff[i]) + labels[i] + "+"
+                        else:
+                            expression += "{:.5f}*".format(coeff[i]) + labels[i] + "+"
+                return expression[0: len(expression) - 1]
+
+            # FIXES 06/05/21: permit to skip cross-validation for big data matrices
+            skip_test = (numpy.shape(X.values)[0] > 10 * numpy.shape(X.values)[1]) and skip_cross_validation
+
+            # Calculate the regression models considering parameters by order of decreasing correlation
+            def fit_model(idx):
+                values = X.values[:, 0: idx + 1]
+                if skip_test:
+                    coeff, _, _, _ = scipy.linalg.lstsq(values, Y)
+                    error_train = relative_error(numpy.dot(values, coeff), Y)
+                    error_test = numpy.zeros(shape=numpy.shape(error_train))
                 else:
-                    if labels[i] == "":
-                        expression += "{:.5f}".format(coeff[i]) + labels[i] + "+"
+                    # Saved model expression is trained without the last point (last cross-validation step)
+                    coeff, _, _, _ = scipy.linalg.lstsq(values[0:-1, :], Y[0:-1])
+                    error_train = relative_error(numpy.dot(values[0:-1, :], coeff), Y[0:-1])
+                    # Calculate the error on each tested point (leave-one-out cross-validation)
+                    error_test = relative_error(leave_one_out_predictions(values, Y), Y)
+                return write_expression(coeff), coeff, error_criteria(error_train), error_criteria(error_test)
+
+            if engine == "ridge":
+                # Ridge models along the regularization path (leave-one-out computed from hat matrix)
+                alphas, path_coefficients, y_loo = regularization_path(
+                    X.values, Y, "ridge", alphas, return_loo=True
+                )
+                results = []
+                for idx in range(len(alphas)):
+                    coeff = path_coefficients[idx]
+                    error_train = relative_error(numpy.dot(X.values, coeff), Y)
+                    if skip_test:
+                        error_test = numpy.zeros(shape=numpy.shape(error_train))
                     else:
-                        expression += "{:.5f}*".format(coeff[i]) + labels[i] + "+"
-            expression = expression[0: len(expression) - 1]
-            # Calculate max and average absolute error and average and sigma error on train data
-            error_average = numpy.mean(error_train)
-            error_sigma = numpy.std(error_train)
-            abs_error_average = numpy.mean(numpy.absolute(error_train))
-            abs_error_max = numpy.amax(numpy.absolute(error_train))
-            error_train = numpy.array(
-                [abs_error_max, abs_error_average, error_average, error_sigma]
-            )
-            error_train = pandas.DataFrame(
-                error_train, index=["max |e|", "ave. |e|", "ave. e", "sigma e"]
-            )
-            # Calculate max and average absolute error and average and sigma error on test data
-            error_average = numpy.mean(error_test)
-            error_sigma = numpy.std(error_test)
-            abs_error_average = numpy.mean(numpy.absolute(error_test))
-            abs_error_max = numpy.amax(numpy.absolute(error_test))
-            error_test = numpy.array([abs_error_max, abs_error_average, error_average, error_sigma])
-            error_test = pandas.DataFrame(
-                error_test, index=["max |e|", "ave. |e|", "ave. e", "sigma e"]
-            )
-            # Save data
-            models[len(list(models.keys())) + 1] = (expression, coeff, error_train, error_test)
+                        error_test = relative_error(y_loo[idx], Y)
+                    results.append(
+                        (write_expression(coeff), coeff, error_criteria(error_train), error_criteria(error_test))
+                    )
+            elif pool is None:
+                results = [fit_model(idx) for idx in range(numpy.shape(X.values)[1])]
+            else:
+                results = list(pool.map(fit_model, range(numpy.shape(X.values)[1])))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        # Store models into arrays (padded coefficients matrix and models*4*2 errors tensor)
+        coefficients = numpy.zeros((len(results), numpy.shape(X.values)[1]))
+        errors = numpy.zeros((len(results), 4, 2))
+        for idx in range(len(results)):
+            coefficients[idx, 0: len(results[idx][1])] = results[idx][1]
+            errors[idx, :, 0] = results[idx][2]
+            errors[idx, :, 1] = results[idx][3]
+        models = RegressionModels(
+            [result[0] for result in results],
+            list(X.columns),
+            coefficients,
+            errors,
+            log_space,
+            [len(result[1]) for result in results],
+        )
         # Extract the 4 indicators results stored in models
-        abs_error_max_train = []
-        abs_error_max_test = []
-        abs_error_average_train = []
-        abs_error_average_test = []
-        error_average_train = []
-        error_average_test = []
-        error_sigma_train = []
-        error_sigma_test = []
-        for key in models.keys():
-            abs_error_max_train.append(float(models[key][2].values[0]))
-            abs_error_max_test.append(float(models[key][3].values[0]))
-            abs_error_average_train.append(float(models[key][2].values[1]))
-            abs_error_average_test.append(float(models[key][3].values[1]))
-            error_average_train.append(float(models[key][2].values[2]))
-            error_average_test.append(float(models[key][3].values[2]))
-            error_sigma_train.append(float(models[key][2].values[3]))
-            error_sigma_test.append(float(models[key][3].values[3]))
-        # Set latex render on plot
-        if latex:
-            plot.rc("text", usetex=True)
-            plot.rc("font", family="serif")
-        # Start to plot the graph with indicators
+        abs_error_max_train, abs_error_max_test = models["max |e|"]
+        abs_error_average_train, abs_error_average_test = models["ave. |e|"]
+        error_average_train, error_average_test = models["ave. e"]
+        error_sigma_train, error_sigma_test = models["sigma e"]
+        # Start to plot the graph with indicators (plotting packages are only imported if needed)
         if not test_mode or show_plots:
-            x = numpy.array(range(len(models.keys()))).astype(int) + 1
+            import matplotlib.pyplot as plot
+            import matplotlib.ticker as ticker
+
+            # Set latex render on plot
+            if latex:
+                plot.rc("text", usetex=True)
+                plot.rc("font", family="serif")
+            x = numpy.array(range(len(models.expressions))).astype(int) + 1
             if not fig_size:
                 fig, axs = plot.subplots(4, sharex=True, gridspec_kw={"hspace": 0.05}, figsize=(14, 10))
             else:
@@ -1456,16 +1880,11 @@ def regression_models(doe, elected_pi0, order, **kwargs):
                 plot.savefig(temp_path + "regression_models.pdf", dpi=1200, format="pdf")
             except Exception:
                 pass
-        if not test_mode:
-            plot.show()
-        # De-activate latex render on plot
-        plot.rc("text", usetex=False)
-        plot.rc("font", family="sans-serif")
-        # Save data directly into models
-        models["max |e|"] = [abs_error_max_train, abs_error_max_test]
-        models["ave. |e|"] = [abs_error_average_train, abs_error_average_test]
-        models["ave. e"] = [error_average_train, error_average_test]
-        models["sigma e"] = [error_sigma_train, error_sigma_test]
+            if not test_mode:
+                plot.show()
+            # De-activate latex render on plot
+            plot.rc("text", usetex=False)
+            plot.rc("font", family="sans-serif")
         if show_plots and return_axes:
             return models, axs, fig
         return models
@@ -1692,7 +2111,7 @@ def adapt_parameter_set(
                 "{} parameter tend to have <=0 values cannot be saved in new PositiveParameterSet.".format()
             )
         # Check expression dimension
-        ureg = pint.UnitRegistry()
+        Q_ = get_unit_registry().Quantity
         for idx in range(len(parameter_list)):
             parameter_name = parameter_list[idx]
             exec(
@@ -1903,30 +2322,24 @@ def import_csv(file_name, parameter_set):
                 parameter_list[idx] = parameter[0 : parameter.find(" [")]
             else:
                 units_list.append("SI")
-        # Check parameter and units and adapt values to SI if necessary
-        ureg = pint.UnitRegistry()
-        ureg.default_system = "mks"
-        Q_ = ureg.Quantity
+        # Check parameter and units and adapt values to SI if necessary (cached units conversion)
         for idx in range(len(parameter_list)):
             parameter = parameter_list[idx]
             if parameter in parameter_set.dictionary.keys():
                 if units_list[idx] != "SI":
                     try:
-                        value = Q_(1, units_list[idx]).to_base_units()
-                        if str(value.units) != parameter_set[parameter]._SI_units:
+                        SI_units = unit_conversion(units_list[idx])[2]
+                        if SI_units != parameter_set[parameter]._SI_units:
                             raise ValueError(
                                 "dimensions mismatch for parameter {}, {} found instead of {}.".format(
-                                    parameter, str(value.units), parameter_set[parameter]._SI_units
+                                    parameter, SI_units, parameter_set[parameter]._SI_units
                                 )
                             )
                         else:
                             # Overwrite parameter column with SI units values
-                            values = doeX[parameter + " [" + units_list[idx] + "]"]
-                            for idx in range(len(values)):
-                                value = Q_(values[idx], units_list[idx]).to_base_units()
-                                values[idx] = value.magnitude
-                            doeX[parameter] = values
-                            doeX = doeX.drop(parameter + " [" + units_list[idx] + "]", axis=1)
+                            column = parameter + " [" + units_list[idx] + "]"
+                            doeX[parameter] = to_SI(doeX[column].values.tolist(), units_list[idx])
+                            doeX = doeX.drop(column, axis=1)
                     except:
                         warnings.warn(
                             "parameter {} units defined in file are unreadable, SI units are applied!".format(
@@ -2019,6 +2432,146 @@ def save_csv(doeX, file_name, parameter_set, is_SI):
             raise TypeError("is_SI should be boolean")
 
 
+# -------[Define function translating model expression into terms exponents]---
+def expression_to_model(expression, coefficients=None):
+    """Function that translates a regression model expression (see :func:`~pyvplm.addon.variablepowerlaw.regression_models`)
+        into its terms exponents matrix and coefficients vector.
+
+        Parameters
+        ----------
+        expression: str
+                    Model expression of the form 'log(pi1) = 0.1+2.0*log(pi2)*log(pi3)**2' or 'pi1 = 0.1+2.0*pi2'
+
+        coefficients: [p] numpy.array of float
+                      Full precision coefficients overwriting the expression (rounded) ones (default is None)
+
+        Returns
+        -------
+        elected_pi0: int
+                     Number of the modeled pi
+
+        log_space: bool
+                   True if model is expressed within logarithmic space
+
+        exponents: [p*K] numpy.array of int
+                   Exponent of pi number j+1 (column j) in each of the p terms, K being the greatest pi number
+
+        coefficients: [p] numpy.array of float
+                      Coefficient of each term
+
+        Example
+        -------
+        translate a model expression:
+            >>> In [1]: expression_to_model("log(pi1) = 0.5-1.2e-05*log(pi3)**2+2.0*log(pi2)*log(pi3)")
+                (1, True, array([[0, 0, 0],
+                       [0, 0, 2],
+                       [0, 1, 1]]), array([ 5.0e-01, -1.2e-05,  2.0e+00]))
+
+    """
+    if not (isinstance(expression, str)) or expression.find("=") == -1:
+        raise SyntaxError("expression should be of the form 'pi0 = f(pi1, pi2...)'.")
+    left_side = expression[0: expression.find("=")]
+    log_space = left_side.find("log") != -1
+    elected_pi0 = left_side.replace("log(", "").replace(")", "").replace(" ", "")
+    if elected_pi0[0:2] != "pi":
+        raise SyntaxError("modeled parameter should be of the form pik with k an int.")
+    elected_pi0 = int(elected_pi0[2:])
+    # Split expression in signed coefficient and term label (numbers such as 1e-05 are single tokens)
+    terms = []
+    sign, number, label = 1.0, None, ""
+    tokens = tokenize.generate_tokens(io.StringIO(expression[expression.find("=") + 1:].strip()).readline)
+    for token in tokens:
+        if token.type == tokenize.OP and token.string in ["+", "-"]:
+            if number is not None:
+                terms.append((sign * number, label))
+            sign, number, label = (-1.0 if token.string == "-" else 1.0), None, ""
+        elif token.type == tokenize.NUMBER and number is None:
+            number = float(token.string)
+        elif token.type in [tokenize.NAME, tokenize.OP, tokenize.NUMBER]:
+            label += token.string
+    if number is not None:
+        terms.append((sign * number, label))
+    # Translate labels (e.g. '*log(pi2)*log(pi3)**2') into pi numbers exponents
+    powers = []
+    for _, label in terms:
+        powers.append({})
+        label = label.replace("log(", "").replace(")", "").replace("**", "^")
+        for factor in label.split("*"):
+            if factor == "":
+                continue
+            if factor[0:2] != "pi":
+                raise SyntaxError("unexpected factor '{}' in expression.".format(factor))
+            factor = factor.split("^")
+            pi_number = int(factor[0][2:])
+            powers[-1][pi_number] = powers[-1].get(pi_number, 0) + (
+                int(factor[1]) if len(factor) == 2 else 1
+            )
+    pi_nb = max([elected_pi0] + [max(power.keys()) for power in powers if len(power) != 0])
+    exponents = numpy.zeros((len(terms), pi_nb), dtype=int)
+    for idx in range(len(powers)):
+        for pi_number, exponent in powers[idx].items():
+            exponents[idx, pi_number - 1] = exponent
+    if coefficients is None:
+        coefficients = numpy.array([term[0] for term in terms])
+    else:
+        coefficients = numpy.array(coefficients, dtype=float)
+        if len(coefficients) != len(terms):
+            raise ValueError("coefficients number should match expression terms number.")
+    return elected_pi0, log_space, exponents, coefficients
+
+
+# -------[Define function evaluating a regression model]------------------------
+def predict(model, doePI, log_space=True, chunk_size=65536):
+    """Function that evaluates a regression model, represented by its terms exponents and coefficients, on a
+        pi DOE: terms features are built and multiplied by the coefficients by chunks of points.
+
+        Parameters
+        ----------
+        model: tuple
+               (exponents, coefficients) with exponents a [p*k] numpy.array of int (k the doePI columns number) and
+               coefficients a [p] numpy.array of float (see :func:`~pyvplm.addon.variablepowerlaw.expression_to_model`)
+
+        doePI: [m*k] numpy.array of float
+               Pi DOE the model is evaluated on
+
+        log_space: bool
+                   Defines if model is expressed within logarithmic space (default is True)
+
+        chunk_size: int
+                    Number of points evaluated at once (default is 65536)
+
+        Returns
+        -------
+        Y_reg: [m] numpy.array of float
+               Model values (expressed in linear space)
+
+        Example
+        -------
+        evaluate model 3 of regression models:
+            >>> In [1]: Y_reg = predict(models.model(3), doePI)
+
+    """
+    exponents, coefficients = model
+    exponents = numpy.array(exponents, dtype=int)
+    coefficients = numpy.array(coefficients, dtype=float)
+    doePI = numpy.asarray(doePI, dtype=float)
+    if numpy.shape(exponents)[1] > numpy.shape(doePI)[1]:
+        raise ValueError("model exponents columns number should be <= doePI columns number.")
+    if log_space and numpy.any(doePI[:, 0: numpy.shape(exponents)[1]] <= 0.0):
+        raise ValueError("DOE should not contain negative or 0 values")
+    if not (isinstance(chunk_size, int)) or chunk_size < 1:
+        raise ValueError("chunk_size should be an integer >=1.")
+    Y_reg = numpy.zeros(numpy.shape(doePI)[0])
+    for start in range(0, numpy.shape(doePI)[0], chunk_size):
+        X = doePI[start: start + chunk_size, 0: numpy.shape(exponents)[1]]
+        X = numpy.log10(X) if log_space else X
+        features = numpy.ones((numpy.shape(X)[0], len(coefficients)))
+        for term, column in zip(*numpy.nonzero(exponents)):
+            features[:, term] *= X[:, column] ** exponents[term, column]
+        Y_reg[start: start + chunk_size] = numpy.dot(features, coefficients)
+    return 10 ** Y_reg if log_space else Y_reg
+
+
 # -------[Define function to save doe Dataframe]--------------------------------
 def perform_regression(doePI, models, chosen_model, **kwargs):
     """Function to perform regresion using models expression form (with replaced coefficients).
@@ -2043,6 +2596,19 @@ def perform_regression(doePI, models, chosen_model, **kwargs):
                   * **no_plots** (*bool*): for GUI use, will return Y and Yreg as well as expression and
                   latex_expression, will not plot anything
 
+        Returns
+        -------
+        expression: str
+                    The model expression with full precision coefficients when no_plots is True (note: rounded
+                    coefficients are now exactly replaced, previous versions kept a duplicated last digit), else the
+                    error mean and standard deviation plot legend
+
+        expression_latex: str
+                          The model latex expression
+
+        Y, Y_reg: numpy.array
+                  Pi0 DOE values and model predictions (only returned if no_plots is True)
+
         Example
         -------
         to define regression models refer to: :func:`~pyvplm.addon.variablepowerlaw.regression_models`
@@ -2125,8 +2691,11 @@ def perform_regression(doePI, models, chosen_model, **kwargs):
         try:
             expression_latex = concatenate_expression(expression, pi_list)
             if not test_mode:
+                from IPython.display import Latex, display
+
                 display(Latex(expression_latex))
         except:
+            expression_latex = expression
             if not test_mode:
                 print(expression + "\n")
         # Save expression
@@ -2136,17 +2705,8 @@ def perform_regression(doePI, models, chosen_model, **kwargs):
             hs.close()
         except:
             pass
-        # Adapt expression for calculation
-        elected_pi0 = expression[0: expression.find("=")]
-        elected_pi0 = elected_pi0.replace("log(", "")
-        elected_pi0 = elected_pi0.replace(")", "")
-        elected_pi0 = elected_pi0.replace(" ", "")
         # Disable warnings
         logging.captureWarnings(True)
-        # Set latex render on plot
-        if latex:
-            plot.rc("text", usetex=True)
-            plot.rc("font", family="serif")
         # Plot regression values in pi0 vs. f(pi1, pi2,...) graph with y=x reference and error repartition histogram
         idx = 0
         for coeff in models[chosen_model][1]:
@@ -2154,38 +2714,48 @@ def perform_regression(doePI, models, chosen_model, **kwargs):
             expression = (
                 expression[0:idx]
                 + str(coeff)
-                + expression[idx + len("{:.5f}".format(coeff)) - 1: len(expression)]
+                + expression[idx + len("{:.5f}".format(coeff)): len(expression)]
             )
-            idx = idx + len("{:.5f}".format(coeff)) - 1
-        expression1 = expression[expression.find("=") + 1: len(expression)]
-        expression2 = expression[0: expression.find("=")]
-        log_space = True if expression2.find("log") != -1 else False
+            idx = idx + len(str(coeff))
+        # Translate model into terms exponents (pi numbers) and coefficients, then into doePI columns
+        elected_pi0, log_space, exponents, coefficients = expression_to_model(
+            models[chosen_model][0], models[chosen_model][1]
+        )
         # Check for problematic values
         if log_space:
             if numpy.any(doePI <= 0.0):  # FIXES 06/05/21: advert if incorrect values transmitted
                 raise ValueError("DOE should not contain negative or 0 values")
-        expression1 = expression1.replace("log", "numpy.log10")
-        expression2 = expression2.replace("log", "numpy.log10")
-        for idx in range(max(numpy.shape(doePI)[1], max_pi_nb)):
+        columns = []
+        for idx in range(max(numpy.shape(doePI)[1], max_pi_nb, numpy.shape(exponents)[1])):
             delta = 0
             for i in removed_pi:
                 if idx > i:
                     delta += 1
-            expression1 = expression1.replace("pi" + str(idx + 1), "doePI[:,{}]".format(idx - delta))
-            expression2 = expression2.replace("pi" + str(idx + 1), "doePI[:,{}]".format(idx - delta))
+            columns.append(idx - delta)
         try:
-            Y_reg = 10 ** eval(expression1) if log_space else eval(expression1)
-            Y = 10 ** eval(expression2) if log_space else eval(expression2)
+            doe_exponents = numpy.zeros((len(coefficients), numpy.shape(doePI)[1]), dtype=int)
+            for idx in numpy.nonzero(numpy.any(exponents != 0, axis=0))[0]:
+                if not (0 <= columns[idx] < numpy.shape(doePI)[1]):
+                    raise IndexError
+                doe_exponents[:, columns[idx]] += exponents[:, idx]
+            Y_reg = predict((doe_exponents, coefficients), doePI, log_space)
+            Y = doePI[:, columns[elected_pi0 - 1]]
+            Y = 10 ** numpy.log10(Y) if log_space else numpy.copy(Y)
             Y += (Y == 0.0) * sys.float_info.min  # FIXES 06/05/21: to avoid 0.0 division
-            # Adapt Y_reg vector if only constant is considered
-            if isinstance(Y_reg, float):
-                Y_reg = Y_reg * numpy.ones(numpy.shape(Y)).astype(float)
         except Exception:
             raise ValueError("possibly doePI and model expression mismatch on pi number.")
         # For GUI use only
         if no_plots:
             return expression, expression_latex, Y, Y_reg
-        # Plots for non GUI use
+        # Plots for non GUI use (plotting packages are only imported if needed)
+        import matplotlib.pyplot as plot
+        from matplotlib import colors
+        from matplotlib.ticker import PercentFormatter
+
+        # Set latex render on plot
+        if latex:
+            plot.rc("text", usetex=True)
+            plot.rc("font", family="serif")
         fig, axs = plot.subplots(1, 2, tight_layout=True)
         xmin = min(min(Y), min(Y_reg))
         xmax = max(max(Y), max(Y_reg))
@@ -2194,13 +2764,12 @@ def perform_regression(doePI, models, chosen_model, **kwargs):
         axs[0].axis([xmin, xmax, xmin, xmax])
         axs[0].grid(True)
         axs[0].set_title("Regression model", fontsize=18)
-        elected_pi0 = int(elected_pi0.replace("pi", "")) - 1
-        if eff_pi0 != -1:
-            elected_pi0 = eff_pi0
-        axs[0].set_xlabel("$" + pi_list[elected_pi0] + "$", fontsize=16)
-        y_label = "$" + pi_list[elected_pi0] + " \simeq f("
+        # Use the same doePI column as Y for pi0 label (removed pi taken into account)
+        pi0_index = columns[elected_pi0 - 1] if eff_pi0 == -1 else eff_pi0
+        axs[0].set_xlabel("$" + pi_list[pi0_index] + "$", fontsize=16)
+        y_label = "$" + pi_list[pi0_index] + " \simeq f("
         for i in range(len(pi_list)):
-            if i != elected_pi0:
+            if i != pi0_index:
                 y_label += pi_list[i] + ","
         y_label = y_label[0: len(y_label) - 1] + ")$"
         axs[0].set_ylabel(y_label, fontsize=18)
@@ -2304,6 +2873,10 @@ def pi_sensitivity(pi_set, doePI, useWidgets, **kwargs):
             * IF: Impact Factor is the product of both previous coefficients
         
     """
+    from IPython.display import display, clear_output
+    from ipywidgets import widgets, VBox
+    import matplotlib.pyplot as plot
+
     if isinstance(useWidgets, bool):
         test_mode = False
         latex = False
@@ -2433,6 +3006,8 @@ def pi_sensitivity(pi_set, doePI, useWidgets, **kwargs):
 def pi_sensitivity_sub(pi_set, doePI, **kwargs):
     """Sub-function of :func:`~pyvplm.addon.variablepowerlaw.pi_sensitivity`
     """
+    import matplotlib.pyplot as plot
+
     if isinstance(pi_set, PositiveParameterSet) and isinstance(doePI, numpy.ndarray):
         # Check data and define default when widgets option chosen
         if numpy.shape(doePI)[1] != len(list(pi_set.dictionary.keys())):
@@ -2809,6 +3384,10 @@ def pi_dependency(pi_set, doePI, useWidgets, **kwargs):
                 .. image:: ../source/_static/Pictures/variablepowerlaw_pi_dependency.png
         
     """
+    from IPython.display import display, clear_output
+    from ipywidgets import widgets, VBox
+    import matplotlib.pyplot as plot
+
     if isinstance(useWidgets, bool):
         test_mode = False
         x_list_ = []
@@ -2942,6 +3521,8 @@ def pi_dependency(pi_set, doePI, useWidgets, **kwargs):
 def pi_dependency_sub(pi_set, doePI, **kwargs):
     """Sub-function of :func:`~pyvplm.addon.variablepowerlaw.pi_dependency`
     """
+    import matplotlib.pyplot as plot
+
     if isinstance(pi_set, PositiveParameterSet) and isinstance(doePI, numpy.ndarray):
         # Check data and define default when widgets option chosen
         if numpy.shape(doePI)[1] != len(list(pi_set.dictionary.keys())):
@@ -5,13 +5,70 @@ Core module defining elementary class and methods for SizingLab
 
 # -------[Import necessary packages]--------------------------------------------
 import sys
+import ast
 import pint
 import warnings
 import logging
 import sympy
 import numpy
+import functools
 from collections import OrderedDict
-from IPython.display import display, Math
+
+
+# -------[Shared units registry and cached units conversion]-------------------
+_unit_registry = None
+
+
+def get_unit_registry():
+    """Function returning the pint UnitRegistry shared by the package (created at first call, 'mks' system).
+
+    """
+    global _unit_registry
+    if _unit_registry is None:
+        _unit_registry = pint.UnitRegistry()
+        _unit_registry.default_system = "mks"
+    return _unit_registry
+
+
+@functools.lru_cache(maxsize=1024)
+def unit_conversion(units):
+    """Function (cached) returning the formatted units, SI conversion factor, SI units and dimensionality of
+        units expression. SI factor is None for non-multiplicative units (e.g. degC).
+
+        Example
+        -------
+        get mm conversion:
+            >>> In [1]: unit_conversion('mm')
+            >>> Out[1]: ('millimeter', 0.001, 'meter', '[length]')
+
+    """
+    Q_ = get_unit_registry().Quantity
+    quantity = Q_(0.0, units)
+    formatted_units = str(quantity.units)
+    dimensionality = str(quantity.dimensionality)
+    SI_quantity = Q_(1.0, formatted_units).to_base_units()
+    SI_units = str(SI_quantity.units)
+    SI_factor = SI_quantity.magnitude
+    # Offset units (e.g. degC) cannot be converted with a factor
+    if Q_(0.0, formatted_units).to_base_units().magnitude != 0:
+        SI_factor = None
+    return formatted_units, SI_factor, SI_units, dimensionality
+
+
+def to_SI(value, units):
+    """Function converting value(s) (float or list) expressed in units into SI units magnitude (using cached
+        conversion factor, lists being converted to numpy.array).
+
+    """
+    formatted_units, SI_factor, SI_units, _ = unit_conversion(units)
+    if isinstance(value, list):
+        value = numpy.array(value)
+    if SI_factor is None:
+        return get_unit_registry().Quantity(value, formatted_units).to_base_units().magnitude
+    elif SI_units == formatted_units:
+        return value
+    else:
+        return value * SI_factor
 
 
 # -------[Parameter Class Definition]-------------------------------------------
@@ -68,7 +125,12 @@ class Parameter:
         
     """
 
-    ureg = pint.UnitRegistry()
+    @property
+    def ureg(self):
+        """Shared pint UnitRegistry (see :func:`~pyvplm.core.definition.get_unit_registry`).
+
+        """
+        return get_unit_registry()
 
     def __init__(self, name: str, defined_bounds: list, defined_units: str, description: str):
         """Method to create initial parameter object using syntax expressed in example.
@@ -102,21 +164,14 @@ class Parameter:
                 self.value = defined_bounds
             object.__setattr__(self, "defined_units", formatted_units)
             self.description = description
-            ureg = self.ureg
-            ureg.default_system = "mks"
-            Q_ = ureg.Quantity
             if len(defined_bounds) == 2:
-                SI_lower_bound = Q_(lower_bound, formatted_units).to_base_units()
-                SI_upper_bound = Q_(upper_bound, formatted_units).to_base_units()
-                object.__setattr__(
-                    self, "_SI_bounds", [SI_lower_bound.magnitude, SI_upper_bound.magnitude]
-                )
+                SI_lower_bound = to_SI(lower_bound, formatted_units)
+                SI_upper_bound = to_SI(upper_bound, formatted_units)
+                object.__setattr__(self, "_SI_bounds", [SI_lower_bound, SI_upper_bound])
             else:
-                SI_lower_bound = Q_(defined_bounds[0], formatted_units).to_base_units()
-                object.__setattr__(
-                    self, "_SI_bounds", [SI_lower_bound.magnitude, SI_lower_bound.magnitude]
-                )
-            object.__setattr__(self, "_SI_units", str(SI_lower_bound.units))
+                SI_lower_bound = to_SI(defined_bounds[0], formatted_units)
+                object.__setattr__(self, "_SI_bounds", [SI_lower_bound, SI_lower_bound])
+            object.__setattr__(self, "_SI_units", unit_conversion(formatted_units)[2])
             object.__setattr__(self, "_dimensionality", dimensionality)
 
     def __getattribute__(self, attribute_name):
@@ -136,20 +191,15 @@ class Parameter:
             # Check units syntax
             proper_syntax, formatted_units, dimensionality = self.check_units(value)
             if proper_syntax:
-                ureg = self.ureg
-                ureg.default_system = "mks"
-                Q_ = ureg.Quantity
                 object.__setattr__(self, "_dimensionality", dimensionality)
                 object.__setattr__(self, "defined_units", formatted_units)
                 if len(self.value) == 0:
-                    SI_lower_bound = Q_(self.defined_bounds[0], formatted_units).to_base_units()
-                    SI_upper_bound = Q_(self.defined_bounds[1], formatted_units).to_base_units()
+                    SI_lower_bound = to_SI(self.defined_bounds[0], formatted_units)
+                    SI_upper_bound = to_SI(self.defined_bounds[1], formatted_units)
                 else:
-                    SI_lower_bound = Q_(self.value, formatted_units).to_base_units()
+                    SI_lower_bound = to_SI(self.value, formatted_units)
                     SI_upper_bound = SI_lower_bound
-                object.__setattr__(
-                    self, "_SI_bounds", [SI_lower_bound.magnitude, SI_upper_bound.magnitude]
-                )
+                object.__setattr__(self, "_SI_bounds", [SI_lower_bound, SI_upper_bound])
         elif attribute_name == "defined_bounds":
             defined_bounds = value
             # Check bounds syntax and values
@@ -168,20 +218,13 @@ class Parameter:
                     object.__setattr__(self, "name", self.name.upper())
                     object.__setattr__(self, "defined_bounds", [])
                     object.__setattr__(self, "value", defined_bounds)
-                ureg = self.ureg
-                ureg.default_system = "mks"
-                Q_ = ureg.Quantity
                 if len(defined_bounds) == 2:
-                    SI_lower_bound = Q_(lower_bound, formatted_units).to_base_units()
-                    SI_upper_bound = Q_(upper_bound, formatted_units).to_base_units()
-                    object.__setattr__(
-                        self, "_SI_bounds", [SI_lower_bound.magnitude, SI_upper_bound.magnitude]
-                    )
+                    SI_lower_bound = to_SI(lower_bound, formatted_units)
+                    SI_upper_bound = to_SI(upper_bound, formatted_units)
+                    object.__setattr__(self, "_SI_bounds", [SI_lower_bound, SI_upper_bound])
                 else:
-                    SI_lower_bound = Q_(defined_bounds[0], formatted_units).to_base_units()
-                    object.__setattr__(
-                        self, "_SI_bounds", [SI_lower_bound.magnitude, SI_lower_bound.magnitude]
-                    )
+                    SI_lower_bound = to_SI(defined_bounds[0], formatted_units)
+                    object.__setattr__(self, "_SI_bounds", [SI_lower_bound, SI_lower_bound])
         elif attribute_name in [
             "name",
             "value",
@@ -270,12 +313,7 @@ class Parameter:
         """
         proper_syntax = True
         try:
-            ureg = self.ureg
-            ureg.default_system = "mks"
-            Q_ = ureg.Quantity
-            formatted_units = Q_("0" + defined_units)
-            dimensionality = str(formatted_units.dimensionality)
-            formatted_units = str(formatted_units.units)
+            formatted_units, _, _, dimensionality = unit_conversion(defined_units)
         except:
             proper_syntax = False
             raise ValueError(
@@ -456,6 +494,8 @@ class ParameterSet:
             Greek letters will also be escaped automatically lambda_wind will lead to $\lambda_{wind}$.
         
         """
+        from IPython.display import display, Math
+
         logging.captureWarnings(True)
         greek_list = [
             "alpha",
@@ -573,6 +613,61 @@ class ParameterSet:
                 raise TypeError("all the parameters should be of Parameter type")
         return proper_syntax
 
+    def dimensional_matrix(self):
+        """Method to get the dimensional matrix of the set: [n*d] numpy.array of int of parameters'
+            dimensions exponents (rows in dictionary order) and the list of d dimensions names.
+            The matrix is computed once and cached, it is only re-built if a parameter is added or if
+            its units dimensionality changes (reordering parameters with first method only permutes it).
+
+        """
+        logging.captureWarnings(True)
+        dimensionalities = OrderedDict(
+            (key, self.dictionary[key]._dimensionality) for key in self.dictionary.keys()
+        )
+        logging.captureWarnings(False)
+        cache = getattr(self, "_dimensional_cache", None)
+        if cache is None or cache["dimensionalities"] != dict(dimensionalities):
+            # Parse dimensions (in their str order) of each parameter and register new dimensions
+            dimensions_list = []
+            parameters_dimensions = []
+            for key in dimensionalities.keys():
+                dimensions = str(pint.util.ParserHelper.from_string(dimensionalities[key]))
+                # ParserHelper return expression of the form: "1.0 {'[length]': -1.0, '[mass]': 1.0, '[time]': -2.0}"
+                dimensions = ast.literal_eval(dimensions[dimensions.find("{") : len(dimensions)])
+                for dimension in dimensions.keys():
+                    if not (dimension in dimensions_list):
+                        dimensions_list.append(dimension)
+                parameters_dimensions.append(dimensions)
+            matrix = numpy.zeros([len(parameters_dimensions), len(dimensions_list)], dtype=int)
+            for i in range(len(parameters_dimensions)):
+                for dimension, exponent in parameters_dimensions[i].items():
+                    matrix[i, dimensions_list.index(dimension)] = int(exponent)
+            cache = {
+                "dimensionalities": dict(dimensionalities),
+                "index": dict(zip(dimensionalities.keys(), range(len(dimensionalities)))),
+                "dimensions": dimensions_list,
+                "columns": [
+                    [dimensions_list.index(dimension) for dimension in dimensions.keys()]
+                    for dimensions in parameters_dimensions
+                ],
+                "matrix": matrix,
+            }
+            object.__setattr__(self, "_dimensional_cache", cache)
+        # Permute rows to dictionary order and columns to the dimensions order of first appearance
+        rows = [cache["index"][key] for key in dimensionalities.keys()]
+        columns = []
+        for row in rows:
+            for column in cache["columns"][row]:
+                if not (column in columns):
+                    columns.append(column)
+        if rows == sorted(rows) and columns == sorted(columns):
+            # Return a copy: callers may modify the matrix without corrupting the cache
+            return cache["matrix"].copy(), list(cache["dimensions"])
+        return (
+            cache["matrix"][numpy.ix_(rows, columns)],
+            [cache["dimensions"][column] for column in columns],
+        )
+
     def first(self, *parameters_list):
         """Run trough parameters_list tuple order to move dictionary key to its position in the list.
         
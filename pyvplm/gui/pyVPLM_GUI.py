@@ -1,8 +1,7 @@
 # Import pyVPLM packages
-from pyvplm.core.definition import PositiveParameter, PositiveParameterSet
+from pyvplm.core.definition import PositiveParameter, PositiveParameterSet, get_unit_registry
 from pyvplm.addon import variablepowerlaw as vpl
 from pyvplm.addon import pixdoe as doe
-from pint import UnitRegistry
 import save_load as sl
 import pi_format as pif
 import csv_export as csv
@@ -135,7 +134,7 @@ def check_unit(unit):
     if unit == '':
         unit_entry.error_messages = TL[4]
         return False
-    base_registry = UnitRegistry()
+    base_registry = get_unit_registry()
     try:
         if unit not in base_registry:
             contains_upper = False
@@ -2134,7 +2133,7 @@ def regression_models(widget, event, data, slider_state=1):
             MODELS, axs, fig = vpl.regression_models(modified_result_pi, elected_pi0=select_pi0.v_model,
                                                      order=model_order, test_mode=True, plots=True,
                                                      force_choice=choice, ymax_axis=1000, removed_pi=list_to_del,
-                                                     eff_pi0=eff_pi0, skip_cross_validation=True, return_axes=True,
+                                                     eff_pi0=eff_pi0, skip_cross_validation=False, return_axes=True,
                                                      fig_size=((29/(1 - delta) * (ww/1928 - delta)),
                                                                12*ww/1928),
                                                      log_space=log_space)
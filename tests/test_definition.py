@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of pyvplm.core.definition module
+"""
+
+import numpy
+
+from pyvplm.core.definition import (
+    unit_conversion,
+    to_SI,
+    Parameter,
+    PositiveParameter,
+    PositiveParameterSet,
+)
+
+
+def test_unit_conversion():
+    assert unit_conversion("mm") == ("millimeter", 0.001, "meter", "[length]")
+    assert numpy.allclose(to_SI([1.0, 2.0], "mm"), [0.001, 0.002])
+    assert to_SI(3.0, "m") == 3.0
+
+
+def test_offset_units():
+    assert unit_conversion("degC") == ("degree_Celsius", None, "kelvin", "[temperature]")
+    assert numpy.allclose(to_SI(numpy.array([0.0, 100.0]), "degC"), [273.15, 373.15])
+    parameter = Parameter("t", [10, 50], "degC", "temperature")
+    assert numpy.allclose(parameter._SI_bounds, [283.15, 323.15])
+    assert parameter._SI_units == "kelvin"
+
+
+def test_dimensional_matrix_cache():
+    u = PositiveParameter("u", [1e-9, 1e-6], "m", "Deflection")
+    f = PositiveParameter("f", [150, 500], "N", "Load applied")
+    e = PositiveParameter("e", [60e9, 80e9], "Pa", "Young Modulus")
+    parameter_set = PositiveParameterSet(u, f, e)
+    matrix, dimensions = parameter_set.dimensional_matrix()
+    expected = matrix.copy()
+    matrix[:, :] = 0
+    dimensions.append("[current]")
+    matrix, dimensions = parameter_set.dimensional_matrix()
+    assert numpy.array_equal(matrix, expected) and not ("[current]" in dimensions)
+    parameter_set.first("e")
+    matrix, _ = parameter_set.dimensional_matrix()
+    assert numpy.array_equal(matrix[0], expected[2])
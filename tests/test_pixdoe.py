@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of pyvplm.addon.pixdoe module
+"""
+
+import os
+import itertools
+import numpy
+import pytest
+
+from pyvplm.core.definition import PositiveParameter, PositiveParameterSet
+from pyvplm.addon.variablepowerlaw import (
+    buckingham_theorem,
+    declare_func_x_to_pi,
+    reduce_parameter_set,
+)
+from pyvplm.addon import pixdoe
+
+
+def box_problem(seed, log_space):
+    """Function returning a random feasible DOE (with duplicated points and points on an exact spacing lattice),
+        a nominal DOE (with points coinciding with feasible ones or at exactly proper_spacing distance) and
+        proper_spacing.
+
+    """
+    random_state = numpy.random.RandomState(seed)
+    proper_spacing = numpy.array([0.25, 0.5, 0.125])
+    lattice = numpy.array(list(itertools.product(range(-4, 5), range(-2, 3), range(-8, 9))), float)
+    lattice *= proper_spacing
+    doe = numpy.concatenate(
+        (random_state.uniform(-1, 1, (300, 3)), lattice[random_state.rand(len(lattice)) < 0.3])
+    )
+    doe = numpy.concatenate((doe, doe[random_state.randint(0, len(doe), 50)]))
+    nominal_doe = numpy.concatenate(
+        (
+            random_state.uniform(-1.2, 1.2, (200, 3)),
+            doe[random_state.randint(0, len(doe), 20)],
+            lattice[random_state.randint(0, len(lattice), 40)] + proper_spacing,
+        )
+    )
+    if log_space:
+        doe, nominal_doe = 10 ** doe, 10 ** nominal_doe
+    return doe, nominal_doe, proper_spacing
+
+
+def scan_windows(doe, nominal_doe, proper_spacing, log_space):
+    X = numpy.log10(doe) if log_space else doe
+    Y = numpy.log10(nominal_doe) if log_space else nominal_doe
+    return [
+        numpy.flatnonzero(numpy.all(abs(X - y_value) <= proper_spacing, axis=1)) for y_value in Y
+    ]
+
+
+@pytest.mark.parametrize("method", ["kdtree", "grid"])
+@pytest.mark.parametrize("log_space", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_box_index_query_box(seed, log_space, method):
+    doe, nominal_doe, proper_spacing = box_problem(seed, log_space)
+    expected = scan_windows(doe, nominal_doe, proper_spacing, log_space)
+    assert sum(len(window) for window in expected) != 0
+    windows = pixdoe.BoxIndex(doe, proper_spacing, log_space, method).query_box(nominal_doe)
+    assert len(windows) == len(expected)
+    for window, expected_window in zip(windows, expected):
+        assert numpy.array_equal(window, expected_window)
+    # Null spacing axis is only checked by exact filtering
+    proper_spacing[1] = 0.0
+    expected = scan_windows(doe, nominal_doe, proper_spacing, log_space)
+    windows = pixdoe.BoxIndex(doe, proper_spacing, log_space, method).query_box(nominal_doe)
+    for window, expected_window in zip(windows, expected):
+        assert numpy.array_equal(window, expected_window)
+
+
+@pytest.mark.parametrize("backend", ["kdtree", "grid"])
+@pytest.mark.parametrize("log_space", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_find_nearest_backends(seed, log_space, backend):
+    doe, nominal_doe, proper_spacing = box_problem(seed, log_space)
+    for choice_nb in [1, 3]:
+        expected = pixdoe.find_nearest(doe, nominal_doe, choice_nb, proper_spacing, log_space)
+        assert numpy.array_equal(
+            pixdoe.find_nearest(doe, nominal_doe, choice_nb, proper_spacing, log_space, backend),
+            expected,
+        )
+    box_index = pixdoe.BoxIndex(doe, proper_spacing, log_space, backend)
+    assert numpy.array_equal(
+        pixdoe.find_nearest(doe, nominal_doe, 3, proper_spacing, log_space, box_index), expected
+    )
+
+
+@pytest.mark.parametrize("backend", ["kdtree", "grid"])
+@pytest.mark.parametrize("log_space", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_surroundings_backends(seed, log_space, backend):
+    doe, nominal_doe, proper_spacing = box_problem(seed, log_space)
+    expected = numpy.array(
+        [len(window) == 0 for window in scan_windows(doe, nominal_doe, proper_spacing, log_space)]
+    )
+    assert numpy.any(expected) and not (numpy.all(expected))
+    for chunk_size in [1024, 7]:
+        reduced_nominal_doe, to_be_removed = pixdoe.surroundings(
+            doe, nominal_doe, proper_spacing, log_space, chunk_size=chunk_size
+        )
+        assert numpy.array_equal(to_be_removed, expected)
+        assert numpy.array_equal(reduced_nominal_doe, nominal_doe[expected == False])
+        for index in [backend, pixdoe.BoxIndex(doe, proper_spacing, log_space, backend)]:
+            reduced_nominal_doe, to_be_removed = pixdoe.surroundings(
+                doe, nominal_doe, proper_spacing, log_space, index, chunk_size
+            )
+            assert numpy.array_equal(to_be_removed, expected)
+            assert numpy.array_equal(reduced_nominal_doe, nominal_doe[expected == False])
+    # Null spacing axis is not indexed
+    proper_spacing[0] = 0.0
+    expected = numpy.array(
+        [len(window) == 0 for window in scan_windows(doe, nominal_doe, proper_spacing, log_space)]
+    )
+    _, to_be_removed = pixdoe.surroundings(doe, nominal_doe, proper_spacing, log_space, backend)
+    assert numpy.array_equal(to_be_removed, expected)
+
+
+@pytest.mark.parametrize("backend", ["scan", "kdtree", "grid"])
+@pytest.mark.parametrize("log_space", [False, True])
+def test_find_nearest_chunks_and_distances(log_space, backend):
+    doe, nominal_doe, proper_spacing = box_problem(0, log_space)
+    X = numpy.log10(doe) if log_space else doe
+    Y = numpy.log10(nominal_doe) if log_space else nominal_doe
+    Y_range = numpy.amax(Y, axis=0) - numpy.amin(Y, axis=0)
+    windows = scan_windows(doe, nominal_doe, proper_spacing, log_space)
+    for choice_nb in [1, 3]:
+        expected = pixdoe.find_nearest(
+            doe, nominal_doe, choice_nb, proper_spacing, log_space, backend, True
+        )
+        index, rel_distance = pixdoe.find_nearest(
+            doe, nominal_doe, choice_nb, proper_spacing, log_space, backend, True, 5
+        )
+        assert numpy.array_equal(index, expected[0])
+        assert numpy.array_equal(rel_distance, expected[1])
+        for i in range(len(Y)):
+            # Selected points are the choice_nb nearest of the window (any of them on ties)
+            window_distance = numpy.sum(((X[windows[i]] - Y[i]) / Y_range) ** 2, axis=1) ** 0.5
+            selected_number = min(choice_nb, len(windows[i]))
+            assert numpy.all(index[i, selected_number:] == -1)
+            assert numpy.all(numpy.isinf(rel_distance[i, selected_number:]))
+            assert numpy.all(numpy.isin(index[i, :selected_number], windows[i]))
+            assert len(set(index[i, :selected_number].tolist())) == selected_number
+            assert numpy.allclose(
+                numpy.sort(rel_distance[i, :selected_number]),
+                numpy.sort(window_distance)[:selected_number],
+            )
+            assert numpy.allclose(
+                rel_distance[i, :selected_number],
+                numpy.sum(((X[index[i, :selected_number]] - Y[i]) / Y_range) ** 2, axis=1) ** 0.5,
+            )
+
+
+def cantilever_problem():
+    """Function returning reduced parameter set, pi set and func_x_to_pi of a cantilever deflection problem.
+
+    """
+    u = PositiveParameter("u", [1e-9, 1e-6], "m", "Deflection")
+    f = PositiveParameter("f", [150, 500], "N", "Load applied")
+    l = PositiveParameter("l", [1, 3], "m", "Cantilever length")
+    e = PositiveParameter("e", [60e9, 80e9], "Pa", "Young Modulus")
+    d = PositiveParameter("d", [10, 60], "mm", "Diameter of cross-section")
+    parameter_set = PositiveParameterSet(u, f, l, e, d)
+    parameter_set.first("u", "l")
+    pi_set, _ = buckingham_theorem(parameter_set, False)
+    reduced_parameter_set, reduced_pi_set = reduce_parameter_set(parameter_set, pi_set, "l")
+    func_x_to_pi = declare_func_x_to_pi(reduced_parameter_set, reduced_pi_set)
+    return reduced_parameter_set, reduced_pi_set, func_x_to_pi
+
+
+def cached_const_doe(whished_size, cache_dir, cache_size=int(100e6), func_x_to_pi=None):
+    """Function returning create_const_doe diagnostics on the cantilever problem using cache_dir.
+
+    """
+    parameter_set, pi_set, declared_func_x_to_pi = cantilever_problem()
+    if func_x_to_pi is None:
+        func_x_to_pi = declared_func_x_to_pi
+    _, _, diagnostics = pixdoe.create_const_doe(
+        parameter_set,
+        pi_set,
+        func_x_to_pi,
+        whished_size,
+        test_mode=True,
+        render=False,
+        cache_dir=cache_dir,
+        cache_size=cache_size,
+    )
+    return diagnostics
+
+
+def cache_files(cache_dir):
+    return sorted(file for file in os.listdir(cache_dir) if not (file.startswith(".")))
+
+
+def test_const_doe_cache_hit(tmp_path):
+    first = cached_const_doe(30, str(tmp_path))
+    second = cached_const_doe(30, str(tmp_path))
+    assert not (first.cache_hit) and second.cache_hit
+    assert numpy.array_equal(first.doeXc, second.doeXc)
+    assert first.timings == second.timings and first.pi_sizes == second.pi_sizes
+    assert len(cache_files(str(tmp_path))) == 1
+
+
+def test_const_doe_cache_entry_larger_than_cache_size(tmp_path):
+    with pytest.warns(UserWarning, match="exceeds cache_size"):
+        cached_const_doe(30, str(tmp_path), cache_size=1)
+    assert cache_files(str(tmp_path)) == []
+    with pytest.warns(UserWarning, match="exceeds cache_size"):
+        assert not (cached_const_doe(30, str(tmp_path), cache_size=1).cache_hit)
+
+
+def test_const_doe_cache_keeps_last_entry(tmp_path):
+    cached_const_doe(30, str(tmp_path))
+    (entry,) = cache_files(str(tmp_path))
+    # Room for a single entry: the previous one is evicted, the new one is kept
+    cache_size = 3 * os.path.getsize(os.path.join(str(tmp_path), entry)) // 2
+    cached_const_doe(20, str(tmp_path), cache_size=cache_size)
+    files = cache_files(str(tmp_path))
+    assert len(files) == 1 and files[0] != entry
+    assert cached_const_doe(20, str(tmp_path), cache_size=cache_size).cache_hit
+
+
+def test_const_doe_cache_undeclared_func_x_to_pi(tmp_path):
+    _, _, declared_func_x_to_pi = cantilever_problem()
+
+    def func_x_to_pi(X):
+        return declared_func_x_to_pi(X)
+
+    with pytest.warns(UserWarning, match="cache not used"):
+        cached_const_doe(30, str(tmp_path), func_x_to_pi=func_x_to_pi)
+    assert cache_files(str(tmp_path)) == []
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of pyvplm.addon.variablepowerlaw module
+"""
+
+import numpy
+import matplotlib
+
+matplotlib.use("Agg")
+
+from pyvplm.addon import variablepowerlaw as vpl
+
+
+def power_law_doe(points_number=40, seed=0):
+    """Function returning a noisy pi1 = pi2**1.3 * pi3**-0.4 DOE.
+
+    """
+    random_state = numpy.random.RandomState(seed)
+    doe = 10 ** random_state.uniform(-1, 1, (points_number, 3))
+    doe[:, 0] = doe[:, 1] ** 1.3 * doe[:, 2] ** -0.4 * (1 + 0.01 * random_state.randn(points_number))
+    return doe
+
+
+def test_regression_models_plots(tmp_path, monkeypatch):
+    monkeypatch.setattr(vpl, "temp_path", str(tmp_path) + "/")
+    models, axs, fig = vpl.regression_models(
+        power_law_doe(), "pi1", 2, plots=True, test_mode=True, return_axes=True
+    )
+    for ax in axs:
+        assert len(ax.lines[0].get_xdata()) == len(models.expressions)
+    matplotlib.pyplot.close(fig)
+
+
+def test_perform_regression_plots(tmp_path, monkeypatch):
+    monkeypatch.setattr(vpl, "temp_path", str(tmp_path) + "/")
+    doe = power_law_doe()
+    models = vpl.regression_models(doe, "pi1", 2, test_mode=True)
+    vpl.perform_regression(doe, models, 3, test_mode=True)
+    matplotlib.pyplot.close("all")
+
+
+def test_perform_regression_removed_pi(tmp_path, monkeypatch):
+    monkeypatch.setattr(vpl, "temp_path", str(tmp_path) + "/")
+    doe = power_law_doe()
+    # Model written with initial pi numbers while pi2 column is removed from doePI
+    models = {
+        1: ("log(pi1) = 0.00000+1.30000*log(pi3)-0.40000*log(pi4)", numpy.array([0.0, 1.3, -0.4]))
+    }
+    expression, _, Y, Y_reg = vpl.perform_regression(
+        doe, models, 1, test_mode=True, removed_pi=[1], no_plots=True
+    )
+    assert numpy.allclose(Y, doe[:, 0])
+    assert numpy.allclose(Y_reg, doe[:, 1] ** 1.3 * doe[:, 2] ** -0.4)
+    assert expression == "log(pi1) = 0.0+1.3*log(pi3)-0.4*log(pi4)"
+    vpl.perform_regression(doe, models, 1, test_mode=True, removed_pi=[1])
+    matplotlib.pyplot.close("all")